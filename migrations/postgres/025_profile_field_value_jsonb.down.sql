@@ -0,0 +1,17 @@
+-- 025_profile_field_value_jsonb.down.sql
+--
+-- Restore field_value to TEXT in the pre-025 serialization: JSON strings
+-- are unwrapped, everything else keeps its JSON text form.
+
+BEGIN;
+
+ALTER TABLE profile_fields
+  ALTER COLUMN field_value TYPE TEXT
+  USING CASE jsonb_typeof(field_value)
+    WHEN 'string' THEN field_value #>> '{}'
+    ELSE field_value::text
+  END;
+
+COMMENT ON COLUMN profile_fields.field_value IS 'Serialized field value (TEXT for flexibility)';
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- 025_profile_field_value_jsonb.up.sql
+--
+-- Store profile_fields.field_value as JSONB instead of TEXT. Values keep
+-- their type in the column itself, so reads no longer re-parse TEXT per row
+-- by value_type, and the read path can aggregate fields straight into JSON.
+--
+-- Conversion by value_type:
+--   string      -> JSON string
+--   bool        -> JSON boolean
+--   int, float  -> JSON number (non-finite floats become JSON strings)
+--   list, dict  -> parsed as the JSON they were serialized to
+
+BEGIN;
+
+ALTER TABLE profile_fields
+  ALTER COLUMN field_value TYPE JSONB
+  USING CASE value_type
+    WHEN 'bool' THEN to_jsonb(field_value::boolean)
+    WHEN 'int' THEN to_jsonb(field_value::numeric)
+    WHEN 'float' THEN to_jsonb(field_value::double precision)
+    WHEN 'list' THEN field_value::jsonb
+    WHEN 'dict' THEN field_value::jsonb
+    ELSE to_jsonb(field_value)
+  END;
+
+COMMENT ON COLUMN profile_fields.field_value IS 'Field value as JSONB (type preserved)';
+
+COMMIT;
@@ -0,0 +1,26 @@
+-- 026_drop_profile_value_type.down.sql
+--
+-- Restore profile_fields.value_type, deriving it from the JSONB value.
+
+BEGIN;
+
+ALTER TABLE profile_fields
+  ADD COLUMN IF NOT EXISTS value_type VARCHAR(20) NOT NULL DEFAULT 'string';
+
+UPDATE profile_fields
+SET value_type = CASE jsonb_typeof(field_value)
+    WHEN 'boolean' THEN 'bool'
+    WHEN 'number' THEN
+      CASE WHEN (field_value #>> '{}') ~ '^-?[0-9]+$' THEN 'int' ELSE 'float' END
+    WHEN 'array' THEN 'list'
+    WHEN 'object' THEN 'dict'
+    ELSE 'string'
+  END;
+
+ALTER TABLE profile_fields
+  ADD CONSTRAINT chk_value_type_valid
+    CHECK (value_type IN ('string', 'int', 'float', 'bool', 'list', 'dict'));
+
+COMMENT ON COLUMN profile_fields.value_type IS 'Original type for proper deserialization';
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- 026_drop_profile_value_type.up.sql
+--
+-- Drop profile_fields.value_type. Since 025 field_value is JSONB and carries
+-- its own type (jsonb_typeof), so the column only added per-row payload.
+-- chk_value_type_valid is dropped along with the column.
+
+BEGIN;
+
+ALTER TABLE profile_fields DROP COLUMN IF EXISTS value_type;
+
+COMMIT;
@@ -0,0 +1,4 @@
+-- 027_drop_redundant_profile_fields_index.down.sql
+
+CREATE INDEX IF NOT EXISTS idx_profile_fields_user_category
+  ON profile_fields (user_id, category);
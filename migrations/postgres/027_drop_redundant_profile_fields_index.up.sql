@@ -0,0 +1,12 @@
+-- 027_drop_redundant_profile_fields_index.up.sql
+--
+-- idx_profile_fields_user_category (user_id, category) is a strict prefix
+-- of the primary key (user_id, category, field_name), which already serves
+-- every lookup by user_id or (user_id, category), including the single-query
+-- profile read. Dropping it removes one index write per field upsert.
+--
+-- A covering index INCLUDE (field_value, last_updated) was considered for
+-- index-only profile reads and rejected: field_value is unbounded JSONB, and
+-- a value past the btree tuple limit (~2.7kB) would make the upsert fail.
+
+DROP INDEX IF EXISTS idx_profile_fields_user_category;
@@ -36,6 +36,7 @@ from src.dependencies.timescale import (  # noqa: E402
 )
 from src.services.profile_storage import (  # noqa: E402
     EXPECTED_PROFILE_FIELDS,
+    EXPECTED_PROFILE_FIELDS_SETS,
     TOTAL_EXPECTED_FIELDS,
     COMPLETENESS_CACHE_KEY,
 )
@@ -83,8 +84,8 @@ def _load_all_populated_fields(cursor) -> Dict[str, Dict[str, Set[str]]]:
 def _compute_from_populated(populated: Dict[str, Set[str]]) -> Tuple[int, float]:
     """Pure-Python completeness math against an already-loaded populated map."""
     total_populated = 0
-    for category, expected_fields in EXPECTED_PROFILE_FIELDS.items():
-        total_populated += len(populated[category].intersection(set(expected_fields)))
+    for category, expected_set in EXPECTED_PROFILE_FIELDS_SETS.items():
+        total_populated += len(populated[category] & expected_set)
     pct = (
         min(100.0, (total_populated / TOTAL_EXPECTED_FIELDS) * 100)
         if TOTAL_EXPECTED_FIELDS
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timezone
 import logging
 from zoneinfo import ZoneInfo
@@ -6,7 +7,16 @@ import os
 from typing import Any, Dict, List, Optional
 import json
 
-from fastapi import FastAPI, Query, HTTPException, Header, Cookie, Depends, Request
+from fastapi import (
+    BackgroundTasks,
+    FastAPI,
+    Query,
+    HTTPException,
+    Header,
+    Cookie,
+    Depends,
+    Request,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from os import getenv
 
@@ -48,6 +58,7 @@ from src.config import (
     get_chroma_port,
     is_llm_configured,
     get_llm_provider,
+    is_prompt_warmup_enabled,
     is_scheduled_maintenance_enabled,
     get_ttl_sweep_interval_minutes,
 )
@@ -59,7 +70,7 @@ from src.services.retrieval import (  # noqa: F401
     search_memories,
     _standard_collection_name as _standard_collection_name,
 )
-from src.services.extract_utils import _call_llm_json
+from src.services.extract_utils import _call_llm_json, warm_prompt_prefix
 from src.dependencies.cloudflare_access import (
     verify_cf_access_token,
     extract_token_from_headers,
@@ -117,6 +128,35 @@ def _update_llm_cache(
     _llm_cache["checked_at"] = datetime.now(timezone.utc)
 
 
+def _warmup_prompt_prefixes() -> List[str]:
+    """Static prompt prefixes sent at the head of every live LLM call."""
+    from src.services.prompts import BATCH_CONSOLIDATION_PROMPT, CONSOLIDATION_TEMPLATE
+    from src.services.prompts_v3 import (
+        EXTRACTION_SYSTEM_V3,
+        EXTRACTION_SYSTEM_V3_SHORT,
+        WORTHINESS_PROMPT_V3,
+    )
+
+    return [
+        EXTRACTION_SYSTEM_V3,
+        EXTRACTION_SYSTEM_V3_SHORT,
+        WORTHINESS_PROMPT_V3,
+        # Everything before the {memories} slot is shared by every merge
+        CONSOLIDATION_TEMPLATE.fragments[0],
+        BATCH_CONSOLIDATION_PROMPT,
+    ]
+
+
+async def _warm_prompt_caches() -> None:
+    prefixes = _warmup_prompt_prefixes()
+    results = await asyncio.gather(
+        *(asyncio.to_thread(warm_prompt_prefix, prefix) for prefix in prefixes)
+    )
+    logging.getLogger("agentic_memories.api").info(
+        "[startup] prompt prefix warm-up: %d/%d ok", sum(results), len(prefixes)
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
@@ -178,6 +218,10 @@ async def lifespan(app: FastAPI):
             f"Chroma connection warning: {e}"
         )
 
+    # Startup: Prime the LLM prefix cache (opt-in)
+    if is_prompt_warmup_enabled():
+        await _warm_prompt_caches()
+
     # Startup: Start scheduler
     _start_scheduler()
 
@@ -254,13 +298,69 @@ def _execute_compaction(r) -> None:
     if not users:
         logger.info("[maint.compaction] no active users in last 24h")
         return
-    # TODO: enqueue compaction graph per user (placeholder log)
     for uid in sorted(users):
+        _compact_user_guarded(r, uid, "daily")
+
+
+# Per-user lock shared by every compaction trigger (nightly job, /v1/maintenance,
+# compact_all, /v1/maintenance/compact) so overlapping triggers collapse into
+# one run per user instead of repeating the consolidation LLM calls.
+USER_COMPACTION_LOCK_TTL = 3600
+
+
+@contextmanager
+def _user_compaction_lock(r, uid: str, source: str):
+    """Hold the per-user compaction lock; yields False if another run holds it.
+
+    Without Redis there is nothing to coordinate on, so the caller always
+    proceeds. The lock expires after USER_COMPACTION_LOCK_TTL in case a run
+    dies without releasing it.
+    """
+    if r is None:
+        yield True
+        return
+    lock = r.lock(
+        f"compaction_lock:user:{uid}",
+        timeout=USER_COMPACTION_LOCK_TTL,
+        blocking=False,
+    )
+    if not lock.acquire():
+        logger.info(
+            "[maint.compaction] skipped user_id=%s (%s): already running",
+            uid,
+            source,
+        )
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            lock.release()
+        except Exception as release_err:
+            logger.info(
+                "[maint.compaction] user lock release skipped user_id=%s: %s",
+                uid,
+                release_err,
+            )
+
+
+def _compact_user_guarded(r, uid: str, source: str) -> None:
+    """Compact one user under the per-user lock, logging instead of raising.
+
+    Used by the batch triggers (nightly job, compact_all), where one user's
+    failure must not stop the rest of the pass.
+    """
+    with _user_compaction_lock(r, uid, source) as acquired:
+        if not acquired:
+            return
         try:
             stats = run_compaction_for_user(uid)
-            logger.info("[maint.compaction.done] user_id=%s stats=%s", uid, stats)
+            logger.info(
+                "[maint.compaction.done] user_id=%s (%s) stats=%s", uid, source, stats
+            )
         except Exception as exc:
-            logger.info("[maint.compaction.error] user_id=%s %s", uid, exc)
+            logger.info("[maint.compaction.error] user_id=%s (%s) %s", uid, source, exc)
 
 
 def _run_ttl_sweep() -> None:
@@ -1995,14 +2095,22 @@ def forget(body: ForgetRequest) -> ForgetResponse:
     )
 
 
+def _run_compaction_trigger() -> None:
+    """Run the daily compaction for the maintenance API after it has responded."""
+    try:
+        _run_daily_compaction()
+    except Exception as exc:
+        logger.info("[maint.api] compaction trigger failed: %s", exc)
+
+
 @app.post("/v1/maintenance", response_model=MaintenanceResponse)
-def maintenance(body: MaintenanceRequest) -> MaintenanceResponse:
+def maintenance(
+    body: MaintenanceRequest, background_tasks: BackgroundTasks
+) -> MaintenanceResponse:
     jobs = body.jobs or ["compaction"]
     if "compaction" in jobs:
-        try:
-            _run_daily_compaction()
-        except Exception as exc:
-            logger.info("[maint.api] compaction trigger failed: %s", exc)
+        # Compaction (dedup + LLM consolidation) runs off the request path
+        background_tasks.add_task(_run_compaction_trigger)
     return MaintenanceResponse(jobs_started=jobs, status="running")
 
 
@@ -2187,8 +2295,15 @@ def portfolio_summary(
     return response
 
 
+def _compact_users(users: List[str]) -> None:
+    """Compact each user in turn; scheduled after the compact_all response."""
+    r = get_redis_client()
+    for uid in users:
+        _compact_user_guarded(r, uid, "manual")
+
+
 @app.post("/v1/maintenance/compact_all", response_model=MaintenanceResponse)
-def compact_all_users() -> MaintenanceResponse:
+def compact_all_users(background_tasks: BackgroundTasks) -> MaintenanceResponse:
     r = get_redis_client()
     users: List[str] = []
     try:
@@ -2199,14 +2314,8 @@ def compact_all_users() -> MaintenanceResponse:
     if not users:
         logger.info("[maint.compact_all] no users found")
         return MaintenanceResponse(jobs_started=["compaction-none"], status="running")
-    for uid in sorted(users):
-        try:
-            stats = run_compaction_for_user(uid)
-            logger.info(
-                "[maint.compaction.done] user_id=%s (manual) stats=%s", uid, stats
-            )
-        except Exception as exc:
-            logger.info("[maint.compaction.error] user_id=%s (manual) %s", uid, exc)
+    # Per-user consolidation makes LLM calls; don't hold the request open for them
+    background_tasks.add_task(_compact_users, sorted(users))
     return MaintenanceResponse(jobs_started=["compaction_all"], status="running")
 
 
@@ -2226,11 +2335,23 @@ def compact_single_user(
     By default, runs TTL cleanup, deduplication, and consolidation.
     Set skip_reextract=false to enable full LLM re-extraction (slow, expensive).
     Set skip_consolidate=true to disable memory consolidation.
+    Returns status "skipped" if another trigger is already compacting this user.
     """
     try:
-        stats = run_compaction_for_user(
-            user_id, skip_reextract=skip_reextract, skip_consolidate=skip_consolidate
-        )
+        with _user_compaction_lock(get_redis_client(), user_id, "single") as acquired:
+            if not acquired:
+                return {
+                    "user_id": user_id,
+                    "skip_reextract": skip_reextract,
+                    "skip_consolidate": skip_consolidate,
+                    "status": "skipped",
+                    "reason": "already running",
+                }
+            stats = run_compaction_for_user(
+                user_id,
+                skip_reextract=skip_reextract,
+                skip_consolidate=skip_consolidate,
+            )
         logger.info(
             "[maint.compaction.done] user_id=%s skip_reextract=%s skip_consolidate=%s stats=%s",
             user_id,
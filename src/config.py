@@ -196,6 +196,62 @@ def get_extraction_retries() -> int:
         return 1
 
 
+@lru_cache(maxsize=1)
+def get_extraction_history_max_tokens() -> int:
+    # Approximate token ceiling for the conversation sent to extraction; the
+    # oldest turns beyond it are dropped. 0 disables the cap.
+    try:
+        return int(os.getenv("EXTRACTION_HISTORY_MAX_TOKENS", "2000"))
+    except ValueError:
+        return 2000
+
+
+@lru_cache(maxsize=1)
+def get_extraction_existing_max_tokens() -> int:
+    # Approximate token ceiling for the existing-memories context; the least
+    # relevant memories beyond it are dropped. 0 disables the cap.
+    try:
+        return int(os.getenv("EXTRACTION_EXISTING_MAX_TOKENS", "1500"))
+    except ValueError:
+        return 1500
+
+
+@lru_cache(maxsize=1)
+def is_prompt_warmup_enabled() -> bool:
+    # Send a 1-token call per static system prompt at startup so a prefix-caching
+    # server (vLLM/SGLang, hosted automatic caching) is warm for the first request.
+    return os.getenv("WARMUP_PREFIXES", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+@lru_cache(maxsize=1)
+def get_profile_extraction_examples_enabled() -> bool:
+    # Few-shot examples in the profile extraction prompt; disable to cut
+    # input tokens on high-volume deployments.
+    return os.getenv("PROFILE_EXTRACTION_EXAMPLES", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+@lru_cache(maxsize=1)
+def get_profile_extraction_prefilter_enabled() -> bool:
+    # Keyword/tag pre-screen that drops memories before profile extraction.
+    # Off by default: the LLM judges every memory unless this is enabled.
+    return os.getenv("PROFILE_EXTRACTION_PREFILTER", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
 @lru_cache(maxsize=1)
 def get_heuristic_only_mode() -> bool:
     return os.getenv("EXTRACTION_HEURISTIC_ONLY", "false").lower() in {
@@ -7,10 +7,17 @@ from typing import Dict, Any, Optional, List, Union
 import logging
 from datetime import datetime, timezone
 
+import orjson
 from fastapi import APIRouter, Query, HTTPException
+from psycopg.rows import tuple_row
 from pydantic import BaseModel
 
-from src.services.profile_storage import ProfileStorageService, VALID_CATEGORIES
+from src.services.profile_storage import (
+    EXPECTED_PROFILE_FIELDS,
+    TOTAL_EXPECTED_FIELDS,
+    VALID_CATEGORIES,
+    ProfileStorageService,
+)
 from src.services.health_field_validators import validate_field as validate_health_field
 from src.dependencies.timescale import get_timescale_conn, release_timescale_conn
 
@@ -18,6 +25,19 @@ logger = logging.getLogger("agentic_memories.profile_api")
 
 router = APIRouter(prefix="/v1/profile", tags=["profile"])
 
+# Baseline (category, field_name) pairs as parallel arrays, built once and
+# unnested server-side by _update_profile_metadata
+_EXPECTED_CATEGORIES = [
+    category
+    for category, field_names in EXPECTED_PROFILE_FIELDS.items()
+    for _ in field_names
+]
+_EXPECTED_FIELD_NAMES = [
+    field_name
+    for field_names in EXPECTED_PROFILE_FIELDS.values()
+    for field_name in field_names
+]
+
 
 # Pydantic models for request/response validation
 class UpdateFieldRequest(BaseModel):
@@ -201,7 +221,7 @@ def get_profile_completeness(
 
     try:
         conn = get_timescale_conn()
-        cursor = conn.cursor()
+        cursor = conn.cursor(row_factory=tuple_row)
 
         # Get profile metadata
         cursor.execute(
@@ -220,13 +240,7 @@ def get_profile_completeness(
                 status_code=404, detail=f"Profile not found for user_id: {user_id}"
             )
 
-        # Handle both tuple and dict-like cursor results
-        if isinstance(row, dict):
-            completeness_pct = row["completeness_pct"]
-            populated_fields = row["populated_fields"]
-            total_fields = row["total_fields"]
-        else:
-            completeness_pct, populated_fields, total_fields = row
+        completeness_pct, populated_fields, total_fields = row
 
         return CompletenessResponse(
             user_id=user_id,
@@ -348,7 +362,7 @@ def update_profile_field(
 
     try:
         conn = get_timescale_conn()
-        cursor = conn.cursor()
+        cursor = conn.cursor(row_factory=tuple_row)
 
         # Ensure user profile exists
         cursor.execute(
@@ -360,29 +374,20 @@ def update_profile_field(
             (body.user_id,),
         )
 
-        # Infer value type
-        value_type = _infer_value_type(body.value)
+        # Serialize to JSON text for the JSONB column
         value_str = _serialize_field_value(body.value)
 
         # UPSERT profile_field
         cursor.execute(
             """
-            INSERT INTO profile_fields (user_id, category, field_name, field_value, value_type, last_updated)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            INSERT INTO profile_fields (user_id, category, field_name, field_value, last_updated)
+            VALUES (%s, %s, %s, %s::jsonb, now())
             ON CONFLICT (user_id, category, field_name)
             DO UPDATE SET
                 field_value = EXCLUDED.field_value,
-                value_type = EXCLUDED.value_type,
                 last_updated = EXCLUDED.last_updated
         """,
-            (
-                body.user_id,
-                category,
-                field_name,
-                value_str,
-                value_type,
-                datetime.now(timezone.utc),
-            ),
+            (body.user_id, category, field_name, value_str),
         )
 
         # Set confidence to 100% (manual is authoritative)
@@ -395,7 +400,7 @@ def update_profile_field(
                 explicitness_score, source_diversity_score,
                 mention_count, last_mentioned, last_updated
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, now(), now())
             ON CONFLICT (user_id, category, field_name)
             DO UPDATE SET
                 overall_confidence = EXCLUDED.overall_confidence,
@@ -417,8 +422,6 @@ def update_profile_field(
                 100,
                 100,  # All confidence scores = 100 for manual
                 1,
-                datetime.now(timezone.utc),
-                datetime.now(timezone.utc),
             ),
         )
 
@@ -426,16 +429,9 @@ def update_profile_field(
         cursor.execute(
             """
             INSERT INTO profile_sources (user_id, category, field_name, source_memory_id, source_type, extracted_at)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, now())
         """,
-            (
-                body.user_id,
-                category,
-                field_name,
-                "manual",
-                "explicit",
-                datetime.now(timezone.utc),
-            ),
+            (body.user_id, category, field_name, "manual", "explicit"),
         )
 
         # Update user_profiles metadata (also updates last_updated)
@@ -443,6 +439,10 @@ def update_profile_field(
 
         conn.commit()
 
+        # Invalidate after commit so a concurrent read cannot re-cache the
+        # pre-update profile
+        _invalidate_completeness_cache(body.user_id)
+
         logger.info(
             "[profile.api.update] user_id=%s category=%s field_name=%s success",
             body.user_id,
@@ -511,7 +511,7 @@ def delete_profile_field(
 
     try:
         conn = get_timescale_conn()
-        cursor = conn.cursor()
+        cursor = conn.cursor(row_factory=tuple_row)
 
         # Check if user profile exists
         cursor.execute(
@@ -573,6 +573,10 @@ def delete_profile_field(
 
         conn.commit()
 
+        # Invalidate after commit so a concurrent read cannot re-cache the
+        # pre-delete profile
+        _invalidate_completeness_cache(user_id)
+
         logger.info(
             "[profile.api.delete_field] user_id=%s category=%s field_name=%s success",
             user_id,
@@ -637,7 +641,7 @@ def delete_profile(
 
     try:
         conn = get_timescale_conn()
-        cursor = conn.cursor()
+        cursor = conn.cursor(row_factory=tuple_row)
 
         # Check if profile exists
         cursor.execute(
@@ -662,6 +666,9 @@ def delete_profile(
 
         conn.commit()
 
+        # Drop cached completeness/profile for the deleted user
+        _invalidate_completeness_cache(user_id)
+
         logger.info("[profile.api.delete] user_id=%s success", user_id)
 
         return DeleteResponse(deleted=True, user_id=user_id)
@@ -687,118 +694,49 @@ def delete_profile(
 
 
 # Helper functions (copied from ProfileStorageService for consistency)
-def _infer_value_type(value: Any) -> str:
-    """Infer the value_type from Python type"""
-    if isinstance(value, bool):
-        return "bool"
-    elif isinstance(value, int):
-        return "int"
-    elif isinstance(value, float):
-        return "float"
-    elif isinstance(value, list):
-        return "list"
-    elif isinstance(value, dict):
-        return "dict"
-    else:
-        return "string"
-
-
 def _serialize_field_value(value: Any) -> str:
-    """Serialize field value to string for TEXT storage"""
-    import json
-
-    if isinstance(value, (list, dict)):
-        return json.dumps(value)
-    elif isinstance(value, bool):
-        return str(value).lower()  # "true" or "false"
-    else:
-        return str(value)
+    """Serialize field value to JSON text for the JSONB column"""
+    return orjson.dumps(value, default=str).decode()
 
 
 def _update_profile_metadata(cursor, user_id: str):
     """
     Update user_profiles with field counts and completeness percentage.
     Uses the service layer constants (TOTAL_EXPECTED_FIELDS across 8 categories).
-    Also invalidates the completeness cache.
-    """
-    from src.services.profile_storage import (
-        EXPECTED_PROFILE_FIELDS,
-        TOTAL_EXPECTED_FIELDS,
-    )
-
-    # Get populated fields grouped by category
-    cursor.execute(
-        """
-        SELECT category, field_name
-        FROM profile_fields
-        WHERE user_id = %s
-    """,
-        (user_id,),
-    )
-
-    rows = cursor.fetchall()
-
-    # Build set of populated fields per category
-    populated_by_category = {cat: set() for cat in EXPECTED_PROFILE_FIELDS}
-    for row in rows:
-        if isinstance(row, dict):
-            category = row["category"]
-            field_name = row["field_name"]
-        else:
-            category, field_name = row
-
-        if category in populated_by_category:
-            populated_by_category[category].add(field_name)
-
-    # Count total populated fields (intersection with expected fields)
-    total_populated = 0
-    for category, expected_fields in EXPECTED_PROFILE_FIELDS.items():
-        populated = populated_by_category.get(category, set())
-        # Count only fields that are in our expected list
-        total_populated += len(populated.intersection(set(expected_fields)))
+    Callers invalidate the completeness/profile cache after commit.
 
-    # Calculate completeness percentage
-    completeness_pct = min(100.0, (total_populated / TOTAL_EXPECTED_FIELDS) * 100)
-
-    # Update user_profiles
+    The baseline count and the UPDATE run as one statement, so no field rows
+    are shipped back and the count sees this transaction's writes.
+    """
     cursor.execute(
         """
         UPDATE user_profiles
         SET
-            completeness_pct = %s,
-            total_fields = %s,
-            populated_fields = %s,
-            last_updated = %s
-        WHERE user_id = %s
+            completeness_pct = LEAST(100.0, populated.n * 100.0 / %(total)s),
+            total_fields = %(total)s,
+            populated_fields = populated.n,
+            last_updated = now()
+        FROM (
+            SELECT count(*) AS n
+            FROM profile_fields pf
+            JOIN unnest(
+                %(expected_categories)s::text[],
+                %(expected_field_names)s::text[]
+            ) AS e(category, field_name) USING (category, field_name)
+            WHERE pf.user_id = %(user_id)s
+        ) AS populated
+        WHERE user_profiles.user_id = %(user_id)s
     """,
-        (
-            completeness_pct,
-            TOTAL_EXPECTED_FIELDS,
-            total_populated,
-            datetime.now(timezone.utc),
-            user_id,
-        ),
+        {
+            "user_id": user_id,
+            "total": TOTAL_EXPECTED_FIELDS,
+            "expected_categories": _EXPECTED_CATEGORIES,
+            "expected_field_names": _EXPECTED_FIELD_NAMES,
+        },
     )
 
-    # Invalidate completeness cache
-    _invalidate_completeness_cache(user_id)
-
 
 def _invalidate_completeness_cache(user_id: str):
-    """Invalidate the Redis completeness cache for a user"""
-    from src.services.profile_storage import COMPLETENESS_CACHE_KEY
-    from src.dependencies.redis_client import get_redis_client
-
-    try:
-        redis_client = get_redis_client()
-        if redis_client:
-            cache_key = COMPLETENESS_CACHE_KEY.format(user_id=user_id)
-            redis_client.delete(cache_key)
-            logger.debug(
-                "[profile.cache] invalidated completeness cache for user_id=%s", user_id
-            )
-    except Exception as e:
-        # Cache invalidation failure shouldn't break the main flow
-        logger.warning(
-            "[profile.cache] failed to invalidate cache for user_id=%s: %s", user_id, e
-        )
+    """Invalidate the Redis completeness and profile caches for a user"""
+    # Also evicts this worker's in-process copy; other workers age out on their TTL
+    _profile_service.invalidate_many([user_id])
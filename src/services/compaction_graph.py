@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple
 
+import hashlib
 import logging
 import json
 import os
@@ -21,9 +22,9 @@ from src.services.compaction_ops import (
 from src.services.embedding_utils import generate_embedding
 from src.services.storage import upsert_memories
 from src.models import Memory
-from src.services.extraction import extract_from_transcript
+from src.services.extraction import extract_from_transcripts
 from src.schemas import TranscriptRequest, Message
-from src.services.prompts import CONSOLIDATION_PROMPT
+from src.services.prompts import CONSOLIDATION_TEMPLATE
 
 
 logger = logging.getLogger("agentic_memories.compaction_graph")
@@ -209,24 +210,72 @@ def _cluster_memories(
     return clusters
 
 
-def _consolidate_cluster(user_id: str, cluster: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Use LLM to consolidate a cluster of related memories into a single golden record.
+# Cluster members at least this similar are copies of one fact. They are
+# dropped without an LLM merge; the merge only runs on distinct content.
+DUPLICATE_SIMILARITY = 0.92
+
+
+def _collapse_duplicates(
+    cluster: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Split a cluster into distinct members and the ids of redundant copies.
+
+    Exact copies (same normalized content hash) are caught first, then near
+    copies whose attached embeddings have cosine similarity of at least
+    DUPLICATE_SIMILARITY with a kept member. As in `simple_deduplicate`, the
+    earlier member wins.
 
     Args:
-            user_id: User ID for the memories
-            cluster: List of memory dicts to consolidate
+            cluster: List of memory dicts from `_cluster_memories`
 
     Returns:
-            Dict with 'memory' (Memory object) and 'source_ids' (list of source IDs)
+            (distinct members, ids of the dropped copies)
     """
-    from src.services.extract_utils import _call_llm_json
-    from datetime import datetime
+    distinct: List[Dict[str, Any]] = []
+    kept_vectors: List[np.ndarray] = []
+    seen_hashes: set = set()
+    duplicate_ids: List[str] = []
 
-    logger.info("[consolidate.start] user_id=%s cluster_size=%s", user_id, len(cluster))
-    _t_consolidate = _time.perf_counter()
+    for mem in cluster:
+        normalized = " ".join(str(mem.get("content", "")).lower().split())
+        digest = hashlib.sha256(normalized.encode("utf-8")).digest()
+
+        vector = None
+        emb = mem.get("embedding")
+        if emb is not None and len(emb) > 0:
+            vector = np.asarray(emb, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            vector = vector / norm if norm else None
+
+        is_copy = digest in seen_hashes or (
+            vector is not None
+            and any(
+                kept.shape == vector.shape
+                and float(kept @ vector) >= DUPLICATE_SIMILARITY
+                for kept in kept_vectors
+            )
+        )
+        if is_copy:
+            if mem.get("id"):
+                duplicate_ids.append(mem["id"])
+            continue
+
+        seen_hashes.add(digest)
+        if vector is not None:
+            kept_vectors.append(vector)
+        distinct.append(mem)
+
+    return distinct, duplicate_ids
+
+
+def _cluster_rows(cluster: List[Dict[str, Any]]) -> str:
+    """Render a cluster as compact idx|YYMMDD|content rows, oldest first.
+
+    The consolidation prompts document this format; sorting chronologically
+    lets the LLM resolve conflicts in favour of the newest row.
+    """
+    from datetime import datetime
 
-    # Format memories for prompt with timestamps for conflict resolution
-    # Sort by timestamp (oldest first) so LLM sees chronological order
     def get_timestamp(mem: Dict[str, Any]) -> str:
         meta = mem.get("metadata", {})
         # Try created_at first, fall back to updated_at
@@ -243,19 +292,89 @@ def _consolidate_cluster(user_id: str, cluster: List[Dict[str, Any]]) -> Dict[st
                 pass
         return "unknown"
 
-    # Sort cluster by timestamp (oldest first)
+    def compact_date(mem: Dict[str, Any]) -> str:
+        ts = get_timestamp(mem)
+        if len(ts) == 10 and ts[4] == "-" and ts[7] == "-":
+            return ts[2:4] + ts[5:7] + ts[8:10]
+        return "?"
+
     sorted_cluster = sorted(cluster, key=lambda m: get_timestamp(m))
+    return "\n".join(
+        f"{i}|{compact_date(mem)}|{mem.get('content', '')}"
+        for i, mem in enumerate(sorted_cluster, 1)
+    )
+
 
-    memories_text = "\n".join(
-        [f"- [{get_timestamp(mem)}] {mem.get('content', '')}" for mem in sorted_cluster]
+def _build_consolidated(
+    user_id: str, cluster: List[Dict[str, Any]], content: str
+) -> Dict[str, Any]:
+    """Wrap merged content for a cluster as a Memory plus its source IDs."""
+    # Get max confidence from sources
+    source_confidences = [
+        float(mem.get("metadata", {}).get("confidence", 0.5)) for mem in cluster
+    ]
+    max_confidence = max(source_confidences) if source_confidences else 0.9
+
+    # Merge tags from all sources (deduplicated)
+    all_tags = set()
+    for mem in cluster:
+        meta = mem.get("metadata", {})
+        tags = meta.get("tags", [])
+        if isinstance(tags, str):
+            try:
+                tags = json.loads(tags)
+            except Exception:
+                tags = []
+        if isinstance(tags, list):
+            all_tags.update(tags)
+
+    # Get source IDs
+    source_ids = [mem.get("id") for mem in cluster if mem.get("id")]
+
+    # Create consolidated memory
+    memory = Memory(
+        user_id=user_id,
+        content=content,
+        layer="semantic",
+        type="explicit",
+        confidence=max_confidence,
+        embedding=generate_embedding(content),
+        metadata={
+            "source": "consolidation",
+            "tags": list(all_tags),
+            "consolidated_from": source_ids,
+            "consolidated_count": len(cluster),
+        },
     )
+    return {"memory": memory, "source_ids": source_ids}
+
 
-    system_prompt = CONSOLIDATION_PROMPT.format(memories=memories_text)
+def _consolidate_cluster(user_id: str, cluster: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Use LLM to consolidate a cluster of related memories into a single golden record.
+
+    Args:
+            user_id: User ID for the memories
+            cluster: List of memory dicts to consolidate
+
+    Returns:
+            Dict with 'memory' (Memory object) and 'source_ids' (list of source IDs)
+    """
+    from src.services.extract_utils import (
+        CONSOLIDATION_RESPONSE_FORMAT,
+        _call_llm_json,
+    )
+
+    logger.info("[consolidate.start] user_id=%s cluster_size=%s", user_id, len(cluster))
+    _t_consolidate = _time.perf_counter()
+
+    system_prompt = CONSOLIDATION_TEMPLATE.render(memories=_cluster_rows(cluster))
 
     try:
         # Use the shared LLM call utility (supports OpenAI/xAI, retries, tracing)
         response = _call_llm_json(
-            system_prompt, {"action": "consolidate"}, expect_array=False
+            system_prompt,
+            {"action": "consolidate"},
+            response_format=CONSOLIDATION_RESPONSE_FORMAT,
         )
 
         if not response:
@@ -272,59 +391,118 @@ def _consolidate_cluster(user_id: str, cluster: List[Dict[str, Any]]) -> Dict[st
             logger.warning("[consolidate.parse.empty] user_id=%s", user_id)
             return {"memory": None, "source_ids": []}
 
-        # Get max confidence from sources
-        source_confidences = [
-            float(mem.get("metadata", {}).get("confidence", 0.5)) for mem in cluster
-        ]
-        max_confidence = max(source_confidences) if source_confidences else 0.9
-
-        # Merge tags from all sources (deduplicated)
-        all_tags = set()
-        for mem in cluster:
-            meta = mem.get("metadata", {})
-            tags = meta.get("tags", [])
-            if isinstance(tags, str):
-                try:
-                    tags = json.loads(tags)
-                except Exception:
-                    tags = []
-            if isinstance(tags, list):
-                all_tags.update(tags)
-
-        # Get source IDs
-        source_ids = [mem.get("id") for mem in cluster if mem.get("id")]
-
-        # Create consolidated memory
-        memory = Memory(
-            user_id=user_id,
-            content=content,
-            layer="semantic",
-            type="explicit",
-            confidence=max_confidence,
-            embedding=generate_embedding(content),
-            metadata={
-                "source": "consolidation",
-                "tags": list(all_tags),
-                "consolidated_from": source_ids,
-                "consolidated_count": len(cluster),
-            },
-        )
+        result = _build_consolidated(user_id, cluster, content)
 
         logger.info(
             "[consolidate.success] user_id=%s sources=%s content_len=%s latency_ms=%s",
             user_id,
-            len(source_ids),
+            len(result["source_ids"]),
             len(content),
             int((_time.perf_counter() - _t_consolidate) * 1000),
         )
 
-        return {"memory": memory, "source_ids": source_ids}
+        return result
 
     except Exception as e:
         logger.error("[consolidate.error] user_id=%s error=%s", user_id, e)
         return {"memory": None, "source_ids": []}
 
 
+# Clusters merged per LLM request; they share one static system prompt
+CONSOLIDATION_BATCH_SIZE = 8
+
+
+def _consolidate_clusters(
+    user_id: str, clusters: List[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Consolidate several clusters, up to CONSOLIDATION_BATCH_SIZE per LLM call.
+
+    Returns one result per cluster, in order, shaped like _consolidate_cluster's.
+    A lone cluster uses the single-cluster prompt. Reply entries whose index is
+    not an int in range, or that repeat an index, are discarded; any cluster
+    left without content (including every cluster of a failed batch) falls
+    back to _consolidate_cluster.
+    """
+    from src.services.extract_utils import (
+        BATCH_CONSOLIDATION_RESPONSE_FORMAT,
+        _call_llm_json,
+    )
+    from src.services.prompts import BATCH_CONSOLIDATION_PROMPT
+
+    results: List[Dict[str, Any]] = []
+    for start in range(0, len(clusters), CONSOLIDATION_BATCH_SIZE):
+        chunk = clusters[start : start + CONSOLIDATION_BATCH_SIZE]
+        if len(chunk) == 1:
+            results.append(_consolidate_cluster(user_id, chunk[0]))
+            continue
+
+        _t_batch = _time.perf_counter()
+        payload = {
+            "clusters": [
+                {"index": i, "memories": _cluster_rows(cluster)}
+                for i, cluster in enumerate(chunk)
+            ]
+        }
+        response = None
+        try:
+            response = _call_llm_json(
+                BATCH_CONSOLIDATION_PROMPT,
+                payload,
+                response_format=BATCH_CONSOLIDATION_RESPONSE_FORMAT,
+            )
+        except Exception as e:
+            logger.error("[consolidate.batch.error] user_id=%s error=%s", user_id, e)
+
+        contents: Dict[int, str] = {}
+        duplicates = set()
+        entries = response.get("results") if isinstance(response, dict) else None
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            content = entry.get("content")
+            if (
+                not isinstance(index, int)
+                or isinstance(index, bool)
+                or not 0 <= index < len(chunk)
+                or not isinstance(content, str)
+                or not content.strip()
+            ):
+                continue
+            if index in contents:
+                duplicates.add(index)
+            contents[index] = content
+        if duplicates:
+            logger.warning(
+                "[consolidate.batch] user_id=%s duplicate_indexes=%s",
+                user_id,
+                sorted(duplicates),
+            )
+            for index in duplicates:
+                del contents[index]
+
+        for i, cluster in enumerate(chunk):
+            content = contents.get(i)
+            if not content:
+                # Missing, rejected or failed batch entry: merge this one alone
+                results.append(_consolidate_cluster(user_id, cluster))
+                continue
+            try:
+                results.append(_build_consolidated(user_id, cluster, content))
+            except Exception as e:
+                logger.error("[consolidate.error] user_id=%s error=%s", user_id, e)
+                results.append({"memory": None, "source_ids": []})
+
+        logger.info(
+            "[consolidate.batch] user_id=%s clusters=%s merged=%s latency_ms=%s",
+            user_id,
+            len(chunk),
+            len(contents),
+            int((_time.perf_counter() - _t_batch) * 1000),
+        )
+    return results
+
+
 def _fetch_user_memories(
     user_id: str, limit: int = 200, offset: int = 0
 ) -> List[Dict[str, Any]]:
@@ -382,18 +560,22 @@ def _fetch_user_memories(
 def _reextract_memories(
     user_id: str, candidates: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
-    """Re-run the store/extraction pipeline per memory content to reclassify and normalize.
+    """Re-run extraction over each memory's content (batched) to reclassify and normalize.
     Returns dict with keys: new_memories (List[Memory]), delete_ids (List[str]).
+
+    The batch has no separate worthiness pass (see run_extraction_batch). A
+    source is only replaced, and its id only added to delete_ids, when its own
+    batch entry yields valid memories; otherwise it is kept as is.
     """
     new_mems: List[Memory] = []
     delete_ids: List[str] = []
     skipped_count = 0
     error_count = 0
 
+    valid: List[Tuple[str, TranscriptRequest]] = []
     for c in candidates:
         mid = c.get("id")
         content = c.get("content", "")
-        _metadata = c.get("metadata", {})
 
         # Validate candidate structure
         if not mid:
@@ -412,56 +594,65 @@ def _reextract_memories(
             skipped_count += 1
             continue
 
-        # Create extraction request
-        req = TranscriptRequest(
-            user_id=user_id, history=[Message(role="user", content=content)]
+        valid.append(
+            (
+                mid,
+                TranscriptRequest(
+                    user_id=user_id, history=[Message(role="user", content=content)]
+                ),
+            )
         )
 
-        try:
-            result = extract_from_transcript(req)
-            if result.memories and len(result.memories) > 0:
-                # Validate that new memories have proper structure
-                valid_memories = []
-                for mem in result.memories:
-                    if mem.content and mem.content.strip():
-                        valid_memories.append(mem)
-                    else:
-                        logger.warning(
-                            "[graph.reextract.skip_memory] user_id=%s id=%s reason=empty_extracted_content",
-                            user_id,
-                            mid,
-                        )
-
-                if valid_memories:
-                    new_mems.extend(valid_memories)
-                    delete_ids.append(mid)
-                    logger.debug(
-                        "[graph.reextract.success] user_id=%s id=%s extracted=%s",
-                        user_id,
-                        mid,
-                        len(valid_memories),
-                    )
+    # One batched extraction over every candidate instead of a graph run each
+    try:
+        results = extract_from_transcripts([req for _, req in valid])
+    except Exception as exc:
+        logger.error(
+            "[graph.reextract.error] user_id=%s candidates=%s error=%s",
+            user_id,
+            len(valid),
+            exc,
+        )
+        error_count += len(valid)
+        results = []
+
+    for (mid, _req), result in zip(valid, results):
+        if result.memories and len(result.memories) > 0:
+            # Validate that new memories have proper structure
+            valid_memories = []
+            for mem in result.memories:
+                if mem.content and mem.content.strip():
+                    valid_memories.append(mem)
                 else:
                     logger.warning(
-                        "[graph.reextract.skip] user_id=%s id=%s reason=no_valid_memories",
+                        "[graph.reextract.skip_memory] user_id=%s id=%s reason=empty_extracted_content",
                         user_id,
                         mid,
                     )
-                    skipped_count += 1
+
+            if valid_memories:
+                new_mems.extend(valid_memories)
+                delete_ids.append(mid)
+                logger.debug(
+                    "[graph.reextract.success] user_id=%s id=%s extracted=%s",
+                    user_id,
+                    mid,
+                    len(valid_memories),
+                )
             else:
                 logger.warning(
-                    "[graph.reextract.skip] user_id=%s id=%s reason=no_memories_extracted",
+                    "[graph.reextract.skip] user_id=%s id=%s reason=no_valid_memories",
                     user_id,
                     mid,
                 )
                 skipped_count += 1
-
-        except Exception as exc:
-            logger.error(
-                "[graph.reextract.error] user_id=%s id=%s error=%s", user_id, mid, exc
+        else:
+            logger.warning(
+                "[graph.reextract.skip] user_id=%s id=%s reason=no_memories_extracted",
+                user_id,
+                mid,
             )
-            error_count += 1
-            continue
+            skipped_count += 1
 
     logger.info(
         "[graph.reextract.summary] user_id=%s processed=%s new_memories=%s delete_ids=%s skipped=%s errors=%s",
@@ -658,14 +849,47 @@ def build_compaction_graph() -> StateGraph:
         sources_removed = 0
         dry_run = state.get("dry_run", False)
 
-        for _cluster_idx, cluster in enumerate(clusters):
-            result = _consolidate_cluster(user_id, cluster)
+        duplicates_removed = 0
+        # (distinct members, duplicate ids) for clusters that still need a merge
+        pending: List[Tuple[List[Dict[str, Any]], List[str]]] = []
+        for cluster in clusters:
+            # Drop exact and near copies first; only distinct facts need the LLM
+            distinct, duplicate_ids = _collapse_duplicates(cluster)
+            if len(distinct) < 2:
+                logger.info(
+                    "[graph.consolidate.duplicates] user_id=%s dropped=%s dry_run=%s",
+                    user_id,
+                    len(duplicate_ids),
+                    dry_run,
+                )
+                if duplicate_ids and not dry_run:
+                    try:
+                        _get_collection().delete(ids=duplicate_ids)  # type: ignore[attr-defined]
+                    except Exception as exc:
+                        logger.error(
+                            "[graph.consolidate.error] user_id=%s error=%s",
+                            user_id,
+                            exc,
+                        )
+                        continue
+                duplicates_removed += len(duplicate_ids)
+                continue
+
+            pending.append((distinct, duplicate_ids))
+
+        # Independent clusters share one static prompt, several per LLM call
+        results = _consolidate_clusters(user_id, [distinct for distinct, _ in pending])
+        for _cluster_idx, ((_, duplicate_ids), result) in enumerate(
+            zip(pending, results)
+        ):
+            if result.get("source_ids"):
+                result["source_ids"] = result["source_ids"] + duplicate_ids
 
             logger.info(
                 "[graph.consolidate.progress] user_id=%s done=%s of %s consolidated_so_far=%s",
                 user_id,
                 _cluster_idx + 1,
-                len(clusters),
+                len(pending),
                 consolidated_count,
             )
 
@@ -710,6 +934,7 @@ def build_compaction_graph() -> StateGraph:
         state.setdefault("metrics", {})
         state["metrics"]["consolidated_count"] = consolidated_count
         state["metrics"]["sources_removed"] = sources_removed
+        state["metrics"]["consolidate_duplicates_removed"] = duplicates_removed
 
         latency_ms = int((_time.perf_counter() - _t) * 1000)
         logger.info(
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Type
 
-import json
 import logging
 import re
 
+import orjson
+from pydantic import BaseModel, Field
+
 from src.config import (
     get_extraction_model_name,
     get_extraction_retries,
@@ -20,6 +22,65 @@ from src.config import (
 EXTRACTION_MODEL = get_extraction_model_name()
 
 
+class WorthinessResult(BaseModel):
+    """Structured output of the worthiness check."""
+
+    worthy: bool
+    confidence: float
+    tags: List[str]
+    reasons: List[str]
+    emotional_intensity: float = Field(
+        description="0.0-1.0, how emotionally charged the message is"
+    )
+
+
+class ConsolidationResult(BaseModel):
+    """Structured output of a consolidation merge."""
+
+    content: str = Field(description='The merged memory, in "User ..." form')
+
+
+class BatchConsolidationEntry(BaseModel):
+    """One merged cluster in a batched consolidation reply."""
+
+    index: int
+    content: str = Field(description='The merged memory, in "User ..." form')
+
+
+class BatchConsolidationResult(BaseModel):
+    """Structured output of a batched consolidation merge."""
+
+    results: List[BatchConsolidationEntry]
+
+
+def _json_schema_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Strict json_schema response_format for a pydantic model."""
+    schema = model.model_json_schema()
+    # Strict mode requires every object, including nested ones, to be closed
+    for obj in [schema, *schema.get("$defs", {}).values()]:
+        obj["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": schema, "strict": True},
+    }
+
+
+# Built once; the provider enforces these shapes instead of prompt prose
+WORTHINESS_RESPONSE_FORMAT = _json_schema_format(WorthinessResult)
+CONSOLIDATION_RESPONSE_FORMAT = _json_schema_format(ConsolidationResult)
+BATCH_CONSOLIDATION_RESPONSE_FORMAT = _json_schema_format(BatchConsolidationResult)
+
+
+def _dumps_payload(payload: Any) -> str:
+    """Serialize an LLM user payload to JSON text.
+
+    orjson serializes datetimes natively and is several times faster than the
+    stdlib for the large memory batches sent to the extractor. Anything it
+    cannot encode falls back to ``str`` like ``json.dumps(default=str)``.
+    """
+    return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def _parse_json_from_text(text: str, expect_array: bool) -> Any:
     """Best-effort parse JSON from LLM text.
 
@@ -38,7 +99,7 @@ def _parse_json_from_text(text: str, expect_array: bool) -> Any:
 
     # 2) Try direct parse
     try:
-        parsed = json.loads(candidate)
+        parsed = orjson.loads(candidate)
         # Coerce to expected container shape
         if expect_array:
             if isinstance(parsed, list):
@@ -61,7 +122,7 @@ def _parse_json_from_text(text: str, expect_array: bool) -> Any:
         if start != -1 and end != -1 and end > start:
             frag = candidate[start : end + 1]
             try:
-                parsed = json.loads(frag)
+                parsed = orjson.loads(frag)
                 if expect_array:
                     return parsed if isinstance(parsed, list) else []
                 return parsed
@@ -74,7 +135,7 @@ def _parse_json_from_text(text: str, expect_array: bool) -> Any:
         if start != -1 and end != -1 and end > start:
             frag = candidate[start : end + 1]
             try:
-                parsed = json.loads(frag)
+                parsed = orjson.loads(frag)
                 if expect_array:
                     return parsed if isinstance(parsed, list) else []
                 return parsed
@@ -85,115 +146,106 @@ def _parse_json_from_text(text: str, expect_array: bool) -> Any:
     return [] if expect_array else {}
 
 
+# Providers served through the OpenAI-compatible client
+LLM_PROVIDERS = ("openai", "xai")
+
+
+def _get_llm_client(provider: str, *, traced: bool = True) -> Optional[Any]:
+    """OpenAI-compatible client for ``provider``, or None if it has no API key.
+
+    xAI uses the OpenAI-compatible API with a custom base_url. When ``traced``
+    and Langfuse is enabled, the Langfuse OpenAI wrapper is used so calls are
+    auto-instrumented. Every LLM call in this module gets its client here, so
+    they all target the same endpoint.
+    """
+    from src.config import is_langfuse_enabled
+
+    if provider == "openai":
+        api_key = (get_openai_api_key() or "").strip()
+        client_kwargs: Dict[str, Any] = {}
+    elif provider == "xai":
+        api_key = (get_xai_api_key() or "").strip()
+        client_kwargs = {"base_url": get_xai_base_url()}
+    else:
+        return None
+    if not api_key:
+        return None
+
+    if traced and is_langfuse_enabled():
+        try:
+            from langfuse.openai import OpenAI  # type: ignore
+        except ImportError:
+            from openai import OpenAI  # type: ignore
+    else:
+        from openai import OpenAI  # type: ignore
+
+    return OpenAI(api_key=api_key, **client_kwargs)
+
+
 def _call_llm_json(
-    system_prompt: str, user_payload: Dict[str, Any], *, expect_array: bool = False
+    system_prompt: str,
+    user_payload: Dict[str, Any],
+    *,
+    expect_array: bool = False,
+    response_format: Optional[Dict[str, Any]] = None,
 ) -> Optional[Any]:
-    """Call LLM and parse JSON response. Uses Langfuse OpenAI wrapper for auto-instrumentation."""
-    from src.config import is_langfuse_enabled
+    """Call LLM and parse JSON response. Uses Langfuse OpenAI wrapper for auto-instrumentation.
 
+    response_format overrides the default JSON mode, e.g. with one of the
+    strict json_schema formats above.
+    """
     logger = logging.getLogger("extraction")
     provider = get_llm_provider()
 
+    payload_json = ""
+
     try:
+        payload_json = _dumps_payload(user_payload)
         timeout_s = max(1, get_extraction_timeouts_ms() // 1000)
         retries = max(0, get_extraction_retries())
         last_exc: Optional[Exception] = None
 
-        if provider == "openai":
-            api_key = (get_openai_api_key() or "").strip()
-            if not api_key:
-                return None
-
-            # Use Langfuse OpenAI wrapper for auto-instrumentation if enabled
-            if is_langfuse_enabled():
-                try:
-                    from langfuse.openai import OpenAI  # type: ignore
-                except ImportError:
-                    from openai import OpenAI  # type: ignore
-            else:
-                from openai import OpenAI  # type: ignore
-
-            client = OpenAI(api_key=api_key)
-            for _ in range(retries + 1):
-                try:
-                    resp = client.chat.completions.create(
-                        model=EXTRACTION_MODEL,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {
-                                "role": "user",
-                                "content": json.dumps(user_payload, default=str),
-                            },
-                        ],
-                        response_format=None
-                        if expect_array
-                        else {"type": "json_object"},
-                        timeout=timeout_s,
-                    )
-                    text = resp.choices[0].message.content or (
-                        "[]" if expect_array else "{}"
-                    )
-                    logger.info(
-                        "LLM call ok | provider=openai model=%s | expect_array=%s | payload=%s | output=%s",
-                        EXTRACTION_MODEL,
-                        expect_array,
-                        json.dumps(user_payload, default=str)[:1000],
-                        text[:1000],
-                    )
-                    return _parse_json_from_text(text, expect_array)
-                except Exception as exc:  # retry
-                    last_exc = exc
-                    continue
-
-        elif provider == "xai":
-            api_key = (get_xai_api_key() or "").strip()
-            if not api_key:
-                return None
-
-            # xAI uses OpenAI-compatible API with custom base_url
-            # Langfuse wrapper supports base_url parameter
-            if is_langfuse_enabled():
-                try:
-                    from langfuse.openai import OpenAI  # type: ignore
-                except ImportError:
-                    from openai import OpenAI  # type: ignore
-            else:
-                from openai import OpenAI  # type: ignore
-
-            client = OpenAI(api_key=api_key, base_url=get_xai_base_url())
-            for _ in range(retries + 1):
-                try:
-                    resp = client.chat.completions.create(
-                        model=EXTRACTION_MODEL,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {
-                                "role": "user",
-                                "content": json.dumps(user_payload, default=str),
-                            },
-                        ],
-                        response_format=None
-                        if expect_array
-                        else {"type": "json_object"},
-                        timeout=max(timeout_s, 180),
-                    )
-                    text = resp.choices[0].message.content or (
-                        "[]" if expect_array else "{}"
-                    )
-                    logger.info(
-                        "LLM call ok | provider=xai model=%s | expect_array=%s | payload=%s | output=%s",
-                        EXTRACTION_MODEL,
-                        expect_array,
-                        json.dumps(user_payload, default=str)[:1000],
-                        text[:1000],
-                    )
-                    return _parse_json_from_text(text, expect_array)
-                except Exception as exc:  # retry
-                    last_exc = exc
-                    continue
-        else:
+        if provider not in LLM_PROVIDERS:
             logger.error("Unknown LLM provider: %s", provider)
             return None
+        client = _get_llm_client(provider)
+        if client is None:
+            return None
+        if provider == "xai":
+            timeout_s = max(timeout_s, 180)
+
+        for _ in range(retries + 1):
+            try:
+                resp = client.chat.completions.create(
+                    model=EXTRACTION_MODEL,
+                    # Keep the static system prompt first and unmodified so the
+                    # provider's automatic prefix caching can reuse it.
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {
+                            "role": "user",
+                            "content": payload_json,
+                        },
+                    ],
+                    response_format=response_format
+                    or (None if expect_array else {"type": "json_object"}),
+                    timeout=timeout_s,
+                )
+                text = resp.choices[0].message.content or (
+                    "[]" if expect_array else "{}"
+                )
+                logger.info(
+                    "LLM call ok | provider=%s model=%s | expect_array=%s | payload=%s | output=%s",
+                    provider,
+                    EXTRACTION_MODEL,
+                    expect_array,
+                    payload_json[:1000],
+                    text[:1000],
+                )
+                return _parse_json_from_text(text, expect_array)
+            except Exception as exc:  # retry
+                last_exc = exc
+                continue
 
         if last_exc:
             raise last_exc
@@ -203,7 +255,7 @@ def _call_llm_json(
             provider,
             EXTRACTION_MODEL,
             expect_array,
-            json.dumps(user_payload, default=str)[:1000],
+            payload_json[:1000],
         )
         # Trace the error for debugging
         from src.services.tracing import trace_error
@@ -220,6 +272,43 @@ def _call_llm_json(
         return None
 
 
+def warm_prompt_prefix(system_prompt: str, *, timeout_s: int = 15) -> bool:
+    """Prime the provider's prefix cache with a static system prompt.
+
+    Sends a single-token completion whose only content is ``system_prompt``, so
+    the first real extraction reuses the cached prefix instead of paying its
+    full prefill. Returns True if the call succeeded; failures are logged and
+    never raised since warm-up is best-effort.
+    """
+    logger = logging.getLogger("extraction")
+    provider = get_llm_provider()
+    try:
+        # Same client and model as _call_llm_json, so the cache being primed is
+        # the one live calls hit; warm-ups are kept out of the traces.
+        client = _get_llm_client(provider, traced=False)
+        if client is None:
+            return False
+
+        client.chat.completions.create(
+            model=EXTRACTION_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "{}"},
+            ],
+            max_tokens=1,
+            timeout=timeout_s,
+        )
+        return True
+    except Exception as exc:
+        logger.warning(
+            "Prompt warm-up failed | provider=%s model=%s | %s",
+            provider,
+            EXTRACTION_MODEL,
+            exc,
+        )
+        return False
+
+
 def _normalize_llm_content(content: str, source_text: str) -> str:
     """
     DEPRECATED: This function is deprecated as of the enhanced extraction prompt.
@@ -15,7 +15,7 @@ from src.config import (
     get_extraction_model_name,
     get_max_memories_per_request,
 )
-from src.services.graph_extraction import run_extraction_graph
+from src.services.graph_extraction import run_extraction_batch, run_extraction_graph
 from src.services.embedding_utils import generate_embedding
 
 
@@ -102,25 +102,60 @@ def _normalize_llm_content(content: str, source_text: str) -> str:
     return text
 
 
-def extract_from_transcript(request: TranscriptRequest) -> ExtractionResult:
-    memories: List[Memory] = []
-    duplicates_avoided = 0
-    updates_made = 0
-    existing_memories_checked = 0
+def _empty_result() -> ExtractionResult:
+    return ExtractionResult(
+        memories=[],
+        summary=None,
+        duplicates_avoided=0,
+        updates_made=0,
+        existing_memories_checked=0,
+    )
 
+
+def extract_from_transcript(request: TranscriptRequest) -> ExtractionResult:
     # Consider only user messages; simple window: all provided
     user_messages = [m for m in request.history if _is_user_message(m)]
     if not user_messages:
-        return ExtractionResult(
-            memories=[],
-            summary=None,
-            duplicates_avoided=0,
-            updates_made=0,
-            existing_memories_checked=0,
-        )
+        return _empty_result()
 
     # LLM pipeline via LangGraph (worthiness → extraction with context)
     graph_out = run_extraction_graph(request)
+    return _build_extraction_result(request, graph_out)
+
+
+def extract_from_transcripts(
+    requests: List[TranscriptRequest],
+) -> List[ExtractionResult]:
+    """Extract memories from several independent transcripts, in request order.
+
+    Transcripts share batched LLM calls (see run_extraction_batch) instead of
+    running the worthiness + extraction graph once each, so there is no
+    separate worthiness gate. A transcript whose batch entry is missing or
+    rejected gets an empty result.
+    """
+    results = [_empty_result() for _ in requests]
+    pending = [
+        i
+        for i, request in enumerate(requests)
+        if any(_is_user_message(m) for m in request.history)
+    ]
+    if not pending:
+        return results
+
+    states = run_extraction_batch([requests[i] for i in pending])
+    for i, graph_out in zip(pending, states):
+        # Only a request's own validated batch entry may produce memories
+        if graph_out.get("validated"):
+            results[i] = _build_extraction_result(requests[i], graph_out)
+    return results
+
+
+def _build_extraction_result(
+    request: TranscriptRequest, graph_out: Dict[str, Any]
+) -> ExtractionResult:
+    memories: List[Memory] = []
+    duplicates_avoided = 0
+    updates_made = 0
     extracted_items: List[Dict[str, Any]] = []
     existing_memories_checked = len(graph_out.get("existing_memories", []))
 
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import logging
+from typing import Any, Dict, List
 
 
 from langgraph.graph import END, StateGraph
 
-from src.services.prompts_v3 import WORTHINESS_PROMPT_V3, EXTRACTION_PROMPT_V3
+from src.services.prompts_v3 import (
+    BATCH_EXTRACTION_SYSTEM_V3,
+    WORTHINESS_PROMPT_V3,
+    select_extraction_system,
+)
 from src.schemas import TranscriptRequest
-from src.services.extract_utils import _call_llm_json
+from src.config import (
+    get_extraction_existing_max_tokens,
+    get_extraction_history_max_tokens,
+)
+from src.services.extract_utils import WORTHINESS_RESPONSE_FORMAT, _call_llm_json
 from src.services.memory_context import (
     get_relevant_existing_memories,
     format_memories_for_llm_context,
+    trim_history_to_budget,
 )
+from src.services.worthiness_fast import DEFAULT_UNWORTHY, history_is_filler
+
+logger = logging.getLogger("agentic_memories.graph_extraction")
+
+# Independent transcripts packed into one batched extraction request
+EXTRACTION_BATCH_SIZE = 8
 
 
 def build_extraction_graph() -> StateGraph:
@@ -26,7 +42,14 @@ def build_extraction_graph() -> StateGraph:
 
         # Process all messages to capture initial profile information
         payload = {"history": state["history"]}
-        resp = _call_llm_json(WORTHINESS_PROMPT_V3, payload)
+        if history_is_filler(state["history"]):
+            resp = dict(DEFAULT_UNWORTHY)
+        else:
+            resp = _call_llm_json(
+                WORTHINESS_PROMPT_V3,
+                payload,
+                response_format=WORTHINESS_RESPONSE_FORMAT,
+            )
         state["worthy"] = bool(resp and resp.get("worthy", False))
         state["worthy_raw"] = resp
 
@@ -47,18 +70,21 @@ def build_extraction_graph() -> StateGraph:
             input={"existing_memories_count": len(existing_memories)},
         )
 
-        existing_context = format_memories_for_llm_context(existing_memories)
+        existing_context = format_memories_for_llm_context(
+            existing_memories, max_tokens=get_extraction_existing_max_tokens()
+        )
 
-        # Process all messages to capture initial profile information
+        # Keep the newest turns within the history budget
         payload = {
-            "history": state["history"],
+            "history": trim_history_to_budget(
+                state["history"], get_extraction_history_max_tokens()
+            ),
             "existing_memories_context": existing_context,
         }
 
-        # Enhanced V3 extraction prompt with context (includes emotional/narrative support)
-        enhanced_prompt = f"{EXTRACTION_PROMPT_V3}\n\n{existing_context}\n\nBased on the existing memories above, extract only NEW information that adds value."
-
-        items = _call_llm_json(enhanced_prompt, payload, expect_array=True) or []
+        # Static V3 system prompt; existing memories and history ride in the payload
+        system_prompt = select_extraction_system(payload["history"])
+        items = _call_llm_json(system_prompt, payload, expect_array=True) or []
         state["items"] = items
 
         end_span(output={"items_extracted": len(items)})
@@ -86,3 +112,96 @@ def run_extraction_graph(request: TranscriptRequest) -> Dict[str, Any]:
 
     result = graph.compile().invoke(state)
     return result
+
+
+def run_extraction_batch(requests: List[TranscriptRequest]) -> List[Dict[str, Any]]:
+    """Extract memories for several independent transcripts with shared LLM calls.
+
+    Requests are sent EXTRACTION_BATCH_SIZE at a time under the batched V3
+    prompt, so the static rules are paid once per group instead of once per
+    transcript.
+
+    Unlike run_extraction_graph there is no separate worthiness pass: the
+    batched prompt's own rules decide what is memory-worthy and return an
+    empty list otherwise, so an input the worthiness check would have gated
+    can still yield items.
+
+    Results are keyed by the index the model echoes back. An entry with an
+    out-of-range index, an index that appears more than once, or a
+    non-list "memories" is discarded, so one input's output can never be
+    attributed to another.
+
+    Returns one state per request, in request order, with the same "history",
+    "existing_memories" and "items" keys as run_extraction_graph, plus
+    "validated": True only when the request's own index produced a usable entry.
+    """
+    states: List[Dict[str, Any]] = [
+        {
+            "history": [m.model_dump() for m in request.history],
+            "existing_memories": get_relevant_existing_memories(request),
+            "items": [],
+            "validated": False,
+        }
+        for request in requests
+    ]
+
+    for start in range(0, len(states), EXTRACTION_BATCH_SIZE):
+        group = states[start : start + EXTRACTION_BATCH_SIZE]
+        payload = {
+            "inputs": [
+                {
+                    "index": index,
+                    "history": trim_history_to_budget(
+                        state["history"], get_extraction_history_max_tokens()
+                    ),
+                    "existing_memories_context": format_memories_for_llm_context(
+                        state["existing_memories"],
+                        max_tokens=get_extraction_existing_max_tokens(),
+                    ),
+                }
+                for index, state in enumerate(group)
+            ]
+        }
+        try:
+            response = _call_llm_json(BATCH_EXTRACTION_SYSTEM_V3, payload)
+        except Exception as e:
+            logger.error(
+                "[extract.batch] size=%s error=%s", len(group), e, exc_info=True
+            )
+            continue
+
+        if not isinstance(response, dict):
+            logger.info("[extract.batch] size=%s no_results", len(group))
+            continue
+
+        entries: Dict[int, List[Any]] = {}
+        duplicates = set()
+        for entry in response.get("results") or []:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            memories = entry.get("memories")
+            if (
+                not isinstance(index, int)
+                or isinstance(index, bool)
+                or not 0 <= index < len(group)
+                or not isinstance(memories, list)
+            ):
+                continue
+            if index in entries:
+                duplicates.add(index)
+            entries[index] = memories
+
+        if duplicates:
+            logger.warning(
+                "[extract.batch] size=%s duplicate_indexes=%s",
+                len(group),
+                sorted(duplicates),
+            )
+        for index, memories in entries.items():
+            if index in duplicates:
+                continue
+            group[index]["items"] = [m for m in memories if isinstance(m, dict)]
+            group[index]["validated"] = True
+
+    return states
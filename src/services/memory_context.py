@@ -16,6 +16,13 @@ from src.schemas import TranscriptRequest, Message
 
 logger = logging.getLogger("agentic_memories.memory_context")
 
+# Rough characters-per-token ratio for English text. No tokenizer ships with
+# the service, so prompt budgets are approximate.
+APPROX_CHARS_PER_TOKEN = 4
+
+# Upper bound on the text embedded to find related memories.
+CONTEXT_QUERY_MAX_CHARS = 2000
+
 
 def get_relevant_existing_memories(
     request: TranscriptRequest,
@@ -25,180 +32,107 @@ def get_relevant_existing_memories(
     """
     Retrieve relevant existing memories for context during extraction.
 
+    The recent user turns are embedded once and the nearest stored memories
+    are returned, so the context stays bounded however many memories the
+    user has.
+
     Args:
         request: The transcript request containing conversation history
         max_memories: Maximum number of existing memories to retrieve
         similarity_threshold: Minimum similarity score for relevance
 
     Returns:
-        List of relevant existing memories with metadata
+        List of relevant existing memories with metadata, most relevant first
     """
-    if not request.history:
+    query = _build_context_query(request.history)
+    if not query:
         return []
 
-    # Extract key topics from the conversation for context retrieval
-    context_queries = _extract_context_queries(request.history)
-    logger.info(
-        "[ctx.relevant] user_id=%s queries=%s", request.user_id, context_queries
-    )
+    try:
+        memories, _ = search_memories(
+            user_id=request.user_id,
+            query=query,
+            filters={},
+            limit=max_memories,
+            offset=0,
+        )
+    except Exception as e:
+        logger.warning(f"[ctx.search.error] user_id={request.user_id} error={e}")
+        return []
 
-    all_memories = []
-    seen_ids = set()
-
-    # Search for memories related to each context query
-    for query in context_queries:
-        try:
-            memories, _ = search_memories(
-                user_id=request.user_id,
-                query=query,
-                filters={},
-                limit=max_memories // len(context_queries) + 1,
-                offset=0,
-            )
-            logger.info(
-                "[ctx.search] user_id=%s q='%s' got=%s",
-                request.user_id,
-                query,
-                len(memories),
-            )
-
-            # Add unique memories that meet similarity threshold
-            for memory in memories:
-                if (
-                    memory["id"] not in seen_ids
-                    and memory.get("score", 0) >= similarity_threshold
-                ):
-                    all_memories.append(memory)
-                    seen_ids.add(memory["id"])
-
-        except Exception as e:
-            logger.warning(f"[ctx.search.error] q='{query}' error={e}")
-            continue
-
-    # Sort by relevance score and return top memories
-    all_memories.sort(key=lambda x: x.get("score", 0), reverse=True)
+    relevant = [m for m in memories if m.get("score", 0) >= similarity_threshold]
+    relevant.sort(key=lambda x: x.get("score", 0), reverse=True)
     logger.info(
-        "[ctx.result] user_id=%s returned=%s",
+        "[ctx.result] user_id=%s query_len=%s got=%s returned=%s",
         request.user_id,
-        len(all_memories[:max_memories]),
+        len(query),
+        len(memories),
+        len(relevant),
     )
-    return all_memories[:max_memories]
+    return relevant
 
 
-def _extract_context_queries(history: List[Message]) -> List[str]:
+def _build_context_query(history: List[Message]) -> str:
     """
-    Extract context queries from conversation history for memory retrieval.
+    Build the similarity query for context retrieval from recent user turns.
 
     Args:
         history: List of conversation messages
 
     Returns:
-        List of context queries for memory search
+        The last three user messages joined, cut to their newest
+        CONTEXT_QUERY_MAX_CHARS characters; empty if there are none
     """
-    queries = []
-
-    # Get user messages from the conversation
-    user_messages = [m for m in history if m.role == "user" and m.content.strip()]
-
-    if not user_messages:
-        return []
-
-    # Extract key topics from recent user messages
-    for message in user_messages[-3:]:  # Last 3 user messages
-        content = message.content.strip()
-
-        # Extract potential topics/keywords
-        topics = _extract_topics_from_text(content)
-        queries.extend(topics)
-
-    # Add a general query for recent memories
-    queries.append("recent memories")
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_queries = []
-    for query in queries:
-        if query not in seen:
-            unique_queries.append(query)
-            seen.add(query)
-
-    return unique_queries
+    user_messages = [
+        m.content.strip() for m in history if m.role == "user" and m.content.strip()
+    ]
+    return "\n".join(user_messages[-3:])[-CONTEXT_QUERY_MAX_CHARS:]
 
 
-def _extract_topics_from_text(text: str) -> List[str]:
+def trim_history_to_budget(
+    history: List[Dict[str, Any]], max_tokens: int
+) -> List[Dict[str, Any]]:
     """
-    Extract potential topics/keywords from text for memory search.
+    Keep the most recent messages that fit within an approximate token budget.
 
     Args:
-        text: Input text to extract topics from
+        history: Conversation messages as role/content dicts, oldest first
+        max_tokens: Approximate token ceiling; 0 or less disables the cap
 
     Returns:
-        List of potential topic queries
+        The newest suffix of history that fits. The latest message is always
+        kept, cut to its last max_tokens worth of characters if needed.
     """
-    import re
-
-    # Convert to lowercase for processing
-    text_lower = text.lower()
-
-    topics = []
-
-    # Extract noun phrases and important words
-    # Look for patterns like "I love X", "I'm working on X", "I need to X"
-    patterns = [
-        r"i love (\w+)",
-        r"i like (\w+)",
-        r"i prefer (\w+)",
-        r"i'm working on (\w+)",
-        r"i need to (\w+)",
-        r"i want to (\w+)",
-        r"i'm planning (\w+)",
-        r"i'm learning (\w+)",
-        r"i'm studying (\w+)",
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, text_lower)
-        topics.extend(matches)
-
-    # Extract project-related terms
-    project_terms = ["project", "work", "job", "career", "business", "startup"]
-    for term in project_terms:
-        if term in text_lower:
-            topics.append(term)
-
-    # Extract personal preference terms
-    preference_terms = ["book", "movie", "music", "food", "hobby", "sport", "exercise"]
-    for term in preference_terms:
-        if term in text_lower:
-            topics.append(term)
-
-    # Extract relationship terms
-    relationship_terms = ["friend", "family", "partner", "colleague", "team"]
-    for term in relationship_terms:
-        if term in text_lower:
-            topics.append(term)
-
-    # Extract learning terms
-    learning_terms = ["learn", "study", "course", "skill", "language", "programming"]
-    for term in learning_terms:
-        if term in text_lower:
-            topics.append(term)
-
-    # If no specific topics found, use the full text as a query
-    if not topics:
-        # Take first few words as a query
-        words = text.split()[:5]
-        topics.append(" ".join(words))
-
-    return topics
-
-
-def format_memories_for_llm_context(memories: List[Dict[str, Any]]) -> str:
+    if max_tokens <= 0 or not history:
+        return history
+
+    budget = max_tokens * APPROX_CHARS_PER_TOKEN
+    used = 0
+    start = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        size = len(str(history[i].get("content", "")))
+        if used + size > budget:
+            break
+        used += size
+        start = i
+
+    if start == len(history):
+        latest = dict(history[-1])
+        latest["content"] = str(latest.get("content", ""))[-budget:]
+        return [latest]
+    return history[start:]
+
+
+def format_memories_for_llm_context(
+    memories: List[Dict[str, Any]], max_tokens: int = 0
+) -> str:
     """
     Format existing memories for inclusion in LLM context.
 
     Args:
-        memories: List of existing memories
+        memories: List of existing memories, most relevant first
+        max_tokens: Approximate token ceiling; memories past it are dropped.
+            0 or less disables the cap.
 
     Returns:
         Formatted string for LLM context
@@ -207,6 +141,8 @@ def format_memories_for_llm_context(memories: List[Dict[str, Any]]) -> str:
         return "No existing memories found."
 
     formatted = ["Existing relevant memories:"]
+    budget = max_tokens * APPROX_CHARS_PER_TOKEN if max_tokens > 0 else 0
+    used = len(formatted[0])
 
     for i, memory in enumerate(memories, 1):
         content = memory.get("content", "")
@@ -217,7 +153,11 @@ def format_memories_for_llm_context(memories: List[Dict[str, Any]]) -> str:
         # Format tags
         tags_str = ", ".join(tags) if tags else "no tags"
 
-        formatted.append(f"{i}. [{layer}/{memory_type}] {content} (tags: {tags_str})")
+        line = f"{i}. [{layer}/{memory_type}] {content} (tags: {tags_str})"
+        used += len(line) + 1
+        if budget and used > budget:
+            break
+        formatted.append(line)
 
     return "\n".join(formatted)
 
@@ -3,19 +3,180 @@ Profile Extraction Service
 Extracts profile-worthy information from memories using LLM
 """
 
-from typing import List, Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import contextvars
+import hashlib
 import json
 import logging
+import re
+import sys
 from datetime import datetime, timezone
 
+import orjson
+
+from src.config import (
+    get_profile_extraction_examples_enabled,
+    get_profile_extraction_prefilter_enabled,
+)
+from src.dependencies.redis_client import get_redis_client
 from src.models import Memory
-from src.services.extract_utils import _call_llm_json
+from src.services.extract_utils import _call_llm_json, _dumps_payload
 from src.services.profile_storage import VALID_CATEGORIES
 
 logger = logging.getLogger("agentic_memories.profile_extraction")
 
+# Large memory lists are split into batches that are extracted concurrently
+PROFILE_EXTRACTION_BATCH_SIZE = 50
+PROFILE_EXTRACTION_BATCH_CHAR_BUDGET = 12000
+PROFILE_EXTRACTION_MAX_WORKERS = 8
+
+# Users extracted at once by extract_many, sized to provider rate limits
+PROFILE_EXTRACTION_MAX_CONCURRENT_USERS = 16
+
+# Longer memory contents are truncated before being sent to the LLM
+PROFILE_EXTRACTION_MAX_MEMORY_CHARS = 2000
+
+# Upper bound on memory content packed into one multi-user extraction request
+PROFILE_EXTRACTION_MULTI_USER_CHAR_BUDGET = 8000
+
+# Exact-match cache of raw LLM extractions, keyed on prompt + payload digest
+EXTRACTION_CACHE_KEY = "profile_extraction:{digest}"
+EXTRACTION_CACHE_TTL = 86400  # 24 hours
+
+# Process-wide cache hit/miss counters for observability
+extraction_cache_stats: Counter = Counter(hits=0, misses=0)
+
+# Keywords that hint a memory carries profile information
+_PROFILE_KEYWORDS = (
+    "name",
+    "age",
+    "location",
+    "job",
+    "work",
+    "occupation",
+    "live",
+    "lives",
+    "like",
+    "love",
+    "enjoy",
+    "prefer",
+    "favorite",
+    "hate",
+    "dislike",
+    "goal",
+    "dream",
+    "plan",
+    "want",
+    "aspire",
+    "hope",
+    "wish",
+    "hobby",
+    "interest",
+    "passion",
+    "learn",
+    "study",
+    "practice",
+    "experience",
+    "skill",
+    "background",
+    "education",
+    "degree",
+    "graduated",
+)
+
+# Tags that mark a memory as profile-related
+_PROFILE_TAGS = frozenset(
+    {
+        "profile",
+        "personal",
+        "preference",
+        "goal",
+        "interest",
+        "background",
+    }
+)
+
+# Phrases that suggest the user is describing themselves
+_INTRO_PHRASES = (
+    "i am",
+    "i'm",
+    "my name is",
+    "i work as",
+    "i live in",
+    "i like",
+    "i love",
+    "i enjoy",
+    "i prefer",
+    "my goal",
+    "i want to",
+    "i plan to",
+    "my dream",
+    "my passion",
+)
+# Keywords and intro phrases folded into one case-insensitive alternation, so
+# the content check is a single scan in C with no lowercased copy of the text.
+# Patterns containing another pattern (e.g. "i like" contains "like") can never
+# change the outcome of a search, so they are dropped to keep the regex small.
+_PROFILE_HINTS = tuple(
+    p
+    for p in _PROFILE_KEYWORDS + _INTRO_PHRASES
+    if not any(q != p and q in p for q in _PROFILE_KEYWORDS + _INTRO_PHRASES)
+)
+_PROFILE_HINT_RE = re.compile(
+    "|".join(re.escape(p) for p in _PROFILE_HINTS), re.IGNORECASE
+)
+
+# Extraction schema, resolved once at import time. Values map to themselves so
+# validated rows share one canonical string object per category/source type
+# instead of each holding its own copy decoded from the LLM response.
+_CANONICAL_CATEGORIES = {c: c for c in VALID_CATEGORIES}
+_CANONICAL_SOURCE_TYPES = {s: s for s in ("explicit", "implicit", "inferred")}
+_DEFAULT_CONFIDENCE = 70
+
+
+def _dedup_value_key(value: Any) -> str:
+    """Normalize an array element for duplicate detection."""
+    if isinstance(value, str):
+        return value.casefold()
+    return str(value)
+
+
+def _extraction_cache_key(payload: Dict[str, Any]) -> str:
+    """Cache key for one extraction request: prompt digest + payload digest."""
+    digest = _PROMPT_HASH_SEED.copy()
+    digest.update(_dumps_payload(payload).encode("utf-8"))
+    return EXTRACTION_CACHE_KEY.format(digest=digest.hexdigest())
+
+
+def _coerce_confidence(value: Any) -> int:
+    """Clamp a confidence to 0-100, defaulting to 70 when it cannot be parsed."""
+    # Fast path: the LLM returns a plain int for nearly every row
+    if type(value) is not int:
+        if isinstance(value, int):
+            # bool and other int subclasses
+            value = int(value)
+        elif isinstance(value, float):
+            if value != value:
+                # NaN
+                return _DEFAULT_CONFIDENCE
+            return int(max(0.0, min(100.0, value)))
+        elif isinstance(value, str):
+            # Validate the digits up front instead of catching int()'s ValueError
+            text = value.strip()
+            unsigned = text[1:] if text[:1] in ("+", "-") else text
+            if not unsigned.isdecimal():
+                return _DEFAULT_CONFIDENCE
+            value = int(text)
+        else:
+            return _DEFAULT_CONFIDENCE
+    return 0 if value < 0 else 100 if value > 100 else value
+
+
 # Profile extraction prompt
-PROFILE_EXTRACTION_PROMPT = """You are a profile information extractor. Extract ONLY persistent, identity-defining information.
+_PROFILE_EXTRACTION_RULES = """You are a profile information extractor. Extract ONLY persistent, identity-defining information.
 
 Be HIGHLY SELECTIVE. Extract only what defines WHO the user IS, not tasks or transient details.
 
@@ -192,9 +353,9 @@ Be HIGHLY SELECTIVE. Extract only what defines WHO the user IS, not tasks or tra
   "source_type": "explicit|implicit|inferred",
   "source_memory_id": "from input"
 }
-```
+```"""
 
-## EXAMPLES:
+_PROFILE_EXTRACTION_EXAMPLES = """## EXAMPLES:
 
 Input: "I'm married with a 3-year-old daughter. My wife works at Google as an engineer."
 Output: [
@@ -239,14 +400,54 @@ Input: "My dad had a heart attack when he was 55. Mom was diagnosed with type 2
 CORRECT: [{"category": "health", "field_name": "family_medical_history_summary", "field_value": "Father: heart attack at age 55. Mother: type 2 diabetes diagnosed at age 60.", "confidence": 95, "source_type": "explicit", "source_memory_id": "mem_health_5"}]
 
 Input: "I weighed 168 today"
-CORRECT: [] (point-in-time weight is time-series biometric data, NOT profile baseline; will be handled by health_metrics in Story 3.2. Only extract weight_baseline_kg when the user frames it as their baseline — e.g., "I weigh about 168" or "my usual weight is 168".)
+CORRECT: [] (point-in-time weight is time-series biometric data, NOT profile baseline; will be handled by health_metrics in Story 3.2. Only extract weight_baseline_kg when the user frames it as their baseline — e.g., "I weigh about 168" or "my usual weight is 168".)"""
 
-Return ONLY the JSON array. Return [] if no profile-worthy information found.
+_PROFILE_EXTRACTION_CLOSING = """Return ONLY the JSON array. Return [] if no profile-worthy information found.
 When in doubt, extract LESS. Quality over quantity."""
 
+# Examples can be dropped via PROFILE_EXTRACTION_EXAMPLES=false to cut input
+# tokens on high-volume deployments; the default prompt includes them.
+PROFILE_EXTRACTION_PROMPT = (
+    _PROFILE_EXTRACTION_RULES
+    + (
+        "\n\n" + _PROFILE_EXTRACTION_EXAMPLES
+        if get_profile_extraction_examples_enabled()
+        else ""
+    )
+    + "\n\n"
+    + _PROFILE_EXTRACTION_CLOSING
+)
+
+# The prompt is encoded and hashed once at import. The seeded hash state is
+# copied per cache key, so the prompt is never re-hashed and cache entries
+# invalidate whenever the prompt text changes.
+PROFILE_EXTRACTION_PROMPT_BYTES = PROFILE_EXTRACTION_PROMPT.encode("utf-8")
+_PROMPT_HASH_SEED = hashlib.sha256(PROFILE_EXTRACTION_PROMPT_BYTES)
+PROFILE_EXTRACTION_PROMPT_SHA = _PROMPT_HASH_SEED.hexdigest()
+
+# Multi-user variant: same rules, output keyed by user_id
+PROFILE_EXTRACTION_MULTI_USER_PROMPT = (
+    PROFILE_EXTRACTION_PROMPT
+    + """
+
+## MULTI-USER INPUT:
+
+The input holds several users: {"users": [{"user_id": "...", "memories": [...]}]}.
+Apply every rule above to each user independently. Never attribute one user's
+memories to another user.
+
+Instead of a single array, return ONLY a JSON object mapping every user_id to
+that user's array of extractions (use [] when nothing is profile-worthy):
+{"user_a": [...], "user_b": []}"""
+)
+
 
 class ProfileExtractor:
-    """Extracts profile information from memories using LLM"""
+    """Extracts profile information from memories using LLM.
+
+    Stateless: all lookup tables are module-level constants, so one instance
+    can be shared across requests and threads.
+    """
 
     # Map common duplicate/variant field names to canonical names
     FIELD_NAME_ALIASES = {
@@ -282,44 +483,6 @@ class ProfileExtractor:
         "technical_skills": "skills",
     }
 
-    def __init__(self):
-        self.profile_keywords = {
-            "name",
-            "age",
-            "location",
-            "job",
-            "work",
-            "occupation",
-            "live",
-            "lives",
-            "like",
-            "love",
-            "enjoy",
-            "prefer",
-            "favorite",
-            "hate",
-            "dislike",
-            "goal",
-            "dream",
-            "plan",
-            "want",
-            "aspire",
-            "hope",
-            "wish",
-            "hobby",
-            "interest",
-            "passion",
-            "learn",
-            "study",
-            "practice",
-            "experience",
-            "skill",
-            "background",
-            "education",
-            "degree",
-            "graduated",
-        }
-
     def extract_from_memories(
         self, user_id: str, memories: List[Memory]
     ) -> List[Dict[str, Any]]:
@@ -333,75 +496,396 @@ class ProfileExtractor:
         Returns:
             List of profile update dictionaries
         """
+        profile_worthy_memories = self._select_memories(user_id, memories)
+        if not profile_worthy_memories:
+            return []
+
+        # Prepare memories for LLM
+        memory_inputs = self._build_memory_inputs(user_id, profile_worthy_memories)
+
+        try:
+            # Call LLM for extraction
+            extractions = self._extract_batches(user_id, memory_inputs)
+
+            if not extractions:
+                logger.info("[profile.extract] user_id=%s no_extractions", user_id)
+                return []
+
+            return self._finalize_extractions(user_id, extractions)
+
+        except Exception as e:
+            logger.error(
+                "[profile.extract] user_id=%s error=%s", user_id, e, exc_info=True
+            )
+            return []
+
+    def extract_from_memories_batch(
+        self, users_memories: Dict[str, List[Memory]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract profile information for several users with shared LLM calls.
+
+        Users are packed into groups of up to PROFILE_EXTRACTION_MULTI_USER_CHAR_BUDGET
+        characters of memory content, and each group is sent as one request,
+        so the large static prompt is paid once per group instead of once per
+        user. A user whose memories exceed the budget on their own falls back
+        to extract_from_memories.
+
+        Args:
+            users_memories: Memories to analyze, keyed by user identifier
+
+        Returns:
+            Profile update dictionaries keyed by user identifier
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        groups: List[List[Tuple[str, List[Dict[str, Any]]]]] = []
+        current: List[Tuple[str, List[Dict[str, Any]]]] = []
+        current_chars = 0
+
+        for user_id, memories in users_memories.items():
+            results[user_id] = []
+            selected = self._select_memories(user_id, memories)
+            if not selected:
+                continue
+
+            chars = sum(
+                min(len(m.content), PROFILE_EXTRACTION_MAX_MEMORY_CHARS)
+                for m in selected
+            )
+            if chars > PROFILE_EXTRACTION_MULTI_USER_CHAR_BUDGET:
+                results[user_id] = self.extract_from_memories(user_id, selected)
+                continue
+
+            if (
+                current
+                and current_chars + chars > PROFILE_EXTRACTION_MULTI_USER_CHAR_BUDGET
+            ):
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append((user_id, self._build_memory_inputs(user_id, selected)))
+            current_chars += chars
+
+        if current:
+            groups.append(current)
+
+        for group in groups:
+            user_ids = [user_id for user_id, _ in group]
+            payload = {
+                "users": [
+                    {"user_id": user_id, "memories": memory_inputs}
+                    for user_id, memory_inputs in group
+                ]
+            }
+            try:
+                response = _call_llm_json(PROFILE_EXTRACTION_MULTI_USER_PROMPT, payload)
+            except Exception as e:
+                logger.error(
+                    "[profile.extract.batch] user_ids=%s error=%s",
+                    user_ids,
+                    e,
+                    exc_info=True,
+                )
+                continue
+
+            if not isinstance(response, dict):
+                logger.info(
+                    "[profile.extract.batch] user_ids=%s no_extractions", user_ids
+                )
+                continue
+
+            for user_id in user_ids:
+                extractions = response.get(user_id)
+                if not isinstance(extractions, list) or not extractions:
+                    logger.info("[profile.extract] user_id=%s no_extractions", user_id)
+                    continue
+                # One malformed array must not cost the rest of the group
+                try:
+                    results[user_id] = self._finalize_extractions(user_id, extractions)
+                except Exception as e:
+                    logger.error(
+                        "[profile.extract] user_id=%s error=%s",
+                        user_id,
+                        e,
+                        exc_info=True,
+                    )
+
+        return results
+
+    async def extract_many(
+        self,
+        users_memories: Dict[str, List[Memory]],
+        max_concurrency: int = PROFILE_EXTRACTION_MAX_CONCURRENT_USERS,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract profile information for several users concurrently.
+
+        Each user runs extract_from_memories on a worker thread (the LLM client
+        is synchronous), with at most max_concurrency users in flight so the
+        provider's rate limits are respected.
+
+        Args:
+            users_memories: Memories to analyze, keyed by user identifier
+            max_concurrency: Maximum number of users extracted at once
+
+        Returns:
+            Profile update dictionaries keyed by user identifier
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(user_id: str, memories: List[Memory]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.extract_from_memories, user_id, memories
+                )
+
+        results = await asyncio.gather(
+            *(_one(user_id, memories) for user_id, memories in users_memories.items())
+        )
+        return dict(zip(users_memories, results))
+
+    def _select_memories(self, user_id: str, memories: List[Memory]) -> List[Memory]:
+        """
+        Pick the memories to send to the LLM for one user.
+
+        Args:
+            user_id: User identifier
+            memories: List of Memory objects to analyze
+
+        Returns:
+            Memories to analyze, possibly empty
+        """
         # Analyze ALL memories - let the LLM decide what's profile-worthy
-        # The PROFILE_EXTRACTION_PROMPT has detailed rules about what to extract
-        profile_worthy_memories = memories
+        # The PROFILE_EXTRACTION_PROMPT has detailed rules about what to extract.
+        # Only blank memories and memories flagged at write time with
+        # metadata["profile_eligible"] = False are dropped, so an empty payload
+        # never reaches the LLM.
+        profile_worthy_memories = [
+            m
+            for m in memories
+            if m.content
+            and not m.content.isspace()
+            and m.metadata.get("profile_eligible", True)
+        ]
+
+        if profile_worthy_memories and get_profile_extraction_prefilter_enabled():
+            filtered = [
+                m
+                for m in profile_worthy_memories
+                if self._is_profile_worthy(m.content, m.metadata.get("tags") or [])
+            ]
+            # Only worth the false-negative risk when it removes most of the batch
+            if len(filtered) < len(profile_worthy_memories) * 0.5:
+                logger.info(
+                    "[profile.extract] user_id=%s prefilter_dropped=%s",
+                    user_id,
+                    len(profile_worthy_memories) - len(filtered),
+                )
+                profile_worthy_memories = filtered
 
         if not profile_worthy_memories:
             logger.info("[profile.extract] user_id=%s no_memories", user_id)
             return []
 
+        # Send one representative per distinct content: repeated utterances of
+        # the same fact cost input tokens without adding information, and the
+        # per-field dedup would collapse their extractions anyway. The ingestion
+        # graph's dedup node already stored a normalized content_hash, so reuse
+        # it instead of building another normalized copy of each content.
+        unique_memories: Dict[str, Memory] = {}
+        for m in profile_worthy_memories:
+            key = m.metadata.get("content_hash") or m.content.strip().casefold()
+            unique_memories.setdefault(key, m)
+        if len(unique_memories) < len(profile_worthy_memories):
+            logger.info(
+                "[profile.extract] user_id=%s duplicate_contents_skipped=%s",
+                user_id,
+                len(profile_worthy_memories) - len(unique_memories),
+            )
+            profile_worthy_memories = list(unique_memories.values())
+
         logger.info(
-            "[profile.extract] user_id=%s analyzing=%s memories (all memories, no filtering)",
+            "[profile.extract] user_id=%s analyzing=%s of %s memories",
             user_id,
             len(profile_worthy_memories),
+            len(memories),
         )
+        return profile_worthy_memories
 
-        # Prepare memories for LLM
-        memory_inputs = []
-        for m in profile_worthy_memories:
-            memory_inputs.append(
-                {
-                    "id": m.id or "unknown",
-                    "content": m.content,
-                    "tags": m.metadata.get("tags", []),
-                    "timestamp": m.timestamp.isoformat() if m.timestamp else None,
-                }
-            )
+    def _build_memory_inputs(
+        self, user_id: str, memories: List[Memory]
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert memories into the serializable dicts sent in the LLM payload.
 
-        # Call LLM for extraction
-        payload = {"user_id": user_id, "memories": memory_inputs}
+        Content longer than PROFILE_EXTRACTION_MAX_MEMORY_CHARS is truncated so
+        a single oversized memory cannot dominate the prompt.
 
-        try:
-            extractions = _call_llm_json(
-                PROFILE_EXTRACTION_PROMPT, payload, expect_array=True
+        Args:
+            user_id: User identifier
+            memories: Memories selected for extraction
+
+        Returns:
+            One payload dict per memory
+        """
+        memory_inputs = [
+            {
+                "id": m.id or "unknown",
+                "content": m.content
+                if len(m.content) <= PROFILE_EXTRACTION_MAX_MEMORY_CHARS
+                else m.content[:PROFILE_EXTRACTION_MAX_MEMORY_CHARS] + "…[truncated]",
+                "tags": m.metadata.get("tags", []),
+                # Serialized natively (ISO 8601) by the orjson payload encoder
+                "timestamp": m.timestamp,
+            }
+            for m in memories
+        ]
+
+        truncated = sum(
+            1 for m in memories if len(m.content) > PROFILE_EXTRACTION_MAX_MEMORY_CHARS
+        )
+        if truncated:
+            logger.info(
+                "[profile.extract] user_id=%s truncated=%s memories over %s chars",
+                user_id,
+                truncated,
+                PROFILE_EXTRACTION_MAX_MEMORY_CHARS,
             )
+        return memory_inputs
 
-            if not extractions:
-                logger.info("[profile.extract] user_id=%s no_extractions", user_id)
-                return []
+    def _finalize_extractions(
+        self, user_id: str, extractions: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Deduplicate, validate and log raw extractions for one user.
 
-            # Deduplicate by (category, field_name) before validation
-            deduplicated = self._deduplicate_extractions(extractions)
+        Args:
+            user_id: User identifier
+            extractions: Raw extraction results from LLM
 
-            # Validate and enrich extractions
-            validated = self._validate_extractions(deduplicated, user_id)
+        Returns:
+            Validated and enriched extractions
+        """
+        # Deduplicate by (category, field_name) before validation
+        deduplicated = self._deduplicate_extractions(extractions)
 
-            logger.info(
-                "[profile.extract] user_id=%s extracted=%s fields",
-                user_id,
-                len(validated),
+        # Validate and enrich extractions
+        validated = self._validate_extractions(deduplicated, user_id)
+
+        logger.info(
+            "[profile.extract] user_id=%s extracted=%s fields",
+            user_id,
+            len(validated),
+        )
+
+        # Log detailed profile information extracted (per-field, so DEBUG only)
+        if validated and logger.isEnabledFor(logging.DEBUG):
+            for extraction in validated:
+                logger.debug(
+                    "[profile.extract.detail] user_id=%s category=%s field=%s value=%s confidence=%s",
+                    user_id,
+                    extraction.get("category"),
+                    extraction.get("field_name"),
+                    extraction.get("field_value"),
+                    extraction.get("confidence"),
+                )
+
+        return validated
+
+    def _extract_batches(
+        self, user_id: str, memory_inputs: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Run the LLM extraction, splitting large inputs into concurrent batches.
+
+        Batches of at most PROFILE_EXTRACTION_BATCH_SIZE memories and
+        PROFILE_EXTRACTION_BATCH_CHAR_BUDGET characters of content keep each
+        prompt inside the model's efficient prefill window. Cross-batch
+        duplicates are merged afterwards by _deduplicate_extractions.
+
+        Args:
+            user_id: User identifier
+            memory_inputs: Serializable memory dicts for the LLM payload
+
+        Returns:
+            Raw extractions from all batches, in batch order
+        """
+        # Greedy packing: close a batch when it is full or its content budget
+        # would be exceeded, keeping every request inside the context window
+        batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_chars = 0
+        for memory_input in memory_inputs:
+            chars = len(memory_input["content"])
+            if current and (
+                len(current) >= PROFILE_EXTRACTION_BATCH_SIZE
+                or current_chars + chars > PROFILE_EXTRACTION_BATCH_CHAR_BUDGET
+            ):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(memory_input)
+            current_chars += chars
+        batches.append(current)
+
+        def _run(batch: List[Dict[str, Any]]) -> Any:
+            payload = {"user_id": user_id, "memories": batch}
+            cache_key = _extraction_cache_key(payload)
+            cached = self._get_cached_extractions(cache_key)
+            if cached is not None:
+                extraction_cache_stats["hits"] += 1
+                logger.debug("[profile.cache] extraction hit user_id=%s", user_id)
+                return cached
+
+            extraction_cache_stats["misses"] += 1
+            extractions = _call_llm_json(
+                PROFILE_EXTRACTION_PROMPT, payload, expect_array=True
             )
+            # Empty results are not cached: they may come from an unparseable reply
+            if isinstance(extractions, list) and extractions:
+                self._cache_extractions(cache_key, extractions)
+            return extractions
 
-            # Log detailed profile information extracted
-            if validated:
-                for extraction in validated:
-                    logger.info(
-                        "[profile.extract.detail] user_id=%s category=%s field=%s value=%s confidence=%s",
-                        user_id,
-                        extraction.get("category"),
-                        extraction.get("field_name"),
-                        extraction.get("field_value"),
-                        extraction.get("confidence"),
-                    )
+        if len(batches) == 1:
+            return _run(batches[0]) or []
 
-            return validated
+        logger.info(
+            "[profile.extract] user_id=%s batches=%s memories=%s",
+            user_id,
+            len(batches),
+            len(memory_inputs),
+        )
+        max_workers = min(PROFILE_EXTRACTION_MAX_WORKERS, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # Copy the context per batch so tracing contextvars reach the workers
+            futures = [
+                pool.submit(contextvars.copy_context().run, _run, batch)
+                for batch in batches
+            ]
+            results = [future.result() for future in futures]
 
+        return [extraction for result in results if result for extraction in result]
+
+    def _get_cached_extractions(self, cache_key: str) -> Optional[List[Any]]:
+        """Get raw extractions for an identical earlier request from Redis"""
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                cached = redis_client.get(cache_key)
+                if cached:
+                    return orjson.loads(cached)
         except Exception as e:
-            logger.error(
-                "[profile.extract] user_id=%s error=%s", user_id, e, exc_info=True
-            )
-            return []
+            logger.warning("[profile.cache] failed to get extraction cache: %s", e)
+        return None
+
+    def _cache_extractions(self, cache_key: str, extractions: List[Any]):
+        """Cache raw extractions in Redis"""
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.setex(
+                    cache_key, EXTRACTION_CACHE_TTL, _dumps_payload(extractions)
+                )
+        except Exception as e:
+            logger.warning("[profile.cache] failed to cache extractions: %s", e)
 
     def _is_profile_worthy(self, content: str, tags: List[str]) -> bool:
         """
@@ -414,47 +898,12 @@ class ProfileExtractor:
         Returns:
             True if content might contain profile information
         """
-        content_lower = content.lower()
-
         # Check for profile-related tags
-        profile_tags = {
-            "profile",
-            "personal",
-            "preference",
-            "goal",
-            "interest",
-            "background",
-        }
-        has_profile_tag = any(tag in profile_tags for tag in tags)
-
-        if has_profile_tag:
+        if not _PROFILE_TAGS.isdisjoint(tags):
             return True
 
-        # Check for profile keywords in content
-        has_keyword = any(kw in content_lower for kw in self.profile_keywords)
-
-        # Additional patterns that suggest profile info
-        has_introduction = any(
-            phrase in content_lower
-            for phrase in [
-                "i am",
-                "i'm",
-                "my name is",
-                "i work as",
-                "i live in",
-                "i like",
-                "i love",
-                "i enjoy",
-                "i prefer",
-                "my goal",
-                "i want to",
-                "i plan to",
-                "my dream",
-                "my passion",
-            ]
-        )
-
-        return has_keyword or has_introduction
+        # Check for profile keywords and introduction patterns in content
+        return _PROFILE_HINT_RE.search(content) is not None
 
     def _deduplicate_extractions(
         self, extractions: List[Dict[str, Any]]
@@ -464,87 +913,88 @@ class ProfileExtractor:
 
         When LLM extracts the same field multiple times, keep the one with:
         1. Highest confidence score
-        2. Most recent extraction (if confidence is equal)
+        2. Earliest extraction (if confidence is equal)
         3. For list/array fields, merge the values
 
+        Runs as a single pass that only remembers the first item per key;
+        a duplicate group is allocated lazily on the second sighting, so the
+        common all-unique case does no merge bookkeeping at all.
+
         Args:
             extractions: Raw extraction results from LLM
 
         Returns:
             Deduplicated extractions
         """
-        from collections import defaultdict
+        first: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        dups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
 
-        # Group by (category, field_name)
-        grouped = defaultdict(list)
         for extraction in extractions:
             if not isinstance(extraction, dict):
                 continue
             category = extraction.get("category")
             field_name = extraction.get("field_name")
-            if category and field_name:
-                key = (category, field_name)
-                grouped[key].append(extraction)
+            if not (category and field_name):
+                continue
+
+            key = (category, field_name)
+            if key not in first:
+                first[key] = extraction
+            elif key in dups:
+                dups[key].append(extraction)
+            else:
+                dups[key] = [first[key], extraction]
 
         deduplicated = []
-        for key, items in grouped.items():
-            if len(items) == 1:
+        for key, item in first.items():
+            items = dups.get(key)
+            if items is None:
                 # No duplicates for this field
-                deduplicated.append(items[0])
-            else:
-                # Multiple extractions for same field - merge intelligently
-                category, field_name = key
+                deduplicated.append(item)
+                continue
 
-                # Check if field_value is a list/array in any of the items
-                is_array_field = any(
-                    isinstance(item.get("field_value"), list) for item in items
-                )
+            deduplicated.append(self._merge_duplicates(items))
+            logger.debug(
+                "[profile.deduplicate] field=%s/%s had %s duplicates, merged",
+                key[0],
+                key[1],
+                len(items),
+            )
 
-                if is_array_field:
-                    # Merge array values
-                    merged_values = []
-                    seen_values = set()
-                    for item in items:
-                        values = item.get("field_value", [])
-                        if isinstance(values, list):
-                            for v in values:
-                                # Normalize for deduplication
-                                v_key = str(v).lower() if isinstance(v, str) else str(v)
-                                if v_key not in seen_values:
-                                    merged_values.append(v)
-                                    seen_values.add(v_key)
-                        else:
-                            # Single value, convert to list
-                            v_key = (
-                                str(values).lower()
-                                if isinstance(values, str)
-                                else str(values)
-                            )
-                            if v_key not in seen_values:
-                                merged_values.append(values)
-                                seen_values.add(v_key)
-
-                    # Use the first item as base, update with merged values
-                    merged = items[0].copy()
-                    merged["field_value"] = merged_values
-                    # Take highest confidence
-                    merged["confidence"] = max(
-                        item.get("confidence", 70) for item in items
-                    )
-                    deduplicated.append(merged)
-                else:
-                    # Non-array field: keep the one with highest confidence
-                    best = max(items, key=lambda x: x.get("confidence", 70))
-                    deduplicated.append(best)
+        return deduplicated
 
-                logger.debug(
-                    "[profile.deduplicate] field=%s/%s had %s duplicates, merged",
-                    category,
-                    field_name,
-                    len(items),
-                )
+    def _merge_duplicates(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge several extractions of the same (category, field_name).
 
-        return deduplicated
+        Args:
+            items: Two or more extractions for one field, in LLM order
+
+        Returns:
+            The merged extraction
+        """
+        # Check if field_value is a list/array in any of the items
+        is_array_field = any(
+            isinstance(item.get("field_value"), list) for item in items
+        )
+
+        if not is_array_field:
+            # Non-array field: keep the one with highest confidence
+            return max(items, key=lambda x: x.get("confidence", 70))
+
+        # Merge array values: normalized key -> first-seen original value
+        merged_values: Dict[str, Any] = {}
+        for item in items:
+            values = item.get("field_value", [])
+            for v in values if isinstance(values, list) else (values,):
+                merged_values.setdefault(_dedup_value_key(v), v)
+
+        # Use the first item as base, update with merged values
+        merged = items[0].copy()
+        merged["field_value"] = list(merged_values.values())
+        # Take highest confidence
+        merged["confidence"] = max(item.get("confidence", 70) for item in items)
+        return merged
 
     def _validate_extractions(
         self, extractions: List[Dict[str, Any]], user_id: str
@@ -559,83 +1009,96 @@ class ProfileExtractor:
         Returns:
             Validated and enriched extractions
         """
-        validated = []
-
-        valid_categories = set(VALID_CATEGORIES)
-        valid_source_types = {"explicit", "implicit", "inferred"}
-
-        for extraction in extractions:
-            # Validate required fields
-            if not isinstance(extraction, dict):
-                logger.warning("[profile.validate] skipping non-dict extraction")
-                continue
-
-            category = extraction.get("category")
-            field_name = extraction.get("field_name")
-            field_value = extraction.get("field_value")
-
-            # Defensive: LLMs occasionally return string field_values that are
-            # already JSON-encoded (e.g. '"Employee at Intuit"' instead of
-            # 'Employee at Intuit'). Without this, the spurious quotes are
-            # stored verbatim and leak to consumers. Only unwrap when the
-            # decoded result is itself a string — leave numbers/lists/dicts
-            # alone (the LLM types those correctly per the prompt schema).
-            if isinstance(field_value, str):
-                stripped = field_value.strip()
-                if len(stripped) >= 2 and stripped[0] == '"' and stripped[-1] == '"':
-                    try:
-                        decoded = json.loads(stripped)
-                        if isinstance(decoded, str):
-                            field_value = decoded
-                    except (json.JSONDecodeError, ValueError):
-                        pass
-
-            if not all([category, field_name, field_value is not None]):
-                logger.warning(
-                    "[profile.validate] skipping incomplete extraction: %s", extraction
-                )
-                continue
-
-            # Validate category
-            if category not in valid_categories:
-                logger.warning(
-                    "[profile.validate] invalid category=%s, skipping", category
-                )
-                continue
+        # All rows in one batch share the extraction instant of the LLM response
+        now = datetime.now(timezone.utc)
+
+        return [
+            validated
+            for extraction in extractions
+            if (validated := self._validate_extraction(extraction, now)) is not None
+        ]
+
+    def _validate_extraction(
+        self, extraction: Any, extracted_at: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Validate and enrich a single extraction against the fixed schema.
 
-            # Normalize field_name: map aliases to canonical names
-            if field_name in self.FIELD_NAME_ALIASES:
-                canonical_name = self.FIELD_NAME_ALIASES[field_name]
-                logger.info(
-                    "[profile.validate] mapped alias %s -> %s",
-                    field_name,
-                    canonical_name,
-                )
-                field_name = canonical_name
+        Args:
+            extraction: One raw extraction from the LLM
+            extracted_at: Timestamp shared by the whole batch
 
-            # Validate confidence (default to 70 if missing)
-            confidence = extraction.get("confidence", 70)
-            try:
-                confidence = max(0, min(100, int(confidence)))
-            except (ValueError, TypeError):
-                confidence = 70
-
-            # Validate source_type (default to "implicit" if missing)
-            source_type = extraction.get("source_type", "implicit")
-            if source_type not in valid_source_types:
-                source_type = "implicit"
-
-            # Build validated extraction
-            validated_extraction = {
-                "category": category,
-                "field_name": field_name,
-                "field_value": field_value,
-                "confidence": confidence,
-                "source_type": source_type,
-                "source_memory_id": extraction.get("source_memory_id", "unknown"),
-                "extracted_at": datetime.now(timezone.utc),
-            }
+        Returns:
+            The validated extraction, or None if it should be skipped
+        """
+        # Validate required fields
+        if not isinstance(extraction, dict):
+            logger.warning("[profile.validate] skipping non-dict extraction")
+            return None
+
+        category = extraction.get("category")
+        field_name = extraction.get("field_name")
+        field_value = extraction.get("field_value")
+
+        # Defensive: LLMs occasionally return string field_values that are
+        # already JSON-encoded (e.g. '"Employee at Intuit"' instead of
+        # 'Employee at Intuit'). Without this, the spurious quotes are
+        # stored verbatim and leak to consumers. Only unwrap when the
+        # decoded result is itself a string — leave numbers/lists/dicts
+        # alone (the LLM types those correctly per the prompt schema).
+        # The '"' membership test skips the strip() copy for ordinary strings.
+        if isinstance(field_value, str) and '"' in field_value:
+            stripped = field_value.strip()
+            if len(stripped) >= 2 and stripped[0] == '"' and stripped[-1] == '"':
+                try:
+                    decoded = json.loads(stripped)
+                    if isinstance(decoded, str):
+                        field_value = decoded
+                except (json.JSONDecodeError, ValueError):
+                    pass
+
+        if not category or not field_name or field_value is None:
+            logger.warning(
+                "[profile.validate] skipping incomplete extraction: %s", extraction
+            )
+            return None
+
+        # Validate category
+        canonical_category = _CANONICAL_CATEGORIES.get(category)
+        if canonical_category is None:
+            logger.warning("[profile.validate] invalid category=%s, skipping", category)
+            return None
+
+        # Normalize field_name: map aliases to canonical names
+        canonical_name = self.FIELD_NAME_ALIASES.get(field_name, field_name)
+        if canonical_name is not field_name:
+            logger.debug(
+                "[profile.validate] mapped alias %s -> %s",
+                field_name,
+                canonical_name,
+            )
+            field_name = canonical_name
+        elif isinstance(field_name, str):
+            # Share one string per field name across rows, like category above
+            field_name = sys.intern(field_name)
+
+        # Validate confidence (default to 70 if missing)
+        confidence = _coerce_confidence(
+            extraction.get("confidence", _DEFAULT_CONFIDENCE)
+        )
 
-            validated.append(validated_extraction)
+        # Validate source_type (default to "implicit" if missing)
+        source_type = _CANONICAL_SOURCE_TYPES.get(
+            extraction.get("source_type"), "implicit"
+        )
 
-        return validated
+        # Build validated extraction
+        return {
+            "category": canonical_category,
+            "field_name": field_name,
+            "field_value": field_value,
+            "confidence": confidence,
+            "source_type": source_type,
+            "source_memory_id": extraction.get("source_memory_id", "unknown"),
+            "extracted_at": extracted_at,
+        }
@@ -3,11 +3,17 @@ Profile Storage Service
 Stores and retrieves user profile information from PostgreSQL
 """
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict
 import logging
-import json
+import threading
+import time
 from datetime import datetime, timezone
 
+import orjson
+from psycopg import Connection
+from psycopg.rows import tuple_row
+
 from src.dependencies.timescale import get_timescale_conn, release_timescale_conn
 from src.dependencies.redis_client import get_redis_client
 
@@ -69,6 +75,22 @@ EXPECTED_PROFILE_FIELDS: Dict[str, List[str]] = {
 # Total expected fields count — derived from EXPECTED_PROFILE_FIELDS, never hand-edited
 TOTAL_EXPECTED_FIELDS = sum(len(fields) for fields in EXPECTED_PROFILE_FIELDS.values())
 
+# (category, field_name) pairs that count towards completeness
+EXPECTED_FIELD_KEYS = frozenset(
+    (category, field_name)
+    for category, fields in EXPECTED_PROFILE_FIELDS.items()
+    for field_name in fields
+)
+
+# Per-category baseline as frozensets, and the sorted missing list for a
+# category with nothing populated; built once instead of per request
+EXPECTED_PROFILE_FIELDS_SETS: Dict[str, frozenset] = {
+    category: frozenset(fields) for category, fields in EXPECTED_PROFILE_FIELDS.items()
+}
+EXPECTED_MISSING_TEMPLATE: Dict[str, List[str]] = {
+    category: sorted(fields) for category, fields in EXPECTED_PROFILE_FIELDS.items()
+}
+
 # Valid category names - single source of truth
 VALID_CATEGORIES = list(EXPECTED_PROFILE_FIELDS.keys())
 
@@ -76,9 +98,33 @@ VALID_CATEGORIES = list(EXPECTED_PROFILE_FIELDS.keys())
 COMPLETENESS_CACHE_KEY = "profile_completeness:{user_id}"
 COMPLETENESS_CACHE_TTL = 3600  # 1 hour
 
+# Redis cache key pattern and TTL for full profile reads. Every profile write
+# invalidates it, so the TTL only bounds staleness from out-of-band edits.
+PROFILE_CACHE_KEY = "profile_data:{user_id}"
+PROFILE_CACHE_TTL = 60
+
+# Extraction writes do not drop the caches; they cap the remaining TTL at
+# this many seconds, so a burst of writes costs one recompute per window
+CACHE_STALE_TTL = 5
+
+# Per-worker completeness cache in front of Redis. Its TTL matches the write
+# side's staleness bound; other workers only see a write once this lapses.
+LOCAL_COMPLETENESS_TTL = CACHE_STALE_TTL
+LOCAL_COMPLETENESS_MAXSIZE = 10_000
+
+# Module-level so every ProfileStorageService in the worker (the profile
+# router's and the ingestion graph's) reads and evicts the same entries.
+# user_id -> (monotonic expiry, completeness dict), oldest first
+_local_completeness: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_local_completeness_lock = threading.Lock()
+
 
 class ProfileStorageService:
-    """Handles storage and retrieval of user profile data"""
+    """Handles storage and retrieval of user profile data
+
+    Cursors are opened with tuple rows (the pool default is dict_row), so
+    result rows are unpacked positionally with no per-row shape check.
+    """
 
     def store_profile_extractions(
         self, user_id: str, extractions: List[Dict[str, Any]]
@@ -91,6 +137,8 @@ class ProfileStorageService:
         2. Records sources in profile_sources
         3. Updates user_profiles metadata
 
+        Thin wrapper over store_profile_extractions_bulk for a single user.
+
         Args:
             user_id: User identifier
             extractions: List of profile extraction dictionaries
@@ -102,86 +150,194 @@ class ProfileStorageService:
             logger.info("[profile.store] user_id=%s no_extractions", user_id)
             return 0
 
-        conn = None
-        cursor = None
-        fields_updated = 0
+        return self.store_profile_extractions_bulk([(user_id, extractions)]).get(
+            user_id, 0
+        )
 
-        try:
-            conn = get_timescale_conn()
-            cursor = conn.cursor()
+    def store_profile_extractions_bulk(
+        self, items: List[Tuple[str, List[Dict[str, Any]]]]
+    ) -> Dict[str, int]:
+        """
+        Store profile extractions for several users in one transaction.
 
-            # Ensure user profile exists
-            cursor.execute(
-                """
-                INSERT INTO user_profiles (user_id, completeness_pct, total_fields, populated_fields)
-                VALUES (%s, 0.00, 0, 0)
-                ON CONFLICT (user_id) DO NOTHING
-            """,
-                (user_id,),
-            )
+        All users' rows are written with one connection checkout: the
+        ensure-profile insert and a single CTE statement (field upserts,
+        source rows and per-user metadata update), pipelined in one flush.
 
-            # Process each extraction
+        Args:
+            items: (user_id, extractions) pairs; a user may appear more than once
+
+        Returns:
+            Number of fields updated per user_id
+        """
+        # Build the column arrays before checking out a connection; they are
+        # unnested server-side so the whole write is one statement. Repeated
+        # (user_id, category, field_name) keys collapse to the last value (ON
+        # CONFLICT cannot touch a row twice in one statement), but every
+        # extraction still gets its own source row.
+        latest_values: Dict[Tuple[str, Any, Any], Any] = {}
+        source_user_ids = []
+        source_categories = []
+        source_field_names = []
+        source_memory_ids = []
+        source_types = []
+        for user_id, extractions in items:
             for extraction in extractions:
                 category = extraction.get("category")
                 field_name = extraction.get("field_name")
-                field_value = extraction.get("field_value")
-                _confidence = extraction.get("confidence", 70)
-                source_type = extraction.get("source_type", "implicit")
-                source_memory_id = extraction.get("source_memory_id", "unknown")
-
-                # Determine value_type
-                value_type = self._infer_value_type(field_value)
+                latest_values[(user_id, category, field_name)] = extraction.get(
+                    "field_value"
+                )
+                source_user_ids.append(user_id)
+                source_categories.append(category)
+                source_field_names.append(field_name)
+                source_memory_ids.append(extraction.get("source_memory_id", "unknown"))
+                source_types.append(extraction.get("source_type", "implicit"))
+
+        if not latest_values:
+            logger.info("[profile.store] users=%s no_extractions", len(items))
+            return {}
+
+        user_ids = [user_id for user_id, _, _ in latest_values]
+        categories = [category for _, category, _ in latest_values]
+        field_names = [field_name for _, _, field_name in latest_values]
+        field_values = [
+            self._serialize_field_value(value) for value in latest_values.values()
+        ]
+        counted = [
+            (category, field_name) in EXPECTED_FIELD_KEYS
+            for _, category, field_name in latest_values
+        ]
+
+        fields_updated: Dict[str, int] = {}
+        for user_id in user_ids:
+            fields_updated[user_id] = fields_updated.get(user_id, 0) + 1
+        goals_users = {
+            user_id for user_id, category, _ in latest_values if category == "goals"
+        }
 
-                # Convert field_value to string for storage
-                field_value_str = self._serialize_field_value(field_value)
+        conn = None
+        cursor = None
 
-                # Upsert profile_field
+        try:
+            conn = get_timescale_conn()
+            cursor = conn.cursor(row_factory=tuple_row)
+
+            # Pipeline mode sends all statements in one flush; errors
+            # surface when the block exits. The writes are prepared on first use
+            # per pooled connection (prepare=True) instead of after psycopg's
+            # default threshold of five executions, so the server skips
+            # parse/plan on every later call.
+            with conn.pipeline():
+                # Extractions are re-derivable from their source memories, so
+                # this transaction does not wait for the WAL flush; a crash
+                # can lose the last few commits but never leaves them torn
+                cursor.execute("SET LOCAL synchronous_commit = off")
+
+                # Ensure user profiles exist. Kept as its own statement: the
+                # metadata UPDATE below could not see a row inserted by a CTE
+                # of the same statement.
                 cursor.execute(
                     """
-                    INSERT INTO profile_fields (user_id, category, field_name, field_value, value_type, last_updated)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (user_id, category, field_name)
-                    DO UPDATE SET
-                        field_value = EXCLUDED.field_value,
-                        value_type = EXCLUDED.value_type,
-                        last_updated = EXCLUDED.last_updated
+                    INSERT INTO user_profiles (user_id, completeness_pct, total_fields, populated_fields)
+                    SELECT user_id, 0.00, 0, 0
+                    FROM unnest(%s::text[]) AS u(user_id)
+                    ON CONFLICT (user_id) DO NOTHING
                 """,
-                    (
-                        user_id,
-                        category,
-                        field_name,
-                        field_value_str,
-                        value_type,
-                        datetime.now(timezone.utc),
-                    ),
+                    (list(fields_updated),),
+                    prepare=True,
                 )
 
-                # Record source (insert new source record each time)
+                # Upsert fields, record every source, and bump each user's
+                # profile by the number of newly inserted baseline fields. The
+                # router's full recompute and scripts/recompute_completeness.py
+                # correct any drift.
                 cursor.execute(
                     """
-                    INSERT INTO profile_sources (user_id, category, field_name, source_memory_id, source_type, extracted_at)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        user_id,
-                        category,
-                        field_name,
-                        source_memory_id,
-                        source_type,
-                        datetime.now(timezone.utc),
+                    WITH field_vals AS (
+                        SELECT *
+                        FROM unnest(
+                            %(user_ids)s::text[],
+                            %(categories)s::text[],
+                            %(field_names)s::text[],
+                            %(field_values)s::text[],
+                            %(counted)s::boolean[]
+                        ) AS f(user_id, category, field_name, field_value, counted)
+                    ),
+                    upserted AS (
+                        INSERT INTO profile_fields (user_id, category, field_name, field_value, last_updated)
+                        SELECT user_id, category, field_name, field_value::jsonb, now()
+                        FROM field_vals
+                        ON CONFLICT (user_id, category, field_name)
+                        DO UPDATE SET
+                            field_value = EXCLUDED.field_value,
+                            last_updated = EXCLUDED.last_updated
+                        RETURNING user_id, category, field_name, (xmax = 0) AS inserted
+                    ),
+                    sources AS (
+                        INSERT INTO profile_sources (user_id, category, field_name, source_memory_id, source_type, extracted_at)
+                        SELECT user_id, category, field_name, source_memory_id, source_type, now()
+                        FROM unnest(
+                            %(source_user_ids)s::text[],
+                            %(source_categories)s::text[],
+                            %(source_field_names)s::text[],
+                            %(source_memory_ids)s::text[],
+                            %(source_types)s::text[]
+                        ) AS s(user_id, category, field_name, source_memory_id, source_type)
                     ),
+                    delta AS (
+                        SELECT
+                            user_id,
+                            count(*) FILTER (WHERE upserted.inserted AND field_vals.counted) AS new_fields
+                        FROM upserted
+                        JOIN field_vals USING (user_id, category, field_name)
+                        GROUP BY user_id
+                    )
+                    UPDATE user_profiles
+                    SET
+                        completeness_pct = LEAST(100.0, (populated_fields + delta.new_fields) * 100.0 / %(total)s),
+                        total_fields = %(total)s,
+                        populated_fields = populated_fields + delta.new_fields,
+                        last_updated = now()
+                    FROM delta
+                    WHERE user_profiles.user_id = delta.user_id
+                    RETURNING user_profiles.user_id, delta.new_fields
+                """,
+                    {
+                        "total": TOTAL_EXPECTED_FIELDS,
+                        "user_ids": user_ids,
+                        "categories": categories,
+                        "field_names": field_names,
+                        "field_values": field_values,
+                        "counted": counted,
+                        "source_user_ids": source_user_ids,
+                        "source_categories": source_categories,
+                        "source_field_names": source_field_names,
+                        "source_memory_ids": source_memory_ids,
+                        "source_types": source_types,
+                    },
+                    prepare=True,
                 )
 
-                fields_updated += 1
-
-            # Update user_profiles metadata (counts and completeness)
-            self._update_profile_metadata(cursor, user_id)
-
+            new_fields_by_user = dict(cursor.fetchall())
             conn.commit()
 
-            logger.info(
-                "[profile.store] user_id=%s fields_updated=%s", user_id, fields_updated
-            )
+            # Completeness only moves when a baseline field is newly populated;
+            # any goals field also feeds the high-value gaps
+            completeness_users = [
+                user_id
+                for user_id, new_fields in new_fields_by_user.items()
+                if new_fields or user_id in goals_users
+            ]
+
+            # After commit, so a reader that re-caches inside the window
+            # still expires with it
+            self._mark_caches_stale(list(fields_updated), completeness_users)
+
+            for user_id, count in fields_updated.items():
+                logger.info(
+                    "[profile.store] user_id=%s fields_updated=%s", user_id, count
+                )
 
             return fields_updated
 
@@ -189,7 +345,10 @@ class ProfileStorageService:
             if conn:
                 conn.rollback()
             logger.error(
-                "[profile.store] user_id=%s error=%s", user_id, e, exc_info=True
+                "[profile.store] users=%s error=%s",
+                list(fields_updated),
+                e,
+                exc_info=True,
             )
             raise
         finally:
@@ -198,114 +357,79 @@ class ProfileStorageService:
             if conn:
                 release_timescale_conn(conn)
 
-    def _infer_value_type(self, value: Any) -> str:
-        """Infer the value_type from Python type"""
-        if isinstance(value, bool):
-            return "bool"
-        elif isinstance(value, int):
-            return "int"
-        elif isinstance(value, float):
-            return "float"
-        elif isinstance(value, list):
-            return "list"
-        elif isinstance(value, dict):
-            return "dict"
-        else:
-            return "string"
-
     def _serialize_field_value(self, value: Any) -> str:
-        """Serialize field value to string for TEXT storage"""
-        import json
+        """Serialize field value to JSON text for the JSONB column"""
+        return orjson.dumps(value, default=str).decode()
 
-        if isinstance(value, (list, dict)):
-            return json.dumps(value)
-        elif isinstance(value, bool):
-            return str(value).lower()  # "true" or "false"
-        else:
-            return str(value)
-
-    def _update_profile_metadata(self, cursor, user_id: str):
+    def invalidate_many(self, user_ids: List[str]):
         """
-        Update user_profiles with field counts and completeness percentage.
-        Also invalidates the completeness cache.
+        Invalidate the Redis completeness and profile caches for several users.
 
-        Uses EXPECTED_PROFILE_FIELDS constant (TOTAL_EXPECTED_FIELDS across 8 categories).
+        All keys go out in one DEL, so a bulk store costs a single round-trip.
         """
-        # Get populated fields grouped by category
-        cursor.execute(
-            """
-            SELECT category, field_name
-            FROM profile_fields
-            WHERE user_id = %s
-        """,
-            (user_id,),
-        )
-
-        rows = cursor.fetchall()
-
-        # Build set of populated fields per category
-        populated_by_category: Dict[str, Set[str]] = {
-            cat: set() for cat in EXPECTED_PROFILE_FIELDS
-        }
-        for row in rows:
-            if isinstance(row, dict):
-                category = row["category"]
-                field_name = row["field_name"]
-            else:
-                category, field_name = row
-
-            if category in populated_by_category:
-                populated_by_category[category].add(field_name)
-
-        # Count total populated fields (intersection with expected fields)
-        total_populated = 0
-        for category, expected_fields in EXPECTED_PROFILE_FIELDS.items():
-            populated = populated_by_category.get(category, set())
-            # Count only fields that are in our expected list
-            total_populated += len(populated.intersection(set(expected_fields)))
-
-        # Calculate overall completeness percentage
-        completeness_pct = min(100.0, (total_populated / TOTAL_EXPECTED_FIELDS) * 100)
-
-        # Update user_profiles
-        cursor.execute(
-            """
-            UPDATE user_profiles
-            SET
-                completeness_pct = %s,
-                total_fields = %s,
-                populated_fields = %s,
-                last_updated = %s
-            WHERE user_id = %s
-        """,
-            (
-                completeness_pct,
-                TOTAL_EXPECTED_FIELDS,
-                total_populated,
-                datetime.now(timezone.utc),
-                user_id,
-            ),
-        )
+        if not user_ids:
+            return
+        self.evict_local_completeness(user_ids)
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                keys = []
+                for user_id in user_ids:
+                    keys.append(COMPLETENESS_CACHE_KEY.format(user_id=user_id))
+                    keys.append(PROFILE_CACHE_KEY.format(user_id=user_id))
+                redis_client.delete(*keys)
+                logger.debug(
+                    "[profile.cache] invalidated completeness and profile cache for user_ids=%s",
+                    user_ids,
+                )
+        except Exception as e:
+            # Cache invalidation failure shouldn't break the main flow
+            logger.warning(
+                "[profile.cache] failed to invalidate cache for user_ids=%s: %s",
+                user_ids,
+                e,
+            )
 
-        # Invalidate completeness cache
-        self._invalidate_completeness_cache(user_id)
+    def _mark_caches_stale(
+        self, profile_user_ids: List[str], completeness_user_ids: List[str]
+    ):
+        """
+        Let the profile (and, where given, completeness) caches lapse within
+        CACHE_STALE_TTL.
 
-    def _invalidate_completeness_cache(self, user_id: str):
-        """Invalidate the Redis completeness cache for a user"""
+        EXPIRE ... LT only ever shortens a TTL, so repeated writes inside the
+        window do not push it back and reads keep hitting the cache until it
+        lapses. Direct edits through the API still invalidate immediately.
+        """
+        self.evict_local_completeness(completeness_user_ids)
         try:
             redis_client = get_redis_client()
             if redis_client:
-                cache_key = COMPLETENESS_CACHE_KEY.format(user_id=user_id)
-                redis_client.delete(cache_key)
+                pipe = redis_client.pipeline(transaction=False)
+                for user_id in completeness_user_ids:
+                    pipe.expire(
+                        COMPLETENESS_CACHE_KEY.format(user_id=user_id),
+                        CACHE_STALE_TTL,
+                        lt=True,
+                    )
+                for user_id in profile_user_ids:
+                    pipe.expire(
+                        PROFILE_CACHE_KEY.format(user_id=user_id),
+                        CACHE_STALE_TTL,
+                        lt=True,
+                    )
+                pipe.execute()
                 logger.debug(
-                    "[profile.cache] invalidated completeness cache for user_id=%s",
-                    user_id,
+                    "[profile.cache] capped cache ttl at %ss for user_ids=%s completeness_user_ids=%s",
+                    CACHE_STALE_TTL,
+                    profile_user_ids,
+                    completeness_user_ids,
                 )
         except Exception as e:
-            # Cache invalidation failure shouldn't break the main flow
+            # Cache maintenance failure shouldn't break the main flow
             logger.warning(
-                "[profile.cache] failed to invalidate cache for user_id=%s: %s",
-                user_id,
+                "[profile.cache] failed to mark cache stale for user_ids=%s: %s",
+                profile_user_ids,
                 e,
             )
 
@@ -321,10 +445,16 @@ class ProfileStorageService:
             categories breakdown, and high_value_gaps list.
             Returns None if profile doesn't exist.
         """
-        # Check cache first
+        # Check the in-process cache, then Redis
+        cached = self._get_local_completeness(user_id)
+        if cached:
+            logger.debug("[profile.completeness] local_hit user_id=%s", user_id)
+            return cached
+
         cached = self._get_cached_completeness(user_id)
         if cached:
             logger.debug("[profile.completeness] cache_hit user_id=%s", user_id)
+            self._set_local_completeness(user_id, cached)
             return cached
 
         logger.debug("[profile.completeness] cache_miss user_id=%s", user_id)
@@ -334,82 +464,73 @@ class ProfileStorageService:
 
         try:
             conn = get_timescale_conn()
-            cursor = conn.cursor()
+            # Single read-only statement: no implicit BEGIN/ROLLBACK
+            conn.autocommit = True
+            cursor = conn.cursor(row_factory=tuple_row)
 
-            # Check if profile exists
+            # Profile existence, populated fields grouped by category, and
+            # confidence scores in one round-trip. No row means no profile.
             cursor.execute(
                 """
-                SELECT completeness_pct, populated_fields, total_fields
-                FROM user_profiles
-                WHERE user_id = %s
+                SELECT
+                    (
+                        SELECT json_object_agg(f.category, f.field_names)
+                        FROM (
+                            SELECT category, json_agg(field_name) AS field_names
+                            FROM profile_fields
+                            WHERE user_id = up.user_id
+                            GROUP BY category
+                        ) f
+                    ) AS fields,
+                    (
+                        SELECT json_object_agg(
+                            category || '.' || field_name, overall_confidence
+                        )
+                        FROM profile_confidence_scores
+                        WHERE user_id = up.user_id
+                    ) AS confidences
+                FROM user_profiles up
+                WHERE up.user_id = %s
             """,
                 (user_id,),
+                prepare=True,
             )
 
             profile_row = cursor.fetchone()
             if not profile_row:
                 return None
 
-            # Get populated fields by category
-            cursor.execute(
-                """
-                SELECT category, field_name
-                FROM profile_fields
-                WHERE user_id = %s
-            """,
-                (user_id,),
-            )
-
-            rows = cursor.fetchall()
+            fields_by_category, confidences = profile_row
 
-            # Build set of populated fields per category
+            # Build set of populated fields per category; categories with no
+            # rows are simply absent
             populated_by_category: Dict[str, Set[str]] = {
-                cat: set() for cat in EXPECTED_PROFILE_FIELDS
+                category: set(field_names)
+                for category, field_names in (fields_by_category or {}).items()
+                if category in EXPECTED_PROFILE_FIELDS_SETS
             }
-            for row in rows:
-                if isinstance(row, dict):
-                    category = row["category"]
-                    field_name = row["field_name"]
-                else:
-                    category, field_name = row
 
-                if category in populated_by_category:
-                    populated_by_category[category].add(field_name)
-
-            # Get confidence scores for gap prioritization
-            cursor.execute(
-                """
-                SELECT category, field_name, overall_confidence
-                FROM profile_confidence_scores
-                WHERE user_id = %s
-            """,
-                (user_id,),
-            )
-
-            confidence_rows = cursor.fetchall()
-            confidence_by_field: Dict[str, float] = {}
-            for row in confidence_rows:
-                if isinstance(row, dict):
-                    cat = row["category"]
-                    field = row["field_name"]
-                    conf = row["overall_confidence"]
-                else:
-                    cat, field, conf = row
-                confidence_by_field[f"{cat}.{field}"] = float(conf) if conf else 0.0
+            # Confidence scores for gap prioritization, keyed "category.field"
+            confidence_by_field: Dict[str, float] = {
+                key: float(conf) if conf else 0.0
+                for key, conf in (confidences or {}).items()
+            }
 
             # Calculate per-category completeness
             categories = {}
             total_populated = 0
-            for category, expected_fields in EXPECTED_PROFILE_FIELDS.items():
-                populated = populated_by_category.get(category, set())
-                expected_set = set(expected_fields)
+            for category, expected_set in EXPECTED_PROFILE_FIELDS_SETS.items():
+                populated = populated_by_category.get(category)
 
                 # Count only expected fields that are populated
-                populated_expected = populated.intersection(expected_set)
-                missing = list(expected_set - populated)
+                if populated:
+                    category_populated = len(populated & expected_set)
+                    missing = sorted(expected_set - populated)
+                else:
+                    category_populated = 0
+                    missing = list(EXPECTED_MISSING_TEMPLATE[category])
 
-                category_total = len(expected_fields)
-                category_populated = len(populated_expected)
+                category_total = len(expected_set)
                 category_pct = (
                     (category_populated / category_total) * 100
                     if category_total > 0
@@ -420,7 +541,7 @@ class ProfileStorageService:
                     "completeness_pct": round(category_pct, 1),
                     "populated": category_populated,
                     "total": category_total,
-                    "missing": sorted(missing),
+                    "missing": missing,
                 }
 
                 total_populated += category_populated
@@ -447,6 +568,7 @@ class ProfileStorageService:
 
             # Cache the result
             self._cache_completeness(user_id, result)
+            self._set_local_completeness(user_id, result)
 
             return result
 
@@ -459,7 +581,7 @@ class ProfileStorageService:
             if cursor:
                 cursor.close()
             if conn:
-                release_timescale_conn(conn)
+                self._release_read_conn(conn, user_id)
 
     def _identify_high_value_gaps(
         self,
@@ -483,38 +605,69 @@ class ProfileStorageService:
         Returns:
             Ordered list of field names (format: "field_name" for basics, "category_field" otherwise)
         """
-        high_value_gaps = []
+        high_value_gaps: List[str] = []
+        seen: Set[str] = set()
+
+        def add(field: str):
+            if field not in seen:
+                seen.add(field)
+                high_value_gaps.append(field)
 
         # Priority 1: Missing basics fields (highest priority - foundational identity)
-        basics_missing = categories.get("basics", {}).get("missing", [])
-        for field in basics_missing:
-            high_value_gaps.append(field)
+        for field in categories.get("basics", {}).get("missing", []):
+            add(field)
 
         # Priority 2: Fields with zero confidence (never extracted) across other categories
         for category in ["preferences", "goals", "interests", "background"]:
-            missing = categories.get(category, {}).get("missing", [])
-            for field in missing:
-                key = f"{category}.{field}"
-                conf = confidence_by_field.get(key, 0.0)
-                if conf == 0.0 and field not in high_value_gaps:
-                    # Use descriptive name for non-basics fields
-                    gap_name = f"{field}" if category == "basics" else f"{field}"
-                    if gap_name not in high_value_gaps:
-                        high_value_gaps.append(gap_name)
+            for field in categories.get(category, {}).get("missing", []):
+                if confidence_by_field.get(f"{category}.{field}", 0.0) == 0.0:
+                    add(field)
 
         # Priority 3: Goal-relevant fields (if goals category is partially populated)
-        goals_populated = populated_by_category.get("goals", set())
-        if goals_populated:
+        if populated_by_category.get("goals"):
             # If user has goals, skills and background are relevant
+            missing_sets = {
+                category: set(categories.get(category, {}).get("missing", []))
+                for category in ("background", "interests")
+            }
             for field in ["skills", "experiences", "learning"]:
                 for category in ["background", "interests"]:
-                    if field in categories.get(category, {}).get("missing", []):
-                        if field not in high_value_gaps:
-                            high_value_gaps.append(field)
+                    if field in missing_sets[category]:
+                        add(field)
 
         # Limit to top 10 most important gaps
         return high_value_gaps[:10]
 
+    def _get_local_completeness(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get completeness data from the in-process cache"""
+        with _local_completeness_lock:
+            entry = _local_completeness.get(user_id)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                del _local_completeness[user_id]
+                return None
+        # Shallow copy: callers pop internal keys such as cached_at
+        return dict(data)
+
+    def _set_local_completeness(self, user_id: str, data: Dict[str, Any]):
+        """Cache completeness data in-process, dropping the oldest entries"""
+        with _local_completeness_lock:
+            _local_completeness[user_id] = (
+                time.monotonic() + LOCAL_COMPLETENESS_TTL,
+                dict(data),
+            )
+            _local_completeness.move_to_end(user_id)
+            while len(_local_completeness) > LOCAL_COMPLETENESS_MAXSIZE:
+                _local_completeness.popitem(last=False)
+
+    def evict_local_completeness(self, user_ids: List[str]):
+        """Drop users from this worker's in-process completeness cache"""
+        with _local_completeness_lock:
+            for user_id in user_ids:
+                _local_completeness.pop(user_id, None)
+
     def _get_cached_completeness(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get completeness data from Redis cache"""
         try:
@@ -523,7 +676,7 @@ class ProfileStorageService:
                 cache_key = COMPLETENESS_CACHE_KEY.format(user_id=user_id)
                 cached = redis_client.get(cache_key)
                 if cached:
-                    return json.loads(cached)
+                    return orjson.loads(cached)
         except Exception as e:
             logger.warning(
                 "[profile.cache] failed to get cache for user_id=%s: %s", user_id, e
@@ -536,14 +689,15 @@ class ProfileStorageService:
             redis_client = get_redis_client()
             if redis_client:
                 cache_key = COMPLETENESS_CACHE_KEY.format(user_id=user_id)
-                # Add cache timestamp
-                data_with_ts = {
-                    **data,
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                }
-                redis_client.setex(
-                    cache_key, COMPLETENESS_CACHE_TTL, json.dumps(data_with_ts)
+                # Splice the cache timestamp into the serialized object rather
+                # than copying data; the payload is always a non-empty object
+                payload = (
+                    orjson.dumps(data)[:-1]
+                    + b',"cached_at":'
+                    + orjson.dumps(datetime.now(timezone.utc))
+                    + b"}"
                 )
+                redis_client.setex(cache_key, COMPLETENESS_CACHE_TTL, payload)
                 logger.debug(
                     "[profile.cache] cached completeness for user_id=%s", user_id
                 )
@@ -562,21 +716,56 @@ class ProfileStorageService:
         Returns:
             Profile dictionary with metadata and fields grouped by category
         """
+        # Check cache first
+        cached = self._get_cached_profile(user_id)
+        if cached:
+            logger.debug("[profile.get] cache_hit user_id=%s", user_id)
+            return cached
+
         conn = None
         cursor = None
 
         try:
             conn = get_timescale_conn()
-            cursor = conn.cursor()
-
-            # Get profile metadata
+            # Single read-only statement: run it in autocommit so there is no
+            # implicit BEGIN/ROLLBACK pair around it
+            conn.autocommit = True
+            cursor = conn.cursor(row_factory=tuple_row)
+
+            # Get profile metadata and all fields in one round-trip. Fields
+            # come back grouped by category as
+            # {category: {field_name: [field_value, last_updated]}}, with
+            # field_value already typed from JSONB; json (not jsonb) keeps
+            # the ORDER BY key order. Prepared per
+            # connection like the write statements.
             cursor.execute(
                 """
-                SELECT completeness_pct, total_fields, populated_fields, last_updated, created_at
-                FROM user_profiles
-                WHERE user_id = %s
+                SELECT
+                    up.completeness_pct,
+                    up.total_fields,
+                    up.populated_fields,
+                    up.last_updated,
+                    up.created_at,
+                    (
+                        SELECT json_object_agg(c.category, c.fields ORDER BY c.category)
+                        FROM (
+                            SELECT
+                                category,
+                                json_object_agg(
+                                    field_name,
+                                    json_build_array(field_value, last_updated)
+                                    ORDER BY field_name
+                                ) AS fields
+                            FROM profile_fields
+                            WHERE user_id = up.user_id
+                            GROUP BY category
+                        ) c
+                    ) AS fields
+                FROM user_profiles up
+                WHERE up.user_id = %s
             """,
                 (user_id,),
+                prepare=True,
             )
 
             profile_row = cursor.fetchone()
@@ -584,34 +773,14 @@ class ProfileStorageService:
                 logger.info("[profile.get] user_id=%s not_found", user_id)
                 return None
 
-            # Handle both tuple and dict-like cursor results
-            if isinstance(profile_row, dict):
-                completeness_pct = profile_row["completeness_pct"]
-                total_fields = profile_row["total_fields"]
-                populated_fields = profile_row["populated_fields"]
-                last_updated = profile_row["last_updated"]
-                created_at = profile_row["created_at"]
-            else:
-                (
-                    completeness_pct,
-                    total_fields,
-                    populated_fields,
-                    last_updated,
-                    created_at,
-                ) = profile_row
-
-            # Get all profile fields
-            cursor.execute(
-                """
-                SELECT category, field_name, field_value, value_type, last_updated
-                FROM profile_fields
-                WHERE user_id = %s
-                ORDER BY category, field_name
-            """,
-                (user_id,),
-            )
-
-            fields_rows = cursor.fetchall()
+            (
+                completeness_pct,
+                total_fields,
+                populated_fields,
+                last_updated,
+                created_at,
+                fields_by_category,
+            ) = profile_row
 
             # Group fields by category
             categories = (
@@ -629,38 +798,14 @@ class ProfileStorageService:
                 c: {} for c in categories
             }
 
-            for row in fields_rows:
-                # Handle both tuple and dict-like cursor results
-                if isinstance(row, dict):
-                    category = row["category"]
-                    field_name = row["field_name"]
-                    field_value = row["field_value"]
-                    value_type = row["value_type"]
-                    field_last_updated = row["last_updated"]
-                else:
-                    (
-                        category,
-                        field_name,
-                        field_value,
-                        value_type,
-                        field_last_updated,
-                    ) = row
-
-                # Deserialize value based on type
-                parsed_value = self._deserialize_field_value(field_value, value_type)
-
-                # Handle both datetime objects and string timestamps
-                if field_last_updated:
-                    if hasattr(field_last_updated, "isoformat"):
-                        last_updated_str = field_last_updated.isoformat()
-                    else:
-                        last_updated_str = str(field_last_updated)
-                else:
-                    last_updated_str = None
-
-                profile_data[category][field_name] = parsed_value
-                field_metadata[category][field_name] = {
-                    "last_updated": last_updated_str,
+            # json renders timestamps as ISO 8601 strings already
+            for category, fields in (fields_by_category or {}).items():
+                profile_data[category] = {
+                    field_name: value for field_name, (value, _) in fields.items()
+                }
+                field_metadata[category] = {
+                    field_name: {"last_updated": field_last_updated}
+                    for field_name, (_, field_last_updated) in fields.items()
                 }
 
             # Build final profile object
@@ -698,6 +843,9 @@ class ProfileStorageService:
                 populated_fields,
             )
 
+            # Cache the result
+            self._cache_profile(user_id, profile)
+
             return profile
 
         except Exception as e:
@@ -707,21 +855,47 @@ class ProfileStorageService:
             if cursor:
                 cursor.close()
             if conn:
-                release_timescale_conn(conn)
+                self._release_read_conn(conn, user_id)
 
-    def _deserialize_field_value(self, value_str: str, value_type: str) -> Any:
-        """Deserialize field value from TEXT storage"""
-        import json
-
-        if value_type == "bool":
-            return value_str.lower() == "true"
-        elif value_type == "int":
-            return int(value_str)
-        elif value_type == "float":
-            return float(value_str)
-        elif value_type == "list":
-            return json.loads(value_str)
-        elif value_type == "dict":
-            return json.loads(value_str)
-        else:
-            return value_str
+    def _release_read_conn(self, conn: Connection, user_id: str):
+        """Turn autocommit back off and return a read connection to the pool"""
+        # Writers sharing the pool rely on explicit commit()/rollback()
+        try:
+            conn.autocommit = False
+        except Exception as e:
+            logger.warning(
+                "[profile.get] user_id=%s failed to reset autocommit: %s", user_id, e
+            )
+        release_timescale_conn(conn)
+
+    def _get_cached_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a full profile from Redis cache"""
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                cache_key = PROFILE_CACHE_KEY.format(user_id=user_id)
+                cached = redis_client.get(cache_key)
+                if cached:
+                    return orjson.loads(cached)
+        except Exception as e:
+            logger.warning(
+                "[profile.cache] failed to get profile cache for user_id=%s: %s",
+                user_id,
+                e,
+            )
+        return None
+
+    def _cache_profile(self, user_id: str, profile: Dict[str, Any]):
+        """Cache a full profile in Redis"""
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                cache_key = PROFILE_CACHE_KEY.format(user_id=user_id)
+                redis_client.setex(cache_key, PROFILE_CACHE_TTL, orjson.dumps(profile))
+                logger.debug("[profile.cache] cached profile for user_id=%s", user_id)
+        except Exception as e:
+            logger.warning(
+                "[profile.cache] failed to cache profile for user_id=%s: %s",
+                user_id,
+                e,
+            )
@@ -1,7 +1,42 @@
-CONSOLIDATION_PROMPT = """
-You are merging related memories into a single comprehensive memory.
+"""
+Prompt texts for memory consolidation, worthiness, typing and extraction.
 
-## Guidelines
+Templates with slots are split once at import into literal fragments
+(PromptTemplate) and rendered by concatenation, so the JSON examples keep
+their literal braces and no str.format pass runs per call.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A prompt pre-split into literal fragments around named slots."""
+
+    fragments: Tuple[str, ...]
+    slots: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, text: str, slot_names: Sequence[str]) -> "PromptTemplate":
+        """Split text at each {slot} placeholder; other braces stay literal."""
+        pattern = re.compile(
+            r"\{(" + "|".join(re.escape(name) for name in slot_names) + r")\}"
+        )
+        parts = pattern.split(text)
+        return cls(fragments=tuple(parts[0::2]), slots=tuple(parts[1::2]))
+
+    def render(self, **values: str) -> str:
+        """Join the fragments with the slot values; raises KeyError if one is missing."""
+        parts = [self.fragments[0]]
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            parts.append(values[slot])
+            parts.append(fragment)
+        return "".join(parts)
+
+
+_CONSOLIDATION_GUIDELINES = """## Guidelines
 - Preserve ALL key facts from source memories
 - Use "User" format (e.g., "User is a value investor...")
 - Combine related details into coherent statements
@@ -9,33 +44,65 @@ You are merging related memories into a single comprehensive memory.
 - Focus on the stable insight/preference, not transient state
 
 ## Conflict Resolution (CRITICAL)
-When facts CONFLICT (different values for the same attribute), use the NEWER memory (later timestamp).
+Format: idx|YYMMDD|content, one memory per line (? = unknown date). Newer YYMMDD wins on conflicts (different values for the same attribute); additive facts are all kept."""
 
-Examples:
-- "[2025-12-15] owns 100 shares" vs "[2025-12-20] owns 200 shares" → Use "200 shares" (newer)
-- "[2025-12-10] prefers growth stocks" vs "[2025-12-18] prefers value stocks" → Use "value stocks" (newer)
-- "[2025-12-01] lives in NYC" vs "[2025-12-15] lives in SF" → Use "SF" (newer)
+CONSOLIDATION_PROMPT = (
+    """You are merging related memories into a single comprehensive memory.
 
-When NOT conflicting (additive information), preserve both:
-- "[2025-12-15] likes hiking" + "[2025-12-20] enjoys camping" → Both are valid, combine them
+"""
+    + _CONSOLIDATION_GUIDELINES
+    + """
 
 ## Source memories to merge:
 {memories}
 
-## Return a single JSON object:
-```json
-{{
-  "content": "User ..."
-}}
-```
+Reply with the merged memory as `content`."""
+)
 
-Return ONLY the JSON object, no explanation.
-""".strip()
+# Static prompt for merging several clusters in one request; the clusters
+# travel in the user message so every batch shares this prefix.
+BATCH_CONSOLIDATION_PROMPT = (
+    """You are merging several independent clusters of related memories; each cluster becomes a single comprehensive memory.
 
+"""
+    + _CONSOLIDATION_GUIDELINES
+    + """
 
-WORTHINESS_PROMPT = """
+## Batched Inputs
+The user message is a JSON object: {"clusters": [{"index": 0, "memories": "<rows>"}]}.
+Merge each cluster on its own, and never carry facts between clusters.
+
+Reply with one `results` entry per cluster: its `index` and the merged memory as `content`."""
+)
+
+
+# Instruction fragments shared by several prompts below, so each rule has one
+# canonical wording.
+_JSON_RETURN_FOOTER = "Return ONLY valid JSON with this schema:"
+
+_LAYER_RULES = """- `short-term`: Time-bound facts or next actions ("tomorrow", "next week", "by Friday")
+- `semantic`: Stable facts: preferences, bio/work facts, habits, learning progress, relationships ("loves pizza", "works at Google", "runs daily")"""
+
+_TICKER_TAG_RULE = (
+    'If any stock ticker is mentioned (e.g., "AAPL", "TSLA", "BRK.B"), include tags '
+    '`["finance", "stocks", "ticker:SYMBOL"]` for each symbol.'
+)
+
+_FINANCE_RULES = (
+    """- Always treat content about stocks, tickers, trading, portfolio changes, watchlists, price targets, risk tolerance, or financial goals as memory-worthy.
+- """
+    + _TICKER_TAG_RULE
+    + """
+- Classify short-term trading intents (buy/sell/stop/target within days–weeks) as short-term; strategic allocations, risk tolerance, sector preferences as semantic."""
+)
+
+
+WORTHINESS_PROMPT = (
+    """
 You extract whether a user's recent message is memory-worthy for personalization.
-Return ONLY valid JSON with this schema:
+"""
+    + _JSON_RETURN_FOOTER
+    + """
 {
   "worthy": boolean,
   "confidence": number,
@@ -52,9 +119,9 @@ Edge cases:
 - If the message contains multiple preferences and some are new while others are duplicates, it is still memory-worthy (extract the new ones only).
 
 FINANCE PRIORITY RULES (STOCKS & TRADING):
-- Always treat content about stocks, tickers, trading, portfolio changes, watchlists, price targets, risk tolerance, or financial goals as memory-worthy.
-- If any stock ticker is mentioned (e.g., "AAPL", "TSLA", "NVDA", including dotted symbols like "BRK.B"), set tags to include ["finance", "stocks", "ticker:<SYMBOL>"] for each detected symbol.
-- Classify short-term trading intents (buy/sell/stop/target within days–weeks) as short-term; strategic allocations, risk tolerance, sector preferences as semantic.
+"""
+    + _FINANCE_RULES
+    + """
 
 ## NOT Worthy (Even if it seems like a preference)
 
@@ -72,11 +139,15 @@ Before marking as worthy:
 3. Is this INSIGHT (why/reasoning) rather than STATE (what/quantity)?
 
 If any answer is NO, mark as NOT worthy with worthy: false.
-""".strip()
+"""
+).strip()
 
 
-TYPING_PROMPT = """
-Classify the memory's type and layer. Return ONLY JSON:
+TYPING_PROMPT = (
+    """
+Classify the memory's type and layer. """
+    + _JSON_RETURN_FOOTER
+    + """
 {
   "type": "explicit" | "implicit",
   "layer": "short-term" | "semantic" | "long-term",
@@ -88,14 +159,18 @@ Classify the memory's type and layer. Return ONLY JSON:
 
 Rules:
 - explicit: stated facts; implicit: inferred (mood/trait).
-- short-term: time-bound or "next_action" (use ttl ~3600–172800 seconds).
-- semantic: stable preferences, bio/pro work facts, habits, learning progress, relationships.
+"""
+    + _LAYER_RULES
+    + """
+- short-term ttl: ~3600–172800 seconds.
 - long-term: summaries/archives (rare in this phase).
-""".strip()
+"""
+).strip()
 
 
-EXTRACTION_PROMPT = """
-Extract memories from conversation history as JSON array. Each memory must be:
+# Full extraction prompt with its slots (used by the evals).
+EXTRACTION_PROMPT = (
+    """Extract memories from conversation history as JSON array. Each memory must be:
 - Atomic (one fact per memory)
 - Normalized ("User" + verb, NOT first-person)
 - Deduplicated (skip if semantically identical to existing)
@@ -162,6 +237,7 @@ Split compound statements:
   ["User loves sci-fi books.", "User runs marathons."]
 
 **Rule 3: DEDUPLICATION (with Entailment Check)**
+The existing memories below are the stored memories nearest to this conversation, so compare each candidate against them.
 Given existing: "User loves science fiction."
 - "I'm a sci-fi fan" → SKIP (duplicate)
 - "I also like fantasy" → EXTRACT (new)
@@ -177,8 +253,9 @@ Only store if:
 2. New memory adds NOVEL information not captured by existing
 
 **Rule 4: LAYER ASSIGNMENT**
-- `short-term`: Time-bound facts ("tomorrow", "next week", "by Friday")
-- `semantic`: Stable facts ("loves pizza", "works at Google", "runs daily")
+"""
+    + _LAYER_RULES
+    + """
 
 **Rule 5: CONFIDENCE SCORING**
 - `1.0`: Direct statement ("I am X", "I did Y")
@@ -320,7 +397,10 @@ When you detect introductions or self-descriptions with name, age, occupation, l
 
 ### Finance/Stocks (HIGH PRIORITY)
 When you detect: tickers (AAPL, TSLA), portfolio, shares, price
-→ Always extract + include `portfolio` object + tags: `["finance", "stocks", "ticker:SYMBOL"]`
+→ Always extract + include `portfolio` object
+→ """
+    + _TICKER_TAG_RULE
+    + """
 
 **Portfolio extraction focuses on:**
 - **ticker**: The stock symbol (e.g., "AAPL", "TSLA", "BRK.B")
@@ -708,5 +788,7 @@ User: "I'm terrible at public speaking but getting better with practice."
 **Recent Conversation:**
 {history}
 
-**Extract memories as JSON array:**
-""".strip()
+**Extract memories as JSON array:**"""
+)
+
+CONSOLIDATION_TEMPLATE = PromptTemplate.compile(CONSOLIDATION_PROMPT, ("memories",))
@@ -650,33 +650,3 @@ Return a JSON array of memory objects. For significant memories, include rich co
 
 **Extract memories as JSON array (with context and emotional weight where relevant):**
 """.strip()
-
-
-WORTHINESS_PROMPT_V3 = """
-You extract whether a user's recent message is memory-worthy for personalization.
-Return ONLY valid JSON with this schema:
-{
-  "worthy": boolean,
-  "confidence": number,
-  "tags": string[],
-  "reasons": string[]
-}
-
-Guidelines (recall-first):
-- Worthy if: stable preferences, bio/identity, habits, emotions affecting choices, professional facts, skills/tools, projects (plans/decisions/milestones/next_action), relationships, learning progress.
-- Also worthy: time-bound next_action (store short-term).
-- Not worthy alone: greetings, meta-chatter, filler.
-- English only.
-Edge cases:
-- If the message contains multiple preferences and some are new while others are duplicates, it is still memory-worthy (extract the new ones only).
-
-FINANCE PRIORITY RULES (STOCKS & TRADING):
-- Always treat content about stocks, tickers, trading, portfolio changes, watchlists, price targets, risk tolerance, or financial goals as memory-worthy.
-- If any stock ticker is mentioned (e.g., "AAPL", "TSLA", "NVDA", including dotted symbols like "BRK.B"), set tags to include ["finance", "stocks", "ticker:<SYMBOL>"] for each detected symbol.
-- Classify short-term trading intents (buy/sell/stop/target within days–weeks) as short-term; strategic allocations, risk tolerance, sector preferences as semantic.
-
-EMOTIONAL & EPISODIC PRIORITY (Digital Soul):
-- Significant life events, emotional moments, breakthroughs, and turning points are HIGH PRIORITY.
-- Look for emotional indicators: stress, excitement, worry, pride, anxiety, joy, breakthrough moments.
-- Recurring patterns and habits are memory-worthy for predictive intelligence.
-""".strip()
@@ -15,7 +15,11 @@ Key features:
 7. Finance-first priority with State vs Insight separation
 """
 
-EXTRACTION_PROMPT_V3 = """
+import re
+from typing import Any, Dict, List
+
+# Everything ahead of the worked examples
+_RULES_BODY_V3 = """
 You are extracting memories for a Digital Soul - a living, evolving consciousness that remembers EXPERIENCES, not just facts.
 
 Your goal: Capture the richness of human experience with emotional weight, context, and narrative coherence.
@@ -258,9 +262,13 @@ When you detect introductions with name, age, occupation, location:
 - Location: "I live in [place]"
 - Employer: "I work at [company]"
 
-## Enhanced Examples
+"""
+
+_EXAMPLES_HEADER_V3 = "## Enhanced Examples\n\n"
 
-### Example 1: Episodic with Full Context
+# Worked examples 1-5, in prompt order
+_EXAMPLES_V3 = (
+    """### Example 1: Episodic with Full Context
 
 **Input:** "Just finished my first team presentation as the new tech lead. I was super nervous beforehand, but it went really well!"
 
@@ -293,7 +301,8 @@ When you detect introductions with name, age, occupation, location:
 ]
 ```
 
-### Example 2: Portfolio Behavior Pattern
+""",
+    """### Example 2: Portfolio Behavior Pattern
 
 **Input:** "Like every Sunday morning, reviewing my portfolio over coffee. Thinking about taking profits on AAPL."
 
@@ -330,7 +339,8 @@ When you detect introductions with name, age, occupation, location:
 ]
 ```
 
-### Example 3: Basic Profile Introduction
+""",
+    """### Example 3: Basic Profile Introduction
 
 **Input:** "Hi! I'm Sarah, a 28-year-old engineer living in San Francisco. I work at Google."
 
@@ -378,7 +388,8 @@ When you detect introductions with name, age, occupation, location:
 ]
 ```
 
-### Example 4: Learning Breakthrough
+""",
+    """### Example 4: Learning Breakthrough
 
 **Input:** "Finally understand async/await in Python! Been struggling with it for weeks, but after building that web scraper, it all clicked."
 
@@ -422,7 +433,8 @@ When you detect introductions with name, age, occupation, location:
 ]
 ```
 
-### Example 5: Emotional Family Context
+""",
+    """### Example 5: Emotional Family Context
 
 **Input:** "Really worried about my mom's health. She mentioned chest pains yesterday."
 
@@ -453,7 +465,10 @@ When you detect introductions with name, age, occupation, location:
 ]
 ```
 
-## Step-by-Step Process
+""",
+)
+
+_PROCESS_V3 = """## Step-by-Step Process
 
 1. **Read** the conversation (last 4-6 turns)
 2. **Feel** the emotional weight - what emotions are present?
@@ -473,6 +488,75 @@ When you detect introductions with name, age, occupation, location:
   - Only truisms/meta-chatter
 - Include `content: null` for pure portfolio state data
 - NEVER return error messages or explanations
+"""
+
+_EXTRACTION_RULES_V3 = (
+    _RULES_BODY_V3 + _EXAMPLES_HEADER_V3 + "".join(_EXAMPLES_V3) + _PROCESS_V3
+).strip()
+
+# Short-input variant: same rules, only the profile introduction example
+# (Example 3). Single short turns rarely need the full set of worked examples.
+_EXTRACTION_RULES_V3_SHORT = (
+    _RULES_BODY_V3 + _EXAMPLES_HEADER_V3 + _EXAMPLES_V3[2] + _PROCESS_V3
+).strip()
+
+_PAYLOAD_NOTE_V3 = """
+
+---
+
+The user message is a JSON object: `existing_memories_context` lists the stored memories nearest to this conversation (skip anything duplicate or entailed) and `history` is the recent conversation. Extract only NEW information that adds value.
+
+Return JSON array:"""
+
+# Fully static system prompts. The per-request existing memories and history
+# travel in the user message, so the provider can reuse the cached prefix.
+EXTRACTION_SYSTEM_V3 = _EXTRACTION_RULES_V3 + _PAYLOAD_NOTE_V3
+EXTRACTION_SYSTEM_V3_SHORT = _EXTRACTION_RULES_V3_SHORT + _PAYLOAD_NOTE_V3
+
+# Conversations up to this many characters, without several clauses, get the
+# short system prompt
+SHORT_EXTRACTION_MAX_CHARS = 800
+
+_CLAUSE_RE = re.compile(r"[.;!?](?:\s|$)|\band\b", re.IGNORECASE)
+
+
+def _has_multi_intent(text: str) -> bool:
+    """True if the text chains three or more sentences/clauses."""
+    return len(_CLAUSE_RE.findall(text)) >= 3
+
+
+def select_extraction_system(history: List[Dict[str, Any]]) -> str:
+    """Pick the full or short V3 extraction system prompt for a history.
+
+    Long or multi-intent conversations get every worked example; short,
+    single-intent ones get the trimmed prompt.
+    """
+    text = "\n".join(str(m.get("content") or "") for m in history)
+    if len(text) > SHORT_EXTRACTION_MAX_CHARS or _has_multi_intent(text):
+        return EXTRACTION_SYSTEM_V3
+    return EXTRACTION_SYSTEM_V3_SHORT
+
+
+# Batched variant: same static rules, several independent inputs per request
+BATCH_EXTRACTION_SYSTEM_V3 = (
+    _EXTRACTION_RULES_V3
+    + """
+
+---
+
+## Batched Inputs
+
+The user message is a JSON object: {"inputs": [{"index": 0, "history": [...], "existing_memories_context": "..."}]}.
+Each input is an independent conversation with its own existing memories. Apply every rule above to each input separately, and never carry facts or deduplication across inputs.
+
+Instead of a single array, return ONLY a JSON object with one entry per input (use [] when nothing is memory-worthy):
+{"results": [{"index": 0, "memories": [...]}, {"index": 1, "memories": []}]}"""
+)
+
+# Single-string form with inline slots, kept for the evals.
+EXTRACTION_PROMPT_V3 = (
+    _EXTRACTION_RULES_V3
+    + """
 
 ---
 
@@ -482,20 +566,13 @@ When you detect introductions with name, age, occupation, location:
 **Recent Conversation:**
 {history}
 
-**Extract memories as JSON array (with emotional context where relevant):**
-""".strip()
+**Extract memories as JSON array (with emotional context where relevant):**"""
+)
 
 
 WORTHINESS_PROMPT_V3 = """
 You determine whether a user's recent message is memory-worthy for personalization.
-Return ONLY valid JSON with this schema:
-{
-  "worthy": boolean,
-  "confidence": number,
-  "tags": string[],
-  "reasons": string[],
-  "emotional_intensity": number  // 0.0-1.0, how emotionally charged
-}
+The response shape is enforced by the API schema.
 
 ## WORTHY if:
 - Stable preferences, bio/identity, habits
@@ -22,18 +22,35 @@ import uuid
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
+import orjson
 from langgraph.graph import StateGraph, END
 from src.schemas import TranscriptRequest
-from src.services.prompts_v3 import WORTHINESS_PROMPT_V3, EXTRACTION_PROMPT_V3
-from src.services.extract_utils import _call_llm_json
+from src.services.prompts_v3 import (
+    EXTRACTION_SYSTEM_V3,
+    EXTRACTION_SYSTEM_V3_SHORT,
+    WORTHINESS_PROMPT_V3,
+    select_extraction_system,
+)
+from src.services.extract_utils import (
+    WORTHINESS_RESPONSE_FORMAT,
+    _call_llm_json,
+    _dumps_payload,
+)
 from src.services.memory_context import (
     format_memories_for_llm_context,
     get_relevant_existing_memories,
+    trim_history_to_budget,
 )
 from src.services.storage import upsert_memories
+from src.services.worthiness_fast import DEFAULT_UNWORTHY, history_is_filler
 from src.models import Memory
 from src.services.embedding_utils import generate_embedding
-from src.config import get_default_short_term_ttl_seconds
+from src.dependencies.redis_client import get_redis_client
+from src.config import (
+    get_default_short_term_ttl_seconds,
+    get_extraction_existing_max_tokens,
+    get_extraction_history_max_tokens,
+)
 from src.services.profile_extraction import ProfileExtractor
 from src.services.profile_storage import ProfileStorageService
 
@@ -41,6 +58,55 @@ logger = logging.getLogger("agentic_memories.unified_graph")
 
 SHORT_TERM_TTL_SECONDS = get_default_short_term_ttl_seconds()
 
+# ProfileExtractor is stateless, so one instance serves every ingestion
+_profile_extractor = ProfileExtractor()
+
+# Exact-match cache of raw LLM extractions, so a redelivered or retried turn
+# with the same existing-memory context skips the LLM call
+MEMORY_EXTRACTION_CACHE_KEY = "memory_extraction:{digest}"
+MEMORY_EXTRACTION_CACHE_TTL = 3600
+_EXTRACTION_PROMPT_HASH_SEED = hashlib.sha256(
+    (EXTRACTION_SYSTEM_V3 + EXTRACTION_SYSTEM_V3_SHORT).encode("utf-8")
+)
+
+
+def _memory_extraction_cache_key(
+    user_id: Optional[str], payload: Dict[str, Any]
+) -> str:
+    """Cache key for one extraction request: prompt digest + user + payload."""
+    digest = _EXTRACTION_PROMPT_HASH_SEED.copy()
+    digest.update(f"{user_id}\0".encode("utf-8"))
+    digest.update(_dumps_payload(payload).encode("utf-8"))
+    return MEMORY_EXTRACTION_CACHE_KEY.format(digest=digest.hexdigest())
+
+
+def _get_cached_extraction(cache_key: str) -> Optional[List[Any]]:
+    """Raw extraction items for an identical earlier request, if cached."""
+    try:
+        redis_client = get_redis_client()
+        if redis_client:
+            cached = redis_client.get(cache_key)
+            if cached:
+                return orjson.loads(cached)
+    except Exception as e:
+        logger.warning("[graph.extract.cache] get failed: %s", e)
+    return None
+
+
+def _cache_extraction(cache_key: str, items: List[Any]) -> None:
+    """Cache raw extraction items in Redis, keeping an existing entry."""
+    try:
+        redis_client = get_redis_client()
+        if redis_client:
+            redis_client.set(
+                cache_key,
+                _dumps_payload(items),
+                ex=MEMORY_EXTRACTION_CACHE_TTL,
+                nx=True,
+            )
+    except Exception as e:
+        logger.warning("[graph.extract.cache] set failed: %s", e)
+
 
 # ============================================================================
 # Sentiment Analysis Prompt
@@ -152,7 +218,14 @@ def node_worthiness(state: IngestionState) -> IngestionState:
     # Process ALL messages to capture initial profile information
     payload = {"history": history_dicts}
 
-    resp = _call_llm_json(WORTHINESS_PROMPT_V3, payload)
+    if history_is_filler(history_dicts):
+        # Greetings/acknowledgements only: skip the LLM round trip
+        resp = dict(DEFAULT_UNWORTHY)
+        state["metrics"]["worthiness_prefiltered"] = True
+    else:
+        resp = _call_llm_json(
+            WORTHINESS_PROMPT_V3, payload, response_format=WORTHINESS_RESPONSE_FORMAT
+        )
     worthy = bool(resp and resp.get("worthy", False))
 
     state["worthy"] = worthy
@@ -181,7 +254,9 @@ def node_extract(state: IngestionState) -> IngestionState:
         input={"user_id": user_id, "existing_memories_count": len(existing_memories)},
     )
 
-    existing_context = format_memories_for_llm_context(existing_memories)
+    existing_context = format_memories_for_llm_context(
+        existing_memories, max_tokens=get_extraction_existing_max_tokens()
+    )
 
     # Convert Message objects to dicts for JSON serialization
     history = state["history"]
@@ -189,15 +264,26 @@ def node_extract(state: IngestionState) -> IngestionState:
         {"role": m.role, "content": m.content} if hasattr(m, "role") else m
         for m in history
     ]
+    # Cap the prompt: keep the newest turns within the history budget
+    history_dicts = trim_history_to_budget(
+        history_dicts, get_extraction_history_max_tokens()
+    )
 
     # Create enhanced payload with existing memory context
     # Process ALL messages to capture initial profile information
     payload = {"history": history_dicts, "existing_memories_context": existing_context}
 
-    # Enhanced extraction prompt with context (using V3 prompt with emotional/narrative support)
-    enhanced_prompt = f"{EXTRACTION_PROMPT_V3}\n\n{existing_context}\n\nBased on the existing memories above, extract only NEW information that adds value."
-
-    items = _call_llm_json(enhanced_prompt, payload, expect_array=True) or []
+    cache_key = _memory_extraction_cache_key(user_id, payload)
+    items = _get_cached_extraction(cache_key)
+    if items is not None:
+        logger.info("[graph.extract.cache] user_id=%s hit", user_id)
+    else:
+        # Static V3 system prompt; existing memories and history ride in the payload
+        system_prompt = select_extraction_system(history_dicts)
+        items = _call_llm_json(system_prompt, payload, expect_array=True) or []
+        # Empty results are not cached: they may come from an unparseable reply
+        if items:
+            _cache_extraction(cache_key, items)
     state["extracted_items"] = items
     state["metrics"]["extraction_ms"] = int(
         (time.perf_counter() - state["t_start"]) * 1000
@@ -707,8 +793,7 @@ def node_extract_profile(state: IngestionState) -> IngestionState:
         return state
 
     try:
-        extractor = ProfileExtractor()
-        extractions = extractor.extract_from_memories(user_id, memories)
+        extractions = _profile_extractor.extract_from_memories(user_id, memories)
 
         state["profile_extractions"] = extractions
 
@@ -0,0 +1,66 @@
+"""
+Local pre-filter for the worthiness check.
+
+Greetings, acknowledgements and other filler turns are never memory-worthy,
+so they are rejected here without an LLM round trip. Anything that is not
+plainly filler is left for the LLM to judge.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable
+
+# Messages with this many words or more always go to the LLM
+MAX_FILLER_WORDS = 4
+
+# Greetings, thanks and sign-offs only. Answers such as "yes", "nope" or "ok"
+# are left out on purpose: replying to an assistant question they can carry a
+# fact ("Any allergies?" -> "yes"), so they always go to the LLM.
+_FILLER_WORD = r"(?:hi|hello|hey|thanks|thank you|thx|ty|lol|haha|bye)"
+
+# One or more filler words, separated by whitespace or punctuation. Tickers,
+# digits and names can't match, since only these words are allowed.
+_FILLER_RE = re.compile(
+    rf"^{_FILLER_WORD}(?:[\s!.?,]+{_FILLER_WORD})*[!.?,]*$",
+    re.IGNORECASE,
+)
+
+# Result used in place of an LLM response for filler-only conversations
+DEFAULT_UNWORTHY: Dict[str, Any] = {
+    "worthy": False,
+    "confidence": 1.0,
+    "tags": [],
+    "reasons": ["filler"],
+    "emotional_intensity": 0.0,
+}
+
+
+def cheap_unworthy(text: str) -> bool:
+    """Return True if ``text`` is plainly filler (e.g. "hi", "thanks, bye!")."""
+    stripped = (text or "").strip()
+    if not stripped:
+        return True
+    if len(stripped.split()) >= MAX_FILLER_WORDS:
+        return False
+    return _FILLER_RE.match(stripped) is not None
+
+
+def history_is_filler(history: Iterable[Any]) -> bool:
+    """Return True if every user turn in ``history`` is filler.
+
+    Accepts Message objects or ``{"role", "content"}`` dicts. A history with no
+    user turns is not treated as filler; the LLM decides those.
+    """
+    saw_user = False
+    for message in history:
+        if isinstance(message, dict):
+            role, content = message.get("role"), message.get("content", "")
+        else:
+            role, content = message.role, message.content
+        if role != "user":
+            continue
+        saw_user = True
+        if not cheap_unworthy(content):
+            return False
+    return saw_user
@@ -58,6 +58,24 @@ class _RedisStub:
     def delete(self, key: str) -> None:
         self.values.pop(key, None)
 
+    def lock(self, key: str, timeout: int = 0, blocking: bool = True):
+        return _LockStub(self, key)
+
+
+class _LockStub:
+    def __init__(self, redis: _RedisStub, key: str) -> None:
+        self.redis = redis
+        self.key = key
+
+    def acquire(self) -> bool:
+        if self.key in self.redis.values:
+            return False
+        self.redis.values[self.key] = "1"
+        return True
+
+    def release(self) -> None:
+        self.redis.values.pop(self.key, None)
+
 
 def _prepare_app(monkeypatch: pytest.MonkeyPatch, redis_stub: _RedisStub):
     monkeypatch.setenv("LLM_PROVIDER", "openai")
@@ -116,6 +134,16 @@ def _prepare_app(monkeypatch: pytest.MonkeyPatch, redis_stub: _RedisStub):
     return app_module
 
 
+@pytest.fixture(autouse=True)
+def _clear_local_completeness_cache():
+    """The per-worker completeness cache is module-level; isolate each test."""
+    from src.services import profile_storage
+
+    profile_storage._local_completeness.clear()
+    yield
+    profile_storage._local_completeness.clear()
+
+
 @pytest.fixture
 def redis_stub() -> _RedisStub:
     return _RedisStub()
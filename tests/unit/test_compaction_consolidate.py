@@ -0,0 +1,153 @@
+"""Unit tests for the duplicate pre-filter ahead of LLM consolidation."""
+
+from unittest.mock import patch
+
+from src.services import compaction_graph
+from src.services.compaction_graph import DUPLICATE_SIMILARITY, _collapse_duplicates
+
+
+def _mem(mid, content, embedding=None):
+    return {"id": mid, "content": content, "embedding": embedding}
+
+
+def test_collapse_drops_exact_copies_after_normalization():
+    distinct, dropped = _collapse_duplicates(
+        [_mem("a", "User likes tea"), _mem("b", "  user LIKES   tea ")]
+    )
+
+    assert [m["id"] for m in distinct] == ["a"]
+    assert dropped == ["b"]
+
+
+def test_collapse_drops_near_copies_by_embedding():
+    distinct, dropped = _collapse_duplicates(
+        [
+            _mem("a", "User likes green tea", [1.0, 0.0]),
+            _mem("b", "User enjoys green tea", [1.0, 0.05]),
+            _mem("c", "User drinks coffee", [0.0, 1.0]),
+        ]
+    )
+
+    assert [m["id"] for m in distinct] == ["a", "c"]
+    assert dropped == ["b"]
+
+
+def test_collapse_keeps_related_but_distinct_members():
+    # cosine(a, b) is below the duplicate threshold
+    low = (1 - DUPLICATE_SIMILARITY**2) ** 0.5 * 1.5
+    distinct, dropped = _collapse_duplicates(
+        [
+            _mem("a", "User runs daily", [1.0, 0.0]),
+            _mem("b", "User ran a marathon", [1.0, low]),
+        ]
+    )
+
+    assert [m["id"] for m in distinct] == ["a", "b"]
+    assert dropped == []
+
+
+def test_consolidate_cluster_sends_compact_rows():
+    cluster = [
+        {
+            "id": "b",
+            "content": "User owns 200 shares",
+            "metadata": {"created_at": "2025-12-20T10:00:00Z"},
+        },
+        {
+            "id": "a",
+            "content": "User owns 100 shares",
+            "metadata": {"created_at": "2025-12-15T09:00:00Z"},
+        },
+        {"id": "c", "content": "User holds AAPL", "metadata": {}},
+    ]
+
+    with (
+        patch(
+            "src.services.extract_utils._call_llm_json",
+            return_value={"content": "User owns 200 shares of AAPL"},
+        ) as mock_llm,
+        patch.object(compaction_graph, "generate_embedding", return_value=[0.1]),
+    ):
+        result = compaction_graph._consolidate_cluster("u1", cluster)
+
+    prompt = mock_llm.call_args.args[0]
+    assert mock_llm.call_args.kwargs["response_format"]["json_schema"]["name"] == (
+        "ConsolidationResult"
+    )
+    assert (
+        "1|251215|User owns 100 shares\n"
+        "2|251220|User owns 200 shares\n"
+        "3|?|User holds AAPL"
+    ) in prompt
+    assert result["source_ids"] == ["b", "a", "c"]
+
+
+def test_consolidate_clusters_batches_into_one_call():
+    clusters = [
+        [
+            {"id": f"{c}{i}", "content": f"User fact {c}{i}", "metadata": {}}
+            for i in range(2)
+        ]
+        for c in "abc"
+    ]
+    reply = {
+        "results": [
+            {"index": 2, "content": "User merged c"},
+            {"index": 0, "content": "User merged a"},
+        ]
+    }
+
+    with (
+        patch(
+            "src.services.extract_utils._call_llm_json",
+            side_effect=[reply, {"content": "User merged b"}],
+        ) as mock_llm,
+        patch.object(compaction_graph, "generate_embedding", return_value=[0.1]),
+    ):
+        results = compaction_graph._consolidate_clusters("u1", clusters)
+
+    payload = mock_llm.call_args_list[0].args[1]
+    assert [c["index"] for c in payload["clusters"]] == [0, 1, 2]
+    assert payload["clusters"][1]["memories"] == "1|?|User fact b0\n2|?|User fact b1"
+    assert results[0]["memory"].content == "User merged a"
+    assert results[0]["source_ids"] == ["a0", "a1"]
+    # A cluster missing from the reply is merged on its own
+    assert mock_llm.call_count == 2
+    assert results[1]["memory"].content == "User merged b"
+    assert results[2]["memory"].content == "User merged c"
+
+
+def test_consolidate_clusters_rejects_bad_and_repeated_indexes():
+    clusters = [
+        [
+            {"id": f"{c}{i}", "content": f"User fact {c}{i}", "metadata": {}}
+            for i in range(2)
+        ]
+        for c in "abc"
+    ]
+    reply = {
+        "results": [
+            {"index": "x", "content": "User bogus"},
+            {"index": 0, "content": "User merged a"},
+            {"index": 7, "content": "User out of range"},
+            {"index": 1, "content": "User merged b"},
+            {"index": 1, "content": "User merged b again"},
+            {"index": 2, "content": "User merged c"},
+        ]
+    }
+
+    with (
+        patch(
+            "src.services.extract_utils._call_llm_json",
+            side_effect=[reply, {"content": "User merged b alone"}],
+        ) as mock_llm,
+        patch.object(compaction_graph, "generate_embedding", return_value=[0.1]),
+    ):
+        results = compaction_graph._consolidate_clusters("u1", clusters)
+
+    # A bad index doesn't drop the entries after it
+    assert results[0]["memory"].content == "User merged a"
+    assert results[2]["memory"].content == "User merged c"
+    # The repeated index is ambiguous, so that cluster is merged on its own
+    assert mock_llm.call_count == 2
+    assert results[1]["memory"].content == "User merged b alone"
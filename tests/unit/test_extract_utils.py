@@ -0,0 +1,125 @@
+"""Unit tests for the shared LLM JSON call helper."""
+
+from unittest.mock import MagicMock, patch
+
+
+def test_call_llm_json_sends_static_system_prompt_first():
+    """The system prompt leads the message list verbatim (prefix-cacheable)."""
+    from src.services.extract_utils import _call_llm_json
+
+    prompt = "static prompt"
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="[]"))
+    ]
+
+    with (
+        patch("src.services.extract_utils.get_llm_provider", return_value="openai"),
+        patch("src.services.extract_utils.get_openai_api_key", return_value="sk"),
+        patch("src.config.is_langfuse_enabled", return_value=False),
+        patch("openai.OpenAI", return_value=client),
+    ):
+        assert _call_llm_json(prompt, {"n": 1}, expect_array=True) == []
+        _call_llm_json(prompt, {"n": 2}, expect_array=True)
+
+    calls = client.chat.completions.create.call_args_list
+    for call, n in zip(calls, (1, 2)):
+        system, user = call.kwargs["messages"]
+        assert system == {"role": "system", "content": prompt}
+        assert user == {"role": "user", "content": f'{{"n":{n}}}'}
+
+
+def test_call_llm_json_passes_structured_output_schema():
+    """A strict json_schema format replaces the default JSON mode."""
+    from src.services.extract_utils import (
+        WORTHINESS_RESPONSE_FORMAT,
+        _call_llm_json,
+    )
+
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content='{"worthy": true}'))
+    ]
+
+    with (
+        patch("src.services.extract_utils.get_llm_provider", return_value="openai"),
+        patch("src.services.extract_utils.get_openai_api_key", return_value="sk"),
+        patch("src.config.is_langfuse_enabled", return_value=False),
+        patch("openai.OpenAI", return_value=client),
+    ):
+        assert _call_llm_json("p", {}, response_format=WORTHINESS_RESPONSE_FORMAT) == {
+            "worthy": True
+        }
+        _call_llm_json("p", {})
+
+    with_schema, default = client.chat.completions.create.call_args_list
+    assert with_schema.kwargs["response_format"] is WORTHINESS_RESPONSE_FORMAT
+    assert default.kwargs["response_format"] == {"type": "json_object"}
+
+    schema = WORTHINESS_RESPONSE_FORMAT["json_schema"]
+    assert schema["strict"] is True
+    assert schema["schema"]["additionalProperties"] is False
+    assert set(schema["schema"]["required"]) == {
+        "worthy",
+        "confidence",
+        "tags",
+        "reasons",
+        "emotional_intensity",
+    }
+
+
+def test_parse_json_from_text_handles_fences_and_prose():
+    """Fenced, wrapped and prose-embedded JSON all parse to the expected shape."""
+    from src.services.extract_utils import _parse_json_from_text
+
+    assert _parse_json_from_text('```json\n[{"a": 1}]\n```', True) == [{"a": 1}]
+    assert _parse_json_from_text('{"items": [1, 2]}', True) == [1, 2]
+    assert _parse_json_from_text('Sure! [{"a": 1}] Done.', True) == [{"a": 1}]
+    assert _parse_json_from_text('Result: {"k": "v"}', False) == {"k": "v"}
+    assert _parse_json_from_text("not json", True) == []
+    assert _parse_json_from_text("", False) == {}
+
+
+def test_warm_prompt_prefix_sends_single_token_call():
+    from src.services.extract_utils import warm_prompt_prefix
+
+    client = MagicMock()
+    with (
+        patch("src.services.extract_utils.get_llm_provider", return_value="openai"),
+        patch("src.services.extract_utils.get_openai_api_key", return_value="sk"),
+        patch("openai.OpenAI", return_value=client),
+    ):
+        assert warm_prompt_prefix("STATIC PROMPT") is True
+        client.chat.completions.create.side_effect = RuntimeError("down")
+        assert warm_prompt_prefix("STATIC PROMPT") is False
+
+    call = client.chat.completions.create.call_args_list[0]
+    assert call.kwargs["max_tokens"] == 1
+    assert call.kwargs["messages"][0] == {"role": "system", "content": "STATIC PROMPT"}
+
+
+def test_warm_up_and_live_calls_share_client_setup():
+    from src.services.extract_utils import _call_llm_json, warm_prompt_prefix
+
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="{}"))
+    ]
+    with (
+        patch("src.services.extract_utils.get_llm_provider", return_value="xai"),
+        patch("src.services.extract_utils.get_xai_api_key", return_value="xk"),
+        patch(
+            "src.services.extract_utils.get_xai_base_url",
+            return_value="https://llm.example/v1",
+        ),
+        patch("src.config.is_langfuse_enabled", return_value=False),
+        patch("openai.OpenAI", return_value=client) as mock_openai,
+    ):
+        warm_prompt_prefix("P")
+        _call_llm_json("P", {})
+
+    warm_init, live_init = mock_openai.call_args_list
+    assert warm_init == live_init
+    assert live_init.kwargs["base_url"] == "https://llm.example/v1"
+    warm_call, live_call = client.chat.completions.create.call_args_list
+    assert warm_call.kwargs["model"] == live_call.kwargs["model"]
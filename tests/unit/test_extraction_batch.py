@@ -0,0 +1,148 @@
+"""Unit tests for batched memory extraction (graph_extraction/extraction)."""
+
+from unittest.mock import patch
+
+from src.schemas import Message, TranscriptRequest
+from src.services import graph_extraction
+from src.services.prompts_v3 import BATCH_EXTRACTION_SYSTEM_V3
+
+
+def _request(content: str, role: str = "user") -> TranscriptRequest:
+    return TranscriptRequest(
+        user_id="u1", history=[Message(role=role, content=content)]
+    )
+
+
+def test_run_extraction_batch_groups_requests_and_maps_by_index():
+    requests = [_request(f"fact {i}") for i in range(10)]
+    calls = []
+
+    def fake_llm(prompt, payload, **kwargs):
+        calls.append((prompt, payload))
+        inputs = payload["inputs"]
+        # Answer out of order, skip one input and include a bogus index
+        results = [
+            {
+                "index": item["index"],
+                "memories": [{"content": item["history"][0]["content"]}],
+            }
+            for item in reversed(inputs[1:])
+        ]
+        results.append({"index": 99, "memories": [{"content": "bogus"}]})
+        return {"results": results}
+
+    with (
+        patch.object(
+            graph_extraction, "get_relevant_existing_memories", return_value=[]
+        ),
+        patch.object(graph_extraction, "_call_llm_json", side_effect=fake_llm),
+    ):
+        states = graph_extraction.run_extraction_batch(requests)
+
+    assert [len(p["inputs"]) for _, p in calls] == [
+        graph_extraction.EXTRACTION_BATCH_SIZE,
+        10 - graph_extraction.EXTRACTION_BATCH_SIZE,
+    ]
+    assert all(prompt is BATCH_EXTRACTION_SYSTEM_V3 for prompt, _ in calls)
+    # The first input of each group was left out of the response
+    assert states[0]["items"] == []
+    assert states[8]["items"] == []
+    assert states[1]["items"] == [{"content": "fact 1"}]
+    assert states[9]["items"] == [{"content": "fact 9"}]
+    assert [s["validated"] for s in states[:2]] == [False, True]
+
+
+def test_run_extraction_batch_tolerates_llm_failure():
+    with (
+        patch.object(
+            graph_extraction, "get_relevant_existing_memories", return_value=[]
+        ),
+        patch.object(graph_extraction, "_call_llm_json", return_value=None),
+    ):
+        states = graph_extraction.run_extraction_batch([_request("hi")])
+
+    assert states[0]["items"] == []
+
+
+def test_extract_from_transcripts_keeps_request_order():
+    from src.services import extraction
+
+    requests = [_request("I love tea"), _request("hello", role="assistant")]
+    states = [
+        {
+            "items": [{"content": "User loves tea."}],
+            "existing_memories": [],
+            "validated": True,
+        }
+    ]
+
+    with (
+        patch.object(extraction, "run_extraction_batch", return_value=states) as batch,
+        patch.object(extraction, "generate_embedding", return_value=[0.0]),
+    ):
+        results = extraction.extract_from_transcripts(requests)
+
+    # Only the request with a user turn goes to the LLM
+    batch.assert_called_once_with([requests[0]])
+    assert [m.content for m in results[0].memories] == ["User loves tea."]
+    assert results[1].memories == []
+
+
+def test_run_extraction_batch_rejects_duplicate_indexes():
+    reply = {
+        "results": [
+            {"index": 0, "memories": [{"content": "User likes tea."}]},
+            {"index": 1, "memories": [{"content": "User runs."}]},
+            {"index": 1, "memories": [{"content": "User likes tea."}]},
+            {"index": True, "memories": [{"content": "bogus"}]},
+        ]
+    }
+    with (
+        patch.object(
+            graph_extraction, "get_relevant_existing_memories", return_value=[]
+        ),
+        patch.object(graph_extraction, "_call_llm_json", return_value=reply) as llm,
+    ):
+        states = graph_extraction.run_extraction_batch(
+            [_request("I like tea"), _request("I run")]
+        )
+
+    # No separate worthiness call: the batched prompt alone decides
+    assert llm.call_count == 1
+    assert llm.call_args.args[0] is BATCH_EXTRACTION_SYSTEM_V3
+    assert states[0]["items"] == [{"content": "User likes tea."}]
+    assert states[0]["validated"] is True
+    # An index answered twice is ambiguous, so neither answer is used
+    assert states[1]["items"] == []
+    assert states[1]["validated"] is False
+
+
+def test_reextract_only_deletes_sources_with_their_own_output():
+    from src.services import compaction_graph, extraction
+
+    candidates = [
+        {"id": "m0", "content": "I like tea"},
+        {"id": "m1", "content": "I run"},
+    ]
+    states = [
+        {
+            "items": [{"content": "User likes tea."}],
+            "existing_memories": [],
+            "validated": True,
+        },
+        # Rejected entry: whatever items it carries must not replace m1
+        {
+            "items": [{"content": "User likes tea."}],
+            "existing_memories": [],
+            "validated": False,
+        },
+    ]
+
+    with (
+        patch.object(extraction, "run_extraction_batch", return_value=states),
+        patch.object(extraction, "generate_embedding", return_value=[0.0]),
+    ):
+        out = compaction_graph._reextract_memories("u1", candidates)
+
+    assert out["delete_ids"] == ["m0"]
+    assert [m.content for m in out["new_memories"]] == ["User likes tea."]
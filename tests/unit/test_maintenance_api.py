@@ -0,0 +1,81 @@
+"""Maintenance endpoints hand compaction to a background task."""
+
+
+def test_compact_all_schedules_each_user(api_client, redis_stub, monkeypatch):
+    redis_stub.sets["all_users"] = {"u2", "u1"}
+    compacted = []
+    monkeypatch.setattr(
+        "src.app.run_compaction_for_user",
+        lambda uid: compacted.append(uid) or {"user_id": uid},
+    )
+
+    response = api_client.post("/v1/maintenance/compact_all")
+
+    assert response.status_code == 200
+    assert response.json()["jobs_started"] == ["compaction_all"]
+    # TestClient drains background tasks before returning
+    assert compacted == ["u1", "u2"]
+
+
+def test_maintenance_trigger_swallows_compaction_errors(api_client, monkeypatch):
+    def _boom():
+        raise RuntimeError("redis down")
+
+    monkeypatch.setattr("src.app._run_daily_compaction", _boom)
+
+    response = api_client.post("/v1/maintenance", json={"jobs": ["compaction"]})
+
+    assert response.status_code == 200
+    assert response.json()["jobs_started"] == ["compaction"]
+    assert response.json()["status"] == "running"
+
+
+def test_compact_all_skips_users_already_being_compacted(
+    api_client, redis_stub, monkeypatch
+):
+    redis_stub.sets["all_users"] = {"u1", "u2"}
+    redis_stub.values["compaction_lock:user:u1"] = "1"
+    compacted = []
+    monkeypatch.setattr(
+        "src.app.run_compaction_for_user",
+        lambda uid: compacted.append(uid) or {"user_id": uid},
+    )
+
+    api_client.post("/v1/maintenance/compact_all")
+
+    assert compacted == ["u2"]
+    # The lock taken for u2 is released once its run finishes
+    assert "compaction_lock:user:u2" not in redis_stub.values
+
+
+def test_compact_single_user_skips_when_user_lock_held(
+    api_client, redis_stub, monkeypatch
+):
+    redis_stub.values["compaction_lock:user:u1"] = "1"
+    compacted = []
+    monkeypatch.setattr(
+        "src.app.run_compaction_for_user",
+        lambda uid, **kwargs: compacted.append(uid) or {"user_id": uid},
+    )
+
+    response = api_client.post("/v1/maintenance/compact", params={"user_id": "u1"})
+
+    assert response.json()["status"] == "skipped"
+    assert compacted == []
+
+
+def test_compact_single_user_runs_under_user_lock(api_client, redis_stub, monkeypatch):
+    held = []
+
+    def _run(uid, **kwargs):
+        held.append("compaction_lock:user:u1" in redis_stub.values)
+        return {"user_id": uid}
+
+    monkeypatch.setattr("src.app.run_compaction_for_user", _run)
+
+    response = api_client.post("/v1/maintenance/compact", params={"user_id": "u1"})
+
+    assert response.json()["status"] == "completed"
+    assert response.json()["stats"] == {"user_id": "u1"}
+    assert held == [True]
+    assert "compaction_lock:user:u1" not in redis_stub.values
@@ -0,0 +1,89 @@
+"""Unit tests for extraction context retrieval and prompt budgets in
+src/services/memory_context.py."""
+
+from unittest.mock import patch
+
+from src.schemas import Message, TranscriptRequest
+from src.services.memory_context import (
+    APPROX_CHARS_PER_TOKEN,
+    format_memories_for_llm_context,
+    get_relevant_existing_memories,
+    trim_history_to_budget,
+)
+
+
+def _msg(content: str):
+    return {"role": "user", "content": content}
+
+
+def test_trim_history_keeps_newest_turns_within_budget():
+    history = [_msg("a" * 40), _msg("b" * 20), _msg("c" * 16)]
+
+    # 10 tokens ~ 40 chars: the two newest messages fit, the oldest is dropped
+    assert trim_history_to_budget(history, 10) == history[1:]
+    assert trim_history_to_budget(history, 0) is history
+
+
+def test_trim_history_cuts_oversized_latest_message_to_its_tail():
+    history = [_msg("old"), _msg("x" * 10 + "y" * APPROX_CHARS_PER_TOKEN)]
+
+    trimmed = trim_history_to_budget(history, 1)
+
+    assert trimmed == [_msg("y" * APPROX_CHARS_PER_TOKEN)]
+    # The caller's message dict is not mutated
+    assert history[1]["content"].startswith("x")
+
+
+def test_format_memories_drops_least_relevant_past_budget():
+    memories = [
+        {"content": "User likes tea", "metadata": {"layer": "semantic"}},
+        {"content": "User likes " + "coffee " * 50, "metadata": {}},
+    ]
+
+    capped = format_memories_for_llm_context(memories, max_tokens=30)
+    full = format_memories_for_llm_context(memories)
+
+    assert "User likes tea" in capped
+    assert "coffee" not in capped
+    assert "coffee" in full
+
+
+def test_relevant_memories_use_one_search_over_recent_user_turns():
+    request = TranscriptRequest(
+        user_id="u1",
+        history=[
+            Message(role="user", content="I love tea"),
+            Message(role="assistant", content="Nice!"),
+            Message(role="user", content="Especially green tea"),
+        ],
+    )
+    hits = [
+        {"id": "a", "content": "x", "score": 0.1},
+        {"id": "b", "content": "y", "score": 0.9},
+        {"id": "c", "content": "z", "score": 0.5},
+    ]
+
+    with patch(
+        "src.services.memory_context.search_memories", return_value=(hits, 3)
+    ) as mock_search:
+        result = get_relevant_existing_memories(request, max_memories=10)
+
+    mock_search.assert_called_once_with(
+        user_id="u1",
+        query="I love tea\nEspecially green tea",
+        filters={},
+        limit=10,
+        offset=0,
+    )
+    assert [m["id"] for m in result] == ["b", "c"]
+
+
+def test_relevant_memories_skip_search_without_user_turns():
+    request = TranscriptRequest(
+        user_id="u1", history=[Message(role="assistant", content="Hello")]
+    )
+
+    with patch("src.services.memory_context.search_memories") as mock_search:
+        assert get_relevant_existing_memories(request) == []
+
+    mock_search.assert_not_called()
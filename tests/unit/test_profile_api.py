@@ -50,7 +50,7 @@ class _MockConnection:
     def __init__(self, cursor=None):
         self._cursor = cursor or _MockCursor()
 
-    def cursor(self):
+    def cursor(self, row_factory=None):
         return self._cursor
 
     def commit(self):
@@ -321,15 +321,10 @@ def test_delete_profile_field_success(api_client, mock_db_conn, monkeypatch):
     """Test successful single field deletion"""
     conn, cursor = mock_db_conn
 
-    # Mock: profile exists, field exists, then remaining fields after delete
+    # Mock: profile exists, field exists
     # fetchone calls: 1) profile exists check, 2) field exists check
-    # fetchall call: for _update_profile_metadata to get remaining fields
     cursor.results = [("test-user-123",), ("name",)]
 
-    # Override fetchall to return empty list (no remaining fields after deletion)
-    _original_fetchall = cursor.fetchall
-    cursor.fetchall = lambda: []
-
     def mock_get_conn():
         return conn
 
@@ -349,6 +344,12 @@ def test_delete_profile_field_success(api_client, mock_db_conn, monkeypatch):
     assert data["category"] == "basics"
     assert data["field_name"] == "name"
 
+    # Metadata is recomputed in one UPDATE against the baseline arrays
+    metadata_sql, params = cursor.queries[-1]
+    assert "UPDATE user_profiles" in metadata_sql
+    assert len(params["expected_categories"]) == params["total"]
+    assert len(params["expected_field_names"]) == params["total"]
+
 
 def test_delete_profile_field_invalid_category(api_client, monkeypatch):
     """Test 400 for invalid category in field delete"""
@@ -510,18 +511,6 @@ def test_get_completeness_not_found(api_client, mock_db_conn, monkeypatch):
 
 
 # Test helper functions
-def test_infer_value_type():
-    """Test value type inference"""
-    from src.routers.profile import _infer_value_type
-
-    assert _infer_value_type(True) == "bool"
-    assert _infer_value_type(42) == "int"
-    assert _infer_value_type(3.14) == "float"
-    assert _infer_value_type([1, 2, 3]) == "list"
-    assert _infer_value_type({"key": "value"}) == "dict"
-    assert _infer_value_type("hello") == "string"
-
-
 def test_serialize_field_value():
     """Test field value serialization"""
     from src.routers.profile import _serialize_field_value
@@ -529,9 +518,9 @@ def test_serialize_field_value():
     assert _serialize_field_value(True) == "true"
     assert _serialize_field_value(False) == "false"
     assert _serialize_field_value(42) == "42"
-    assert _serialize_field_value([1, 2, 3]) == "[1, 2, 3]"
-    assert _serialize_field_value({"key": "value"}) == '{"key": "value"}'
-    assert _serialize_field_value("hello") == "hello"
+    assert _serialize_field_value([1, 2, 3]) == "[1,2,3]"
+    assert _serialize_field_value({"key": "value"}) == '{"key":"value"}'
+    assert _serialize_field_value("hello") == '"hello"'
 
 
 # Tests for raw-value response shape and include_metadata flag
@@ -727,6 +716,411 @@ def test_extractor_does_not_unwrap_non_string_types():
     assert out[0]["field_value"] == ["3d printing", "NAS"]
 
 
+def test_extractor_dedup_merges_arrays_and_keeps_best_scalar():
+    """Duplicates merge array values case-insensitively; scalars keep max confidence."""
+    from src.services.profile_extraction import ProfileExtractor
+
+    svc = ProfileExtractor.__new__(ProfileExtractor)
+    out = svc._deduplicate_extractions(
+        [
+            {
+                "category": "interests",
+                "field_name": "hobbies",
+                "field_value": "Hiking",
+                "confidence": 60,
+            },
+            {
+                "category": "basics",
+                "field_name": "location",
+                "field_value": "SF",
+                "confidence": 80,
+            },
+            {
+                "category": "interests",
+                "field_name": "hobbies",
+                "field_value": ["hiking", "chess"],
+                "confidence": 90,
+            },
+            {
+                "category": "basics",
+                "field_name": "location",
+                "field_value": "NYC",
+                "confidence": 95,
+            },
+            {
+                "category": "basics",
+                "field_name": "location",
+                "field_value": "LA",
+                "confidence": 95,
+            },
+        ]
+    )
+    assert len(out) == 2
+    hobbies, location = out
+    assert hobbies["field_value"] == ["Hiking", "chess"]
+    assert hobbies["confidence"] == 90
+    assert location["field_value"] == "NYC"
+
+
+def test_extractor_coerces_confidence():
+    """Confidence is clamped to 0-100 and falls back to 70 when unparseable."""
+    from src.services.profile_extraction import ProfileExtractor
+
+    svc = ProfileExtractor.__new__(ProfileExtractor)
+    base = {"category": "basics", "field_name": "name", "field_value": "Ana"}
+    out = svc._validate_extractions(
+        [
+            {**base, "confidence": 150},
+            {**base, "confidence": -5},
+            {**base, "confidence": "85"},
+            {**base, "confidence": "high"},
+            base,
+        ],
+        user_id="u1",
+    )
+    assert [e["confidence"] for e in out] == [100, 0, 85, 70, 70]
+
+
+def test_extractor_skips_llm_for_blank_memories():
+    """A batch with no non-blank content never reaches the LLM."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    memories = [
+        Memory(user_id="u1", content="   ", layer="semantic", type="explicit"),
+        Memory(user_id="u1", content="", layer="semantic", type="explicit"),
+    ]
+    with patch("src.services.profile_extraction._call_llm_json") as mock_llm:
+        out = ProfileExtractor().extract_from_memories("u1", memories)
+    assert out == []
+    mock_llm.assert_not_called()
+
+
+def test_extractor_honours_profile_eligible_flag():
+    """Memories flagged profile_eligible=False at write time are not sent."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    memories = [
+        Memory(
+            id="mem_skip",
+            user_id="u1",
+            content="Buy milk",
+            layer="short-term",
+            type="explicit",
+            metadata={"profile_eligible": False},
+        ),
+        Memory(
+            id="mem_keep",
+            user_id="u1",
+            content="I live in Denver",
+            layer="semantic",
+            type="explicit",
+        ),
+    ]
+    with patch(
+        "src.services.profile_extraction._call_llm_json", return_value=[]
+    ) as mock_llm:
+        ProfileExtractor().extract_from_memories("u1", memories)
+    sent = mock_llm.call_args.args[1]["memories"]
+    assert [m["id"] for m in sent] == ["mem_keep"]
+
+
+def test_extractor_batches_large_memory_lists():
+    """Large inputs are split into batches whose extractions are merged."""
+    from src.models import Memory
+    from src.services import profile_extraction
+    from src.services.profile_extraction import ProfileExtractor
+
+    size = profile_extraction.PROFILE_EXTRACTION_BATCH_SIZE
+    memories = [
+        Memory(
+            id=f"mem_{i}",
+            user_id="u1",
+            content=f"fact {i}",
+            layer="semantic",
+            type="explicit",
+        )
+        for i in range(size * 2 + 1)
+    ]
+
+    def fake_llm(prompt, payload, expect_array):
+        first_id = payload["memories"][0]["id"]
+        return [
+            {
+                "category": "interests",
+                "field_name": "hobbies",
+                "field_value": [first_id],
+                "confidence": 80,
+                "source_memory_id": first_id,
+            }
+        ]
+
+    with patch(
+        "src.services.profile_extraction._call_llm_json", side_effect=fake_llm
+    ) as mock_llm:
+        out = ProfileExtractor().extract_from_memories("u1", memories)
+
+    assert mock_llm.call_count == 3
+    assert len(out) == 1
+    assert out[0]["field_value"] == ["mem_0", f"mem_{size}", f"mem_{size * 2}"]
+
+
+def test_extractor_sends_duplicate_contents_once():
+    """Identical memory contents are sent to the LLM only once."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    memories = [
+        Memory(
+            id=f"mem_{i}",
+            user_id="u1",
+            content=content,
+            layer="semantic",
+            type="explicit",
+        )
+        for i, content in enumerate(
+            ["I'm a software engineer", "i'm a software engineer ", "I live in Denver"]
+        )
+    ]
+    with patch(
+        "src.services.profile_extraction._call_llm_json", return_value=[]
+    ) as mock_llm:
+        ProfileExtractor().extract_from_memories("u1", memories)
+    sent = mock_llm.call_args.args[1]["memories"]
+    assert [m["id"] for m in sent] == ["mem_0", "mem_2"]
+
+
+def test_extractor_batch_packs_users_into_one_call():
+    """Several users share one LLM call and results are split per user."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    def mem(user_id, content):
+        return Memory(
+            id=f"mem_{user_id}",
+            user_id=user_id,
+            content=content,
+            layer="semantic",
+            type="explicit",
+        )
+
+    response = {
+        "alice": [
+            {
+                "category": "basics",
+                "field_name": "location",
+                "field_value": "Denver",
+                "confidence": 90,
+                "source_memory_id": "mem_alice",
+            }
+        ],
+        "bob": [],
+    }
+    with patch(
+        "src.services.profile_extraction._call_llm_json", return_value=response
+    ) as mock_llm:
+        out = ProfileExtractor().extract_from_memories_batch(
+            {
+                "alice": [mem("alice", "I live in Denver")],
+                "bob": [mem("bob", "Buy milk")],
+                "carol": [],
+            }
+        )
+
+    assert mock_llm.call_count == 1
+    sent = mock_llm.call_args.args[1]["users"]
+    assert [u["user_id"] for u in sent] == ["alice", "bob"]
+    assert [e["field_value"] for e in out["alice"]] == ["Denver"]
+    assert out["bob"] == []
+    assert out["carol"] == []
+
+
+def test_extractor_batch_isolates_a_failing_user():
+    """A user whose extractions fail to finalize doesn't cost the rest of the group."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    def mem(user_id, content):
+        return Memory(
+            id=f"mem_{user_id}",
+            user_id=user_id,
+            content=content,
+            layer="semantic",
+            type="explicit",
+        )
+
+    def entry(user_id, value):
+        return {
+            "category": "basics",
+            "field_name": "location",
+            "field_value": value,
+            "confidence": 90,
+            "source_memory_id": f"mem_{user_id}",
+        }
+
+    extractor = ProfileExtractor()
+    finalize = extractor._finalize_extractions
+
+    def flaky_finalize(user_id, extractions):
+        if user_id == "alice":
+            raise TypeError("malformed item")
+        return finalize(user_id, extractions)
+
+    response = {"alice": [entry("alice", "Denver")], "bob": [entry("bob", "Austin")]}
+    with (
+        patch("src.services.profile_extraction._call_llm_json", return_value=response),
+        patch.object(extractor, "_finalize_extractions", side_effect=flaky_finalize),
+    ):
+        out = extractor.extract_from_memories_batch(
+            {
+                "alice": [mem("alice", "I live in Denver")],
+                "bob": [mem("bob", "I live in Austin")],
+            }
+        )
+
+    assert out["alice"] == []
+    assert [e["field_value"] for e in out["bob"]] == ["Austin"]
+
+
+def test_extractor_reuses_cached_extractions():
+    """An identical request is served from the extraction cache."""
+    from unittest.mock import MagicMock
+
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    store = {}
+    mock_redis = MagicMock()
+    mock_redis.get.side_effect = store.get
+    mock_redis.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    memories = [
+        Memory(
+            id="mem_1",
+            user_id="u1",
+            content="I live in Denver",
+            layer="semantic",
+            type="explicit",
+        )
+    ]
+    raw = [
+        {
+            "category": "basics",
+            "field_name": "location",
+            "field_value": "Denver",
+            "confidence": 90,
+            "source_memory_id": "mem_1",
+        }
+    ]
+    with patch(
+        "src.services.profile_extraction.get_redis_client", return_value=mock_redis
+    ):
+        with patch(
+            "src.services.profile_extraction._call_llm_json", return_value=raw
+        ) as mock_llm:
+            first = ProfileExtractor().extract_from_memories("u1", memories)
+            second = ProfileExtractor().extract_from_memories("u1", memories)
+
+    assert mock_llm.call_count == 1
+    assert [e["field_value"] for e in first] == ["Denver"]
+    assert [e["field_value"] for e in second] == ["Denver"]
+
+
+def test_extractor_truncates_oversized_memories():
+    """Memory content over the cap is truncated in the LLM payload."""
+    from src.models import Memory
+    from src.services import profile_extraction
+    from src.services.profile_extraction import ProfileExtractor
+
+    limit = profile_extraction.PROFILE_EXTRACTION_MAX_MEMORY_CHARS
+    memories = [
+        Memory(
+            id="mem_1",
+            user_id="u1",
+            content="x" * (limit + 500),
+            layer="semantic",
+            type="explicit",
+        )
+    ]
+    with patch(
+        "src.services.profile_extraction._call_llm_json", return_value=[]
+    ) as mock_llm:
+        ProfileExtractor().extract_from_memories("u1", memories)
+    content = mock_llm.call_args.args[1]["memories"][0]["content"]
+    assert content == "x" * limit + "…[truncated]"
+
+
+def test_extractor_extract_many_runs_each_user():
+    """extract_many returns per-user results for every requested user."""
+    import asyncio
+
+    from src.services.profile_extraction import ProfileExtractor
+
+    svc = ProfileExtractor()
+    with patch.object(
+        svc,
+        "extract_from_memories",
+        side_effect=lambda user_id, memories: [{"user": user_id}],
+    ) as mock_extract:
+        out = asyncio.run(svc.extract_many({"a": [], "b": []}, max_concurrency=1))
+
+    assert out == {"a": [{"user": "a"}], "b": [{"user": "b"}]}
+    assert mock_extract.call_count == 2
+
+
+def test_extractor_prefilter_drops_non_profile_memories_when_enabled():
+    """With the opt-in prefilter, memories without profile hints are skipped."""
+    from src.models import Memory
+    from src.services.profile_extraction import ProfileExtractor
+
+    memories = [
+        Memory(
+            id=f"mem_{i}", user_id="u1", content=c, layer="semantic", type="explicit"
+        )
+        for i, c in enumerate(["ok", "thanks", "sounds good", "I live in Denver"])
+    ]
+    with (
+        patch(
+            "src.services.profile_extraction.get_profile_extraction_prefilter_enabled",
+            return_value=True,
+        ),
+        patch(
+            "src.services.profile_extraction._call_llm_json", return_value=[]
+        ) as mock_llm,
+    ):
+        ProfileExtractor().extract_from_memories("u1", memories)
+    sent = mock_llm.call_args.args[1]["memories"]
+    assert [m["id"] for m in sent] == ["mem_3"]
+
+
+def test_extractor_batches_by_content_budget():
+    """Batches also close when their content would exceed the char budget."""
+    from src.models import Memory
+    from src.services import profile_extraction
+    from src.services.profile_extraction import ProfileExtractor
+
+    memories = [
+        Memory(
+            id=f"mem_{i}",
+            user_id="u1",
+            content=f"{i}" + "x" * 1500,
+            layer="semantic",
+            type="explicit",
+        )
+        for i in range(4)
+    ]
+    with (
+        patch.object(profile_extraction, "PROFILE_EXTRACTION_BATCH_CHAR_BUDGET", 3200),
+        patch(
+            "src.services.profile_extraction._call_llm_json", return_value=[]
+        ) as mock_llm,
+    ):
+        ProfileExtractor().extract_from_memories("u1", memories)
+
+    sizes = sorted(len(c.args[1]["memories"]) for c in mock_llm.call_args_list)
+    assert sizes == [2, 2]
+
+
 # Integration-style test (requires actual DB - mark as skipif no DB)
 @pytest.mark.skipif(True, reason="Requires actual database connection")
 def test_full_crud_cycle_integration():
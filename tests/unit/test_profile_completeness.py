@@ -117,7 +117,7 @@ class _MockCursor:
         self._fetchone_result = fetchone_result
         self.queries = []
 
-    def execute(self, query, params=None):
+    def execute(self, query, params=None, prepare=None):
         self.queries.append((query, params))
 
     def fetchone(self):
@@ -136,7 +136,7 @@ class _MockConnection:
     def __init__(self, cursor=None):
         self._cursor = cursor or _MockCursor()
 
-    def cursor(self):
+    def cursor(self, row_factory=None):
         return self._cursor
 
     def commit(self):
@@ -156,11 +156,8 @@ def test_completeness_calculation_empty_profile():
 
     service = ProfileStorageService()
 
-    # Mock cursor with no profile fields
-    mock_cursor = _MockCursor(
-        fetchone_result=(0.0, 0, TOTAL_EXPECTED_FIELDS),  # profile exists but empty
-        results=[],  # no fields
-    )
+    # Mock cursor: profile exists but has no fields or confidences
+    mock_cursor = _MockCursor(fetchone_result=(None, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -189,36 +186,14 @@ def test_completeness_calculation_partial_profile():
 
     # Mock profile with some fields populated (using new canonical field names)
     # 10 fields that match EXPECTED_PROFILE_FIELDS
-    mock_cursor = _MockCursor(
-        fetchone_result=(37.0, 10, TOTAL_EXPECTED_FIELDS),  # profile metadata
-        results=[],
-    )
-
-    # We need to handle multiple fetchall calls
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        if call_count[0] == 1:
-            # profile_fields query - use fields from EXPECTED_PROFILE_FIELDS
-            return [
-                ("basics", "name"),
-                ("basics", "birthday"),
-                ("basics", "location"),
-                ("preferences", "communication_style"),
-                ("preferences", "food_preferences"),
-                ("goals", "short_term"),
-                ("interests", "hobbies"),
-                ("interests", "learning_areas"),
-                ("background", "skills"),
-                ("background", "current_employer"),
-            ]
-        elif call_count[0] == 2:
-            # confidence_scores query
-            return []
-        return []
-
-    mock_cursor.fetchall = mock_fetchall
+    fields = {
+        "basics": ["name", "birthday", "location"],
+        "preferences": ["communication_style", "food_preferences"],
+        "goals": ["short_term"],
+        "interests": ["hobbies", "learning_areas"],
+        "background": ["skills", "current_employer"],
+    }
+    mock_cursor = _MockCursor(fetchone_result=(fields, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -244,35 +219,22 @@ def test_completeness_calculation_partial_profile():
     assert result["categories"]["basics"]["total"] == 5
     assert result["categories"]["preferences"]["populated"] == 2
 
+    # Metadata, fields and confidences come back in one round-trip
+    assert len(mock_cursor.queries) == 1
+
 
 def test_completeness_category_breakdown():
     """Test per-category completeness breakdown (AC1)"""
     from src.services.profile_storage import (
         ProfileStorageService,
-        TOTAL_EXPECTED_FIELDS,
     )
 
     service = ProfileStorageService()
 
     # Mock profile with full basics, empty goals
-    mock_cursor = _MockCursor(fetchone_result=(21.7, 5, TOTAL_EXPECTED_FIELDS))
-
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        if call_count[0] == 1:
-            # All 5 basics fields from EXPECTED_PROFILE_FIELDS
-            return [
-                ("basics", "name"),
-                ("basics", "birthday"),
-                ("basics", "location"),
-                ("basics", "occupation"),
-                ("basics", "family_status"),
-            ]
-        return []
-
-    mock_cursor.fetchall = mock_fetchall
+    # All 5 basics fields from EXPECTED_PROFILE_FIELDS
+    fields = {"basics": ["name", "birthday", "location", "occupation", "family_status"]}
+    mock_cursor = _MockCursor(fetchone_result=(fields, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -299,22 +261,11 @@ def test_completeness_missing_fields():
     """Test missing fields are correctly identified (AC1)"""
     from src.services.profile_storage import (
         ProfileStorageService,
-        TOTAL_EXPECTED_FIELDS,
     )
 
     service = ProfileStorageService()
 
-    mock_cursor = _MockCursor(fetchone_result=(4.3, 1, TOTAL_EXPECTED_FIELDS))
-
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        if call_count[0] == 1:
-            return [("basics", "name")]
-        return []
-
-    mock_cursor.fetchall = mock_fetchall
+    mock_cursor = _MockCursor(fetchone_result=({"basics": ["name"]}, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -340,20 +291,12 @@ def test_high_value_gaps_basics_priority():
     """Test basics fields have highest priority in gaps (AC3)"""
     from src.services.profile_storage import (
         ProfileStorageService,
-        TOTAL_EXPECTED_FIELDS,
     )
 
     service = ProfileStorageService()
 
-    mock_cursor = _MockCursor(fetchone_result=(0.0, 0, TOTAL_EXPECTED_FIELDS))
-
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        return []  # No fields populated
-
-    mock_cursor.fetchall = mock_fetchall
+    # No fields populated
+    mock_cursor = _MockCursor(fetchone_result=(None, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -379,20 +322,11 @@ def test_high_value_gaps_limit():
     """Test high-value gaps are limited to 10 items (AC3)"""
     from src.services.profile_storage import (
         ProfileStorageService,
-        TOTAL_EXPECTED_FIELDS,
     )
 
     service = ProfileStorageService()
 
-    mock_cursor = _MockCursor(fetchone_result=(0.0, 0, TOTAL_EXPECTED_FIELDS))
-
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        return []
-
-    mock_cursor.fetchall = mock_fetchall
+    mock_cursor = _MockCursor(fetchone_result=(None, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -446,17 +380,7 @@ def test_completeness_cache_miss():
     mock_redis = MagicMock()
     mock_redis.get.return_value = None  # Cache miss
 
-    mock_cursor = _MockCursor(fetchone_result=(20.0, 5, 25))
-
-    call_count = [0]
-
-    def mock_fetchall():
-        call_count[0] += 1
-        if call_count[0] == 1:
-            return [("basics", "name")]
-        return []
-
-    mock_cursor.fetchall = mock_fetchall
+    mock_cursor = _MockCursor(fetchone_result=({"basics": ["name"]}, None))
     mock_conn = _MockConnection(cursor=mock_cursor)
 
     with patch(
@@ -471,6 +395,57 @@ def test_completeness_cache_miss():
     assert result is not None
     # Should have cached the result
     mock_redis.setex.assert_called_once()
+    _, _, payload = mock_redis.setex.call_args[0]
+    cached = json.loads(payload)
+    assert cached["cached_at"].endswith("+00:00")
+    assert cached["populated_fields"] == result["populated_fields"]
+
+
+def test_completeness_local_cache_skips_redis_on_repeat_calls():
+    """Repeat calls within the local TTL are served in-process"""
+    from src.services.profile_storage import ProfileStorageService
+
+    service = ProfileStorageService()
+
+    mock_redis = MagicMock()
+    mock_redis.get.return_value = json.dumps({"populated_fields": 3})
+
+    with patch(
+        "src.services.profile_storage.get_redis_client", return_value=mock_redis
+    ):
+        first = service.get_completeness_details("test-user")
+        first.pop("populated_fields")
+        second = service.get_completeness_details("test-user")
+
+    assert second == {"populated_fields": 3}
+    mock_redis.get.assert_called_once()
+
+
+def test_completeness_local_cache_expires_and_evicts():
+    """Local entries lapse after their TTL and are dropped on invalidation"""
+    from src.services import profile_storage
+    from src.services.profile_storage import (
+        LOCAL_COMPLETENESS_TTL,
+        ProfileStorageService,
+    )
+
+    service = ProfileStorageService()
+
+    with patch.object(profile_storage.time, "monotonic", return_value=100.0):
+        service._set_local_completeness("test-user", {"populated_fields": 3})
+        assert service._get_local_completeness("test-user") is not None
+
+    with patch.object(
+        profile_storage.time,
+        "monotonic",
+        return_value=100.0 + LOCAL_COMPLETENESS_TTL,
+    ):
+        assert service._get_local_completeness("test-user") is None
+
+    service._set_local_completeness("test-user", {"populated_fields": 3})
+    with patch("src.services.profile_storage.get_redis_client", return_value=None):
+        service.invalidate_many(["test-user"])
+    assert service._get_local_completeness("test-user") is None
 
 
 def test_completeness_cache_ttl():
@@ -593,13 +568,11 @@ def test_cache_invalidation_on_profile_update():
 
     mock_redis = MagicMock()
 
-    # The _invalidate_completeness_cache function imports get_redis_client internally
+    from src.routers.profile import _invalidate_completeness_cache
+
     with patch(
-        "src.dependencies.redis_client.get_redis_client", return_value=mock_redis
+        "src.services.profile_storage.get_redis_client", return_value=mock_redis
     ):
-        # Import after patching
-        from src.routers.profile import _invalidate_completeness_cache
-
         _invalidate_completeness_cache("test-user")
 
     # Should have called delete on Redis
@@ -0,0 +1,442 @@
+"""
+Unit tests for ProfileStorageService write and read paths.
+
+Covers:
+- store_profile_extractions sends fields, sources and the metadata update as
+  one CTE statement fed by unnested column arrays, pipelined behind the
+  ensure-profile insert and committed after with synchronous_commit off.
+- Repeated (category, field_name) keys are collapsed client-side to the last
+  value while every extraction keeps its source row.
+- Only baseline fields are flagged to count towards populated_fields.
+- After commit the profile cache has its TTL capped (bounded staleness)
+  rather than being dropped; the completeness cache only when a baseline field
+  was newly populated or a goals field was written.
+- store_profile_extractions_bulk writes several users' rows with one
+  connection checkout and one commit.
+- get_profile_by_user reads metadata and category-grouped fields in one query,
+  in autocommit, and hands the connection back in transactional mode.
+- The hot statements ask psycopg to server-side prepare them on first use.
+- get_profile_by_user is served from Redis until a write invalidates it.
+- A profile store from the ingestion graph evicts the completeness entry the
+  profile router reads, since the in-process cache is shared per worker.
+"""
+
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock, call, patch
+
+from src.services.profile_storage import ProfileStorageService
+
+
+class _MockCursor:
+    """Cursor stub recording execute calls."""
+
+    def __init__(self, rows=None):
+        self._rows = list(rows or [])
+        self.queries = []
+        self.prepared = []
+
+    def execute(self, query, params=None, prepare=None):
+        self.queries.append((query, params))
+        self.prepared.append(prepare)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class _MockConnection:
+    """Connection stub tracking pipeline/commit/rollback."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = False
+        self.rolled_back = False
+        self.pipelined = []
+
+    def cursor(self, row_factory=None):
+        return self._cursor
+
+    @contextmanager
+    def pipeline(self):
+        start = len(self._cursor.queries)
+        yield
+        self.pipelined.append(len(self._cursor.queries) - start)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def _store(extractions, cursor=None, redis_client=None):
+    cursor = cursor or _MockCursor()
+    conn = _MockConnection(cursor)
+    with patch("src.services.profile_storage.get_timescale_conn", return_value=conn):
+        with patch("src.services.profile_storage.release_timescale_conn"):
+            with patch(
+                "src.services.profile_storage.get_redis_client",
+                return_value=redis_client,
+            ):
+                count = ProfileStorageService().store_profile_extractions(
+                    "user-1", extractions
+                )
+    return count, cursor, conn
+
+
+def test_store_writes_everything_in_one_statement():
+    extractions = [
+        {
+            "category": "basics",
+            "field_name": "name",
+            "field_value": "Ada",
+            "source_memory_id": "mem_1",
+            "source_type": "explicit",
+        },
+        {
+            "category": "interests",
+            "field_name": "hobbies",
+            "field_value": ["chess", "rowing"],
+            "source_memory_id": "mem_2",
+        },
+    ]
+
+    count, cursor, conn = _store(extractions)
+
+    assert count == 2
+    assert conn.committed
+    assert conn.pipelined == [3]
+    assert cursor.prepared == [None, True, True]
+
+    set_sql, _ = cursor.queries[0]
+    assert set_sql == "SET LOCAL synchronous_commit = off"
+    ensure_sql, _ = cursor.queries[1]
+    assert "INSERT INTO user_profiles" in ensure_sql
+
+    write_sql, params = cursor.queries[2]
+    assert "INSERT INTO profile_fields" in write_sql
+    assert "INSERT INTO profile_sources" in write_sql
+    assert "UPDATE user_profiles" in write_sql
+    assert params["categories"] == ["basics", "interests"]
+    assert params["field_names"] == ["name", "hobbies"]
+    assert params["field_values"] == ['"Ada"', '["chess","rowing"]']
+    assert params["source_categories"] == ["basics", "interests"]
+    assert params["source_field_names"] == ["name", "hobbies"]
+    assert params["source_memory_ids"] == ["mem_1", "mem_2"]
+    assert params["source_types"] == ["explicit", "implicit"]
+
+
+def test_store_dedupes_fields_but_keeps_every_source():
+    extractions = [
+        {
+            "category": "basics",
+            "field_name": "location",
+            "field_value": "Paris",
+            "source_memory_id": "mem_1",
+        },
+        {
+            "category": "basics",
+            "field_name": "name",
+            "field_value": "Ada",
+            "source_memory_id": "mem_2",
+        },
+        {
+            "category": "basics",
+            "field_name": "location",
+            "field_value": "London",
+            "source_memory_id": "mem_3",
+        },
+    ]
+
+    count, cursor, _ = _store(extractions)
+
+    assert count == 2
+    _, params = cursor.queries[2]
+    assert params["field_names"] == ["location", "name"]
+    assert params["field_values"] == ['"London"', '"Ada"']
+    assert params["source_memory_ids"] == ["mem_1", "mem_2", "mem_3"]
+
+
+def test_store_flags_only_baseline_fields_as_counted():
+    from src.services.profile_storage import TOTAL_EXPECTED_FIELDS
+
+    extractions = [
+        {"category": "basics", "field_name": "name", "field_value": "Ada"},
+        {"category": "interests", "field_name": "pets", "field_value": "cat"},
+    ]
+
+    _, cursor, _ = _store(extractions)
+
+    _, params = cursor.queries[2]
+    assert params["counted"] == [True, False]
+    assert params["total"] == TOTAL_EXPECTED_FIELDS
+
+
+def test_store_caps_cache_ttl_after_commit():
+    from src.services.profile_storage import CACHE_STALE_TTL
+
+    redis_client = MagicMock()
+    pipe = redis_client.pipeline.return_value
+    extractions = [
+        {"category": "basics", "field_name": "name", "field_value": "Ada"},
+    ]
+
+    # RETURNING (user_id, new_fields): one baseline field newly populated
+    _store(
+        extractions, cursor=_MockCursor(rows=[("user-1", 1)]), redis_client=redis_client
+    )
+
+    redis_client.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.expire.call_args_list == [
+        call("profile_completeness:user-1", CACHE_STALE_TTL, lt=True),
+        call("profile_data:user-1", CACHE_STALE_TTL, lt=True),
+    ]
+    pipe.execute.assert_called_once()
+    redis_client.delete.assert_not_called()
+
+
+def test_store_leaves_completeness_cache_when_no_baseline_field_is_new():
+    redis_client = MagicMock()
+    pipe = redis_client.pipeline.return_value
+    extractions = [
+        {"category": "interests", "field_name": "pets", "field_value": "cat"},
+    ]
+
+    _store(
+        extractions, cursor=_MockCursor(rows=[("user-1", 0)]), redis_client=redis_client
+    )
+
+    assert [c.args[0] for c in pipe.expire.call_args_list] == ["profile_data:user-1"]
+
+
+def test_store_marks_completeness_stale_for_any_goals_field():
+    redis_client = MagicMock()
+    pipe = redis_client.pipeline.return_value
+    extractions = [
+        {"category": "goals", "field_name": "bucket_list", "field_value": "Alps"},
+    ]
+
+    _store(
+        extractions, cursor=_MockCursor(rows=[("user-1", 0)]), redis_client=redis_client
+    )
+
+    assert [c.args[0] for c in pipe.expire.call_args_list] == [
+        "profile_completeness:user-1",
+        "profile_data:user-1",
+    ]
+
+
+def test_store_no_extractions_skips_db():
+    with patch("src.services.profile_storage.get_timescale_conn") as get_conn:
+        count = ProfileStorageService().store_profile_extractions("user-1", [])
+
+    assert count == 0
+    get_conn.assert_not_called()
+
+
+def test_store_bulk_writes_all_users_in_one_transaction():
+    redis_client = MagicMock()
+    cursor = _MockCursor(rows=[("user-1", 1), ("user-2", 0)])
+    conn = _MockConnection(cursor)
+    items = [
+        (
+            "user-1",
+            [{"category": "basics", "field_name": "name", "field_value": "Ada"}],
+        ),
+        (
+            "user-2",
+            [
+                {"category": "basics", "field_name": "name", "field_value": "Bob"},
+                {"category": "basics", "field_name": "age", "field_value": 41},
+            ],
+        ),
+        ("user-3", []),
+    ]
+
+    with patch(
+        "src.services.profile_storage.get_timescale_conn", return_value=conn
+    ) as get_conn:
+        with patch("src.services.profile_storage.release_timescale_conn"):
+            with patch(
+                "src.services.profile_storage.get_redis_client",
+                return_value=redis_client,
+            ):
+                counts = ProfileStorageService().store_profile_extractions_bulk(items)
+
+    assert counts == {"user-1": 1, "user-2": 2}
+    get_conn.assert_called_once()
+    assert conn.committed
+    assert conn.pipelined == [3]
+
+    _, ensure_params = cursor.queries[1]
+    assert ensure_params == (["user-1", "user-2"],)
+
+    _, params = cursor.queries[2]
+    assert params["user_ids"] == ["user-1", "user-2", "user-2"]
+    assert params["field_names"] == ["name", "name", "age"]
+    assert params["source_user_ids"] == ["user-1", "user-2", "user-2"]
+    pipe = redis_client.pipeline.return_value
+    assert [c.args[0] for c in pipe.expire.call_args_list] == [
+        "profile_completeness:user-1",
+        "profile_data:user-1",
+        "profile_data:user-2",
+    ]
+    pipe.execute.assert_called_once()
+
+
+def test_invalidate_many_deletes_all_keys_in_one_call():
+    redis_client = MagicMock()
+
+    with patch(
+        "src.services.profile_storage.get_redis_client", return_value=redis_client
+    ):
+        ProfileStorageService().invalidate_many(["user-1", "user-2"])
+
+    redis_client.delete.assert_called_once_with(
+        "profile_completeness:user-1",
+        "profile_data:user-1",
+        "profile_completeness:user-2",
+        "profile_data:user-2",
+    )
+
+
+def test_store_bulk_without_extractions_skips_db():
+    with patch("src.services.profile_storage.get_timescale_conn") as get_conn:
+        counts = ProfileStorageService().store_profile_extractions_bulk(
+            [("user-1", [])]
+        )
+
+    assert counts == {}
+    get_conn.assert_not_called()
+
+
+def _get_profile(conn, redis_client=None):
+    with patch("src.services.profile_storage.get_timescale_conn", return_value=conn):
+        with patch("src.services.profile_storage.release_timescale_conn"):
+            with patch(
+                "src.services.profile_storage.get_redis_client",
+                return_value=redis_client,
+            ):
+                return ProfileStorageService().get_profile_by_user("user-1")
+
+
+def test_get_profile_reads_grouped_fields_in_one_query():
+    row = (
+        12.5,
+        48,
+        2,
+        "2026-10-01T09:00:00+00:00",
+        "2026-09-01T09:00:00+00:00",
+        {
+            "basics": {"name": ["Ada", "2026-10-01T09:00:00+00:00"]},
+            "interests": {"hobbies": [["chess"], "2026-10-01T08:00:00+00:00"]},
+        },
+    )
+    cursor = _MockCursor(rows=[row])
+    conn = _MockConnection(cursor)
+
+    profile = _get_profile(conn)
+
+    assert len(cursor.queries) == 1
+    assert cursor.prepared == [True]
+    assert profile["completeness_pct"] == 12.5
+    assert profile["profile"]["basics"] == {"name": "Ada"}
+    assert profile["profile"]["interests"] == {"hobbies": ["chess"]}
+    assert profile["profile"]["health"] == {}
+    assert profile["field_metadata"]["interests"]["hobbies"] == {
+        "last_updated": "2026-10-01T08:00:00+00:00"
+    }
+
+
+def test_get_profile_runs_in_autocommit_and_restores_it():
+    row = (0.0, 48, 0, None, None, None)
+    conn = _MockConnection(None)
+    seen = []
+
+    class _Cursor(_MockCursor):
+        def execute(self, query, params=None, prepare=None):
+            seen.append(conn.autocommit)
+            super().execute(query, params, prepare)
+
+    conn._cursor = _Cursor(rows=[row])
+
+    _get_profile(conn)
+
+    assert seen == [True]
+    assert conn.autocommit is False
+
+
+def test_get_profile_without_fields_returns_empty_categories():
+    row = (0.0, 48, 0, None, None, None)
+    cursor = _MockCursor(rows=[row])
+    conn = _MockConnection(cursor)
+
+    profile = _get_profile(conn)
+
+    assert profile["profile"]["basics"] == {}
+    assert profile["field_metadata"]["basics"] == {}
+
+
+def test_get_profile_cache_hit_skips_db():
+    cached = {"user_id": "user-1", "profile": {"basics": {"name": "Ada"}}}
+    redis_client = MagicMock()
+    redis_client.get.return_value = json.dumps(cached)
+
+    with patch("src.services.profile_storage.get_timescale_conn") as get_conn:
+        with patch(
+            "src.services.profile_storage.get_redis_client",
+            return_value=redis_client,
+        ):
+            profile = ProfileStorageService().get_profile_by_user("user-1")
+
+    assert profile == cached
+    redis_client.get.assert_called_once_with("profile_data:user-1")
+    get_conn.assert_not_called()
+
+
+def test_get_profile_cache_miss_populates_cache():
+    from src.services.profile_storage import PROFILE_CACHE_TTL
+
+    row = (0.0, 48, 0, None, None, None)
+    redis_client = MagicMock()
+    redis_client.get.return_value = None
+
+    profile = _get_profile(_MockConnection(_MockCursor(rows=[row])), redis_client)
+
+    key, ttl, payload = redis_client.setex.call_args[0]
+    assert key == "profile_data:user-1"
+    assert ttl == PROFILE_CACHE_TTL
+    assert json.loads(payload) == profile
+
+
+def test_graph_store_evicts_router_local_completeness():
+    from src.routers import profile as profile_router
+    from src.services import unified_ingestion_graph as graph
+
+    router_service = profile_router._profile_service
+    router_service._set_local_completeness("user-1", {"populated_fields": 3})
+    conn = _MockConnection(_MockCursor(rows=[("user-1", 1)]))
+    state = {
+        "user_id": "user-1",
+        "profile_extractions": [
+            {"category": "basics", "field_name": "name", "field_value": "Ada"}
+        ],
+        "storage_results": {},
+        "errors": [],
+    }
+
+    with patch("src.services.profile_storage.get_timescale_conn", return_value=conn):
+        with patch("src.services.profile_storage.release_timescale_conn"):
+            with patch(
+                "src.services.profile_storage.get_redis_client", return_value=None
+            ):
+                graph.node_store_profile(state)
+
+    assert state["errors"] == []
+    assert router_service._get_local_completeness("user-1") is None
@@ -0,0 +1,36 @@
+"""
+Unit tests for the precompiled prompt templates in src/services/prompts.py.
+
+Covers:
+- PromptTemplate splits only on the named slots and leaves JSON braces literal.
+- Rendering concatenates fragments and slot values in order.
+- The consolidation template exposes the slot its caller fills.
+"""
+
+import pytest
+
+from src.services.prompts import CONSOLIDATION_TEMPLATE, PromptTemplate
+
+
+def test_template_keeps_literal_braces():
+    template = PromptTemplate.compile('{"a": 1}\n{name}\n{other}', ("name",))
+
+    assert template.slots == ("name",)
+    assert template.render(name="Ada") == '{"a": 1}\nAda\n{other}'
+
+
+def test_template_render_requires_every_slot():
+    template = PromptTemplate.compile("{a} and {b}", ("a", "b"))
+
+    assert template.render(a="1", b="2") == "1 and 2"
+    with pytest.raises(KeyError):
+        template.render(a="1")
+
+
+def test_consolidation_template_renders_memories():
+    rendered = CONSOLIDATION_TEMPLATE.render(memories="1|260101|User likes tea")
+
+    assert CONSOLIDATION_TEMPLATE.slots == ("memories",)
+    assert rendered.endswith(
+        "1|260101|User likes tea\n\nReply with the merged memory as `content`."
+    )
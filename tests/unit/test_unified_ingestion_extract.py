@@ -0,0 +1,113 @@
+"""Unit tests for the extraction node of the unified ingestion graph."""
+
+import time
+from unittest.mock import patch
+
+from src.schemas import Message, TranscriptRequest
+from src.services.prompts_v3 import (
+    EXTRACTION_SYSTEM_V3,
+    EXTRACTION_SYSTEM_V3_SHORT,
+    select_extraction_system,
+)
+
+
+def _state(text: str):
+    request = TranscriptRequest(
+        user_id="u1", history=[Message(role="user", content=text)]
+    )
+    return {
+        "user_id": "u1",
+        "request": request,
+        "history": request.history,
+        "metrics": {},
+        "t_start": time.perf_counter(),
+    }
+
+
+def test_node_extract_keeps_system_prompt_static():
+    """Per-request context goes in the payload; the system prompt never varies."""
+    from src.services import unified_ingestion_graph as graph
+
+    with (
+        patch.object(
+            graph,
+            "get_relevant_existing_memories",
+            side_effect=[[], [{"id": "m1", "content": "User likes tea"}]],
+        ),
+        patch.object(
+            graph, "format_memories_for_llm_context", side_effect=["", "- likes tea"]
+        ),
+        patch.object(graph, "_call_llm_json", return_value=[]) as mock_llm,
+        patch.object(graph, "get_redis_client", return_value=None),
+    ):
+        graph.node_extract(_state("hi"))
+        graph.node_extract(_state("I love green tea"))
+
+    first, second = mock_llm.call_args_list
+    assert first.args[0] is EXTRACTION_SYSTEM_V3_SHORT
+    assert second.args[0] is EXTRACTION_SYSTEM_V3_SHORT
+    assert second.args[1]["existing_memories_context"] == "- likes tea"
+    assert second.args[1]["history"] == [
+        {"role": "user", "content": "I love green tea"}
+    ]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+def test_node_extract_reuses_cached_items_for_identical_request():
+    from src.services import unified_ingestion_graph as graph
+
+    redis = _FakeRedis()
+    items = [{"content": "User likes tea", "layer": "semantic"}]
+
+    with (
+        patch.object(graph, "get_relevant_existing_memories", return_value=[]),
+        patch.object(graph, "_call_llm_json", return_value=items) as mock_llm,
+        patch.object(graph, "get_redis_client", return_value=redis),
+    ):
+        first = graph.node_extract(_state("I like tea"))
+        second = graph.node_extract(_state("I like tea"))
+        graph.node_extract(_state("I like coffee"))
+
+    assert first["extracted_items"] == items
+    assert second["extracted_items"] == items
+    # The repeated turn was served from the cache
+    assert mock_llm.call_count == 2
+    assert len(redis.values) == 2
+
+
+def test_extraction_system_prompt_has_no_slots():
+    for prompt in (EXTRACTION_SYSTEM_V3, EXTRACTION_SYSTEM_V3_SHORT):
+        assert "{existing_memories}" not in prompt
+        assert "{history}" not in prompt
+        assert prompt.endswith("Return JSON array:")
+
+
+def test_select_extraction_system_by_history_shape():
+    short = [{"role": "user", "content": "I'm Ada and I live in Paris."}]
+    multi = [
+        {
+            "role": "user",
+            "content": "I sold TSLA. I bought NVDA and I'm nervous about it.",
+        }
+    ]
+    long = [{"role": "user", "content": "x" * 900}]
+
+    assert select_extraction_system(short) is EXTRACTION_SYSTEM_V3_SHORT
+    assert select_extraction_system(multi) is EXTRACTION_SYSTEM_V3
+    assert select_extraction_system(long) is EXTRACTION_SYSTEM_V3
+    assert "### Example 3: Basic Profile Introduction" in EXTRACTION_SYSTEM_V3_SHORT
+    assert "### Example 1:" not in EXTRACTION_SYSTEM_V3_SHORT
+    assert len(EXTRACTION_SYSTEM_V3_SHORT) < len(EXTRACTION_SYSTEM_V3)
@@ -0,0 +1,80 @@
+"""Unit tests for the local worthiness pre-filter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.worthiness_fast import cheap_unworthy, history_is_filler
+
+
+@pytest.mark.parametrize("text", ["hi", "Thanks!", "hey, thanks", "  lol  ", "bye."])
+def test_cheap_unworthy_rejects_filler(text):
+    assert cheap_unworthy(text) is True
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I love tea",
+        "bought AAPL",
+        "ok 100 shares",
+        "thanks, my name is Ada",
+        "thanks thanks thanks thanks",
+        "hithanks",
+        "yes",
+        "nope",
+        "ok",
+    ],
+)
+def test_cheap_unworthy_keeps_ambiguous_text(text):
+    assert cheap_unworthy(text) is False
+
+
+def test_history_is_filler_only_looks_at_user_turns():
+    assert history_is_filler(
+        [
+            {"role": "user", "content": "hey"},
+            {"role": "assistant", "content": "Hi! How can I help with your portfolio?"},
+            {"role": "user", "content": "thanks"},
+        ]
+    )
+    assert not history_is_filler(
+        [{"role": "user", "content": "hi"}, {"role": "user", "content": "I run daily"}]
+    )
+    assert not history_is_filler([{"role": "assistant", "content": "hello"}])
+
+
+@pytest.mark.parametrize(
+    "question,answer",
+    [
+        ("Do you have any food allergies?", "yes"),
+        ("Are you still vegetarian?", "nope"),
+    ],
+)
+def test_history_is_filler_keeps_short_answers(question, answer):
+    assert not history_is_filler(
+        [
+            {"role": "assistant", "content": question},
+            {"role": "user", "content": answer},
+        ]
+    )
+
+
+def test_node_worthiness_skips_llm_for_filler():
+    import time
+
+    from src.schemas import Message
+    from src.services import unified_ingestion_graph as graph
+
+    state = {
+        "user_id": "u1",
+        "history": [Message(role="user", content="thanks!")],
+        "metrics": {},
+        "t_start": time.perf_counter(),
+    }
+    with patch.object(graph, "_call_llm_json") as mock_llm:
+        out = graph.node_worthiness(state)
+
+    mock_llm.assert_not_called()
+    assert out["worthy"] is False
+    assert out["metrics"]["worthiness_prefiltered"] is True